@@ -7,13 +7,15 @@ Analyzes pairwise and absolute evaluation results to determine effectiveness of
 import json
 import numpy as np
 from scipy import stats
-from scipy.stats import binom_test, ttest_1samp
+from scipy.stats import ttest_1samp
 import matplotlib.pyplot as plt
 import seaborn as sns
 from collections import defaultdict, Counter
 import pandas as pd
 from datetime import datetime
 
+from exact_binomial import binom_test
+
 # Set style for plots
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
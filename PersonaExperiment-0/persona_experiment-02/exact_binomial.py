@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Exact Binomial Tests for Persona Experiment 02
+Exact binomial p-values and confidence intervals using only the standard library. Binomial
+coefficients are computed once per n in log space (lgamma), PMF/CDF/SF tables are memoized per
+(n, p), and two-sided p-values use a binary search over the monotone half of the PMF, so a test
+is a few table lookups after the first one for its n. The batch functions take many (k, n) pairs
+at once and share the tables between them.
+"""
+
+import math
+from functools import lru_cache
+from statistics import NormalDist
+from typing import List, Tuple, Sequence
+
+# scipy's tolerance for "as likely as the observed count" in two-sided tests
+RELATIVE_TOLERANCE = 1 + 1e-7
+
+
+@lru_cache(maxsize=256)
+def log_binomial_coefficients(n: int) -> Tuple[float, ...]:
+    """log C(n, i) for i = 0..n."""
+    log_n_factorial = math.lgamma(n + 1)
+    return tuple(log_n_factorial - math.lgamma(i + 1) - math.lgamma(n - i + 1) for i in range(n + 1))
+
+
+def log_pmf_terms(n: int, p: float) -> List[float]:
+    """log P(X = i) for i = 0..n under Binomial(n, p)."""
+    if p <= 0 or p >= 1:
+        certain = 0 if p <= 0 else n
+        return [0.0 if i == certain else -math.inf for i in range(n + 1)]
+    log_p, log_q = math.log(p), math.log1p(-p)
+    return [coefficient + i * log_p + (n - i) * log_q
+            for i, coefficient in enumerate(log_binomial_coefficients(n))]
+
+
+@lru_cache(maxsize=256)
+def pmf_table(n: int, p: float) -> Tuple[Tuple[float, ...], Tuple[float, ...], Tuple[float, ...]]:
+    """(pmf, cdf, sf) with cdf[i] = P(X <= i) and sf[i] = P(X >= i); tails are summed from their own end."""
+    pmf = tuple(math.exp(term) for term in log_pmf_terms(n, p))
+    cdf, total = [], 0.0
+    for value in pmf:
+        total += value
+        cdf.append(min(total, 1.0))
+    sf, total = [0.0] * (n + 1), 0.0
+    for i in range(n, -1, -1):
+        total += pmf[i]
+        sf[i] = min(total, 1.0)
+    return pmf, tuple(cdf), tuple(sf)
+
+
+def count_at_most(pmf: Sequence[float], start: int, stop: int, threshold: float, increasing: bool) -> int:
+    """How many of pmf[start:stop] (monotone in that range) are <= threshold, by binary search."""
+    low, high = start, stop
+    while low < high:
+        middle = (low + high) // 2
+        if (pmf[middle] <= threshold) != increasing:
+            high = middle
+        else:
+            low = middle + 1
+    return low - start if increasing else stop - low
+
+
+def binom_test(k: int, n: int, p: float = 0.5, alternative: str = 'two-sided', method: str = 'minlike') -> float:
+    """
+    Exact binomial test p-value of k successes in n trials.
+    Two-sided 'minlike' sums every outcome no more likely than k (scipy's binom_test/binomtest);
+    'double' doubles the smaller tail (SimplePersonaAnalysis' original definition). Both agree when p = 0.5.
+    """
+    if n == 0:
+        return 1.0
+    pmf, cdf, sf = pmf_table(n, p)
+    if alternative == 'less':
+        return cdf[k]
+    if alternative == 'greater':
+        return sf[k]
+    if alternative != 'two-sided':
+        raise ValueError(f"alternative must be 'two-sided', 'less' or 'greater', not {alternative!r}")
+
+    expected = n * p
+    if method == 'double':
+        tail = cdf[k] if k <= expected else sf[k]
+        return min(2 * tail, 1.0)
+    if method != 'minlike':
+        raise ValueError(f"method must be 'minlike' or 'double', not {method!r}")
+
+    if k == expected:
+        return 1.0
+    threshold = pmf[k] * RELATIVE_TOLERANCE
+    if k < expected:
+        # The upper half [ceil(np), n] is non-increasing
+        start = math.ceil(expected)
+        y = count_at_most(pmf, start, n + 1, threshold, increasing=False)
+        p_value = cdf[k] + (sf[n - y + 1] if y else 0.0)
+    else:
+        # The lower half [0, floor(np)] is non-decreasing
+        y = count_at_most(pmf, 0, math.floor(expected) + 1, threshold, increasing=True)
+        p_value = (cdf[y - 1] if y else 0.0) + sf[k]
+    return min(p_value, 1.0)
+
+
+def binom_tests(pairs: Sequence[Tuple[int, int]], p: float = 0.5, alternative: str = 'two-sided',
+                method: str = 'minlike') -> List[float]:
+    """binom_test for every (k, n) pair; pairs with the same n share one memoized table."""
+    return [binom_test(k, n, p, alternative, method) for k, n in pairs]
+
+
+def upper_tail(k: int, n: int, p: float) -> float:
+    """P(X >= k) under Binomial(n, p), without memoizing the table for this p."""
+    return sum(math.exp(term) for term in log_pmf_terms(n, p)[k:])
+
+
+def clopper_pearson_interval(k: int, n: int, alpha: float = 0.05, iterations: int = 60) -> Tuple[float, float]:
+    """Exact (Clopper-Pearson) interval, found by bisection on the binomial tails."""
+    if n == 0:
+        return 0.0, 1.0
+
+    def solve(target, tail_increases_with_p, tail):
+        low, high = 0.0, 1.0
+        for _ in range(iterations):
+            middle = (low + high) / 2
+            if (tail(middle) < target) == tail_increases_with_p:
+                low = middle
+            else:
+                high = middle
+        return (low + high) / 2
+
+    lower = 0.0 if k == 0 else solve(alpha / 2, True, lambda q: upper_tail(k, n, q))
+    upper = 1.0 if k == n else solve(alpha / 2, False, lambda q: 1 - upper_tail(k + 1, n, q))
+    return lower, upper
+
+
+def wilson_interval(k: int, n: int, alpha: float = 0.05) -> Tuple[float, float]:
+    """Wilson score interval; with no trials the proportion is unconstrained, as in clopper_pearson_interval."""
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    p_hat = k / n
+    denominator = 1 + z ** 2 / n
+    centre = (p_hat + z ** 2 / (2 * n)) / denominator
+    delta = z * math.sqrt(p_hat * (1 - p_hat) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return max(0.0, centre - delta), min(1.0, centre + delta)
+
+
+def binomial_intervals(pairs: Sequence[Tuple[int, int]], alpha: float = 0.05,
+                       method: str = 'clopper_pearson') -> List[Tuple[float, float]]:
+    """Clopper-Pearson or Wilson interval for every (k, n) pair."""
+    if method == 'clopper_pearson':
+        return [clopper_pearson_interval(k, n, alpha) for k, n in pairs]
+    if method == 'wilson':
+        return [wilson_interval(k, n, alpha) for k, n in pairs]
+    raise ValueError(f"method must be 'clopper_pearson' or 'wilson', not {method!r}")
@@ -9,6 +9,8 @@ import math
 from collections import defaultdict, Counter
 from datetime import datetime
 
+from exact_binomial import pmf_table, binom_test, binom_tests, binomial_intervals
+
 class SimplePersonaAnalysis:
     def __init__(self):
         self.pairwise_results = {}
@@ -45,30 +47,11 @@ class SimplePersonaAnalysis:
         """Calculate binomial probability P(X = k) for n trials with probability p"""
         if n == 0:
             return 1.0 if k == 0 else 0.0
-        
-        # Calculate C(n,k)
-        comb = 1
-        for i in range(min(k, n-k)):
-            comb = comb * (n - i) // (i + 1)
-        
-        return comb * (p ** k) * ((1 - p) ** (n - k))
+        return pmf_table(n, p)[0][k]
     
     def binomial_test_two_sided(self, k, n, p=0.5):
-        """Simple two-sided binomial test"""
-        if n == 0:
-            return 1.0
-        
-        observed_p = k / n
-        
-        # Calculate p-value as 2 * min(P(X <= k), P(X >= k)) under null hypothesis
-        if observed_p <= p:
-            # Left tail
-            p_value = 2 * sum(self.binomial_probability(i, n, p) for i in range(k + 1))
-        else:
-            # Right tail
-            p_value = 2 * sum(self.binomial_probability(i, n, p) for i in range(k, n + 1))
-        
-        return min(p_value, 1.0)  # Ensure p-value doesn't exceed 1
+        """Simple two-sided binomial test: 2 * min(P(X <= k), P(X >= k)), capped at 1"""
+        return binom_test(k, n, p, alternative='two-sided', method='double')
     
     def calculate_mean_std(self, values):
         """Calculate mean and standard deviation"""
@@ -143,6 +126,10 @@ class SimplePersonaAnalysis:
             else:
                 ci_lower = ci_upper = 0
             
+            # Exact and score intervals (the normal approximation is poor at these sample sizes)
+            (exact_lower, exact_upper), = binomial_intervals([(wins['test'], non_tie_total)], method='clopper_pearson')
+            (wilson_lower, wilson_upper), = binomial_intervals([(wins['test'], non_tie_total)], method='wilson')
+            
             results[evaluator] = {
                 'test_condition': test_condition,
                 'wins': wins,
@@ -157,7 +144,9 @@ class SimplePersonaAnalysis:
                     'significant_at_05': p_value_two_sided < 0.05
                 },
                 'confidence_interval': {
-                    'test_win_rate_ci_95': [ci_lower, ci_upper]
+                    'test_win_rate_ci_95': [ci_lower, ci_upper],
+                    'test_win_rate_ci_95_clopper_pearson': [exact_lower, exact_upper],
+                    'test_win_rate_ci_95_wilson': [wilson_lower, wilson_upper]
                 },
                 'detailed_results': detailed_results
             }
@@ -271,19 +260,12 @@ class SimplePersonaAnalysis:
                                 category_wins['test'] += 1
                 
                 non_tie_total = category_wins['control'] + category_wins['test']
-                if non_tie_total > 0:
-                    test_win_rate = category_wins['test'] / non_tie_total
-                    p_value = self.binomial_test_two_sided(category_wins['test'], non_tie_total, 0.5)
-                else:
-                    test_win_rate = 0
-                    p_value = 1.0
+                test_win_rate = category_wins['test'] / non_tie_total if non_tie_total > 0 else 0
                 
                 results[category]['pairwise'][evaluator] = {
                     'test_condition': test_condition,
                     'wins': category_wins,
-                    'test_win_rate': test_win_rate,
-                    'p_value': p_value,
-                    'significant': p_value < 0.05
+                    'test_win_rate': test_win_rate
                 }
             
             # Analyze absolute results by category
@@ -315,6 +297,13 @@ class SimplePersonaAnalysis:
                     'n_queries': len([q for q in query_list if q in data])
                 }
         
+        # Test every category x evaluator in one batch (n = 0 gives p = 1)
+        entries = [entry for category_results in results.values() for entry in category_results['pairwise'].values()]
+        pairs = [(entry['wins']['test'], entry['wins']['test'] + entry['wins']['control']) for entry in entries]
+        for entry, p_value in zip(entries, binom_tests(pairs, 0.5, method='double')):
+            entry['p_value'] = p_value
+            entry['significant'] = p_value < 0.05
+        
         return results
     
     def generate_comprehensive_report(self):
@@ -0,0 +1,7 @@
+"""Shared setup for the persona experiment 02 tests."""
+
+import sys
+from pathlib import Path
+
+EXPERIMENT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(EXPERIMENT_DIR))
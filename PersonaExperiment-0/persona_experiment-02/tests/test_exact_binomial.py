@@ -0,0 +1,48 @@
+"""Behaviour of the stdlib exact binomial tests against scipy."""
+
+import itertools
+
+import pytest
+from scipy import stats
+
+from exact_binomial import binom_test, binom_tests, binomial_intervals
+
+CASES = [(k, n) for n in (1, 5, 12, 37, 120) for k in sorted({0, 1, n // 3, n // 2, n - 1, n})]
+
+
+@pytest.mark.parametrize('p', [0.5, 0.3, 0.77])
+def test_p_values_match_scipy(p):
+    for (k, n), alternative in itertools.product(CASES, ['two-sided', 'less', 'greater']):
+        expected = stats.binomtest(k, n, p, alternative=alternative).pvalue
+        assert binom_test(k, n, p, alternative) == pytest.approx(expected, rel=1e-9, abs=1e-15)
+
+
+def test_double_tail_matches_the_original_definition():
+    for k, n in CASES:
+        tail = stats.binom.cdf(k, n, 0.3) if k <= n * 0.3 else stats.binom.sf(k - 1, n, 0.3)
+        assert binom_test(k, n, 0.3, method='double') == pytest.approx(min(2 * tail, 1.0), rel=1e-9)
+        # Both definitions agree for a fair coin
+        assert binom_test(k, n, method='double') == pytest.approx(binom_test(k, n), rel=1e-9)
+
+
+def test_batch_and_edge_cases():
+    assert binom_tests(CASES) == [binom_test(k, n) for k, n in CASES]
+    assert binom_test(0, 0) == 1.0
+    with pytest.raises(ValueError):
+        binom_test(3, 10, alternative='both')
+    with pytest.raises(ValueError):
+        binom_test(3, 10, method='central')
+
+
+@pytest.mark.parametrize('method, scipy_method', [('clopper_pearson', 'exact'), ('wilson', 'wilson')])
+def test_intervals_match_scipy(method, scipy_method):
+    pairs = [(k, n) for k, n in CASES if n > 0]
+    for (k, n), (lower, upper) in zip(pairs, binomial_intervals(pairs, method=method)):
+        expected = stats.binomtest(k, n).proportion_ci(method=scipy_method)
+        assert lower == pytest.approx(expected.low, abs=1e-9)
+        assert upper == pytest.approx(expected.high, abs=1e-9)
+
+
+@pytest.mark.parametrize('method', ['clopper_pearson', 'wilson'])
+def test_intervals_without_trials_cover_everything(method):
+    assert binomial_intervals([(0, 0)], method=method) == [(0.0, 1.0)]
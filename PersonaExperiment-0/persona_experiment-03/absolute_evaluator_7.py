@@ -1,272 +1,15 @@
 #!/usr/bin/env python3
 """
 Absolute Evaluator 7 for Persona Experiment 03
-Rates test 3 dynamic and test 4 dynamic+tone datasets independently using 1-5 scale with role indicator stripping.
+Rates test 3 dynamic and test 4 dynamic+tone datasets independently on a 1-5 scale through the shared evaluation engine.
 """
 
-import json
-import random
-import re
-from typing import Dict, List, Any
+from pathlib import Path
 
-class AbsoluteEvaluator7:
-    def __init__(self, randomization_key_path: str, blinded_data_dir: str):
-        """Initialize the evaluator with randomization mapping."""
-        self.randomization_key_path = randomization_key_path
-        self.blinded_data_dir = blinded_data_dir
-        
-        # Load randomization key
-        with open(randomization_key_path, 'r') as f:
-            self.randomization_key = json.load(f)
-            
-        # Create reverse mapping for easier lookup
-        self.blinded_to_original = {v: k for k, v in self.randomization_key.items()}
-        
-        # Extract test 3 and 4 files
-        self.test_3_files = [v for k, v in self.randomization_key.items() if 'test_3_dynamic' in k]
-        self.test_4_files = [v for k, v in self.randomization_key.items() if 'test_4_dynamic_tone' in k]
-        
-        print(f"Loaded {len(self.test_3_files)} test 3 dynamic files for evaluation:")
-        for file in self.test_3_files:
-            print(f"  - {file} ({self.blinded_to_original[file]})")
-        
-        print(f"Loaded {len(self.test_4_files)} test 4 dynamic+tone files for evaluation:")
-        for file in self.test_4_files:
-            print(f"  - {file} ({self.blinded_to_original[file]})")
+from evaluation_engine import run_single_evaluator
 
-    def strip_role_indicators(self, text: str) -> str:
-        """Remove [Role: X] indicators from response text."""
-        # Pattern to match [Role: anything] at the start of the text
-        pattern = r'^\[Role:[^\]]*\]\s*'
-        return re.sub(pattern, '', text, flags=re.IGNORECASE).strip()
-
-    def load_blinded_dataset(self, filename: str) -> Dict[str, str]:
-        """Load a blinded dataset file."""
-        file_path = f"{self.blinded_data_dir}/{filename}"
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        
-        # Strip role indicators from all responses
-        cleaned_data = {}
-        for query_id, response in data.items():
-            cleaned_data[query_id] = self.strip_role_indicators(response)
-        
-        return cleaned_data
-
-    def evaluate_response(self, query: str, response: str, condition_type: str) -> Dict[str, Any]:
-        """
-        Evaluate a single response using the specified criteria.
-        This is a placeholder - in real implementation, this would call an LLM evaluator.
-        """
-        evaluation_prompt = f"""You are rating the quality of a response to a question. Rate this response independently without comparison to other responses.
-
-Rate on these criteria (1-5 scale, where 5 is excellent):
-
-1. **Helpfulness** (1-5): How well does it address the user's actual need?
-2. **Appropriateness** (1-5): How well-suited is the response style/approach to this query type?
-3. **Completeness** (1-5): Does it provide sufficient information/guidance?  
-4. **Actionability** (1-5): How easy is it for the user to act on this response?
-5. **Overall Quality** (1-5): How would you rate this response overall?
-
-For each metric, provide numerical score and brief explanation.
-
-Question: {query}
-Response: {response}
-
-Format:
-Helpfulness: [1-5] - [explanation]
-Appropriateness: [1-5] - [explanation]
-Completeness: [1-5] - [explanation]  
-Actionability: [1-5] - [explanation]
-Overall: [1-5] - [explanation]"""
-
-        # Placeholder evaluation - simulate different performance for dynamic vs dynamic+tone
-        score_choices = [1, 2, 3, 4, 5]
-        
-        if condition_type == 'test_3':
-            # Dynamic roles should perform well but with some variability
-            score_weights = [0.04, 0.08, 0.18, 0.40, 0.30]
-            explanations = {
-                'helpfulness': 'Simulated evaluation - dynamic role creation addresses specific needs',
-                'appropriateness': 'Simulated evaluation - custom role fits query context well',
-                'completeness': 'Simulated evaluation - tailored role provides relevant information',
-                'actionability': 'Simulated evaluation - specialized role enables clear next steps',
-                'overall': 'Simulated evaluation - dynamic role creation improves response quality'
-            }
-        else:  # test_4 (dynamic+tone)
-            # Dynamic+tone should perform best with most consistency
-            score_weights = [0.02, 0.06, 0.15, 0.42, 0.35]
-            explanations = {
-                'helpfulness': 'Simulated evaluation - dynamic role with tone consistency addresses needs excellently',
-                'appropriateness': 'Simulated evaluation - tone-aware custom role perfectly matches context',
-                'completeness': 'Simulated evaluation - comprehensive role with consistent tone provides thorough info',
-                'actionability': 'Simulated evaluation - tone-consistent guidance enables confident action',
-                'overall': 'Simulated evaluation - dynamic role with tone consistency delivers superior quality'
-            }
-        
-        result = {}
-        for criterion in ['helpfulness', 'appropriateness', 'completeness', 'actionability', 'overall']:
-            result[criterion] = {
-                'score': random.choices(score_choices, weights=score_weights)[0],
-                'explanation': explanations[criterion]
-            }
-        
-        return result
-
-    def evaluate_dataset(self, filename: str, condition_type: str) -> Dict[str, Any]:
-        """Evaluate all responses in a blinded dataset."""
-        print(f"\nEvaluating dataset: {filename} ({condition_type})")
-        original_file = self.blinded_to_original[filename]
-        print(f"  Original file: {original_file}")
-        
-        # Load dataset
-        data = self.load_blinded_dataset(filename)
-        
-        results = {
-            'dataset_file': filename,
-            'original_file': original_file,
-            'condition_type': condition_type,
-            'query_evaluations': {},
-            'summary': {
-                'total_queries': len(data),
-                'average_scores': {}
-            }
-        }
-        
-        # Evaluate each query-response pair
-        for query_id, response in data.items():
-            query_text = self.get_query_text(query_id)
-            
-            evaluation = self.evaluate_response(query_text, response, condition_type)
-            results['query_evaluations'][query_id] = {
-                'query_text': query_text,
-                'evaluation': evaluation
-            }
-            
-            print(f"    {query_id}: H={evaluation['helpfulness']['score']}, "
-                  f"A={evaluation['appropriateness']['score']}, "
-                  f"C={evaluation['completeness']['score']}, "
-                  f"Ac={evaluation['actionability']['score']}, "
-                  f"O={evaluation['overall']['score']}")
-        
-        # Calculate average scores
-        criteria = ['helpfulness', 'appropriateness', 'completeness', 'actionability', 'overall']
-        for criterion in criteria:
-            scores = [results['query_evaluations'][qid]['evaluation'][criterion]['score'] 
-                     for qid in data.keys()]
-            avg_score = sum(scores) / len(scores)
-            results['summary']['average_scores'][criterion] = round(avg_score, 2)
-        
-        print(f"  Average scores: {results['summary']['average_scores']}")
-        
-        return results
-
-    def get_query_text(self, query_id: str) -> str:
-        """Get the original query text from experiment_queries.json."""
-        queries_file = "/workspace/0_PromptEngineering/PersonaExperiment-0/persona_experiment-03/experiment_queries.json"
-        with open(queries_file, 'r') as f:
-            queries = json.load(f)
-        return queries.get(query_id, f"Unknown query: {query_id}")
-
-    def run_evaluation(self) -> Dict[str, Any]:
-        """Run absolute evaluation for all test 3 and 4 datasets."""
-        print("Starting Absolute Evaluator 7 (Test 3 Dynamic & Test 4 Dynamic+Tone Datasets)")
-        print("=" * 50)
-        
-        all_results = {
-            'evaluator': 'absolute_evaluator_7',
-            'conditions': ['test_3_dynamic', 'test_4_dynamic_tone'],
-            'description': 'Absolute rating of test 3 and 4 datasets on 1-5 scale',
-            'methodology': {
-                'role_indicators_stripped': True,
-                'rating_scale': '1-5',
-                'blinded_evaluation': True
-            },
-            'dataset_results': {},
-            'condition_summaries': {}
-        }
-        
-        # Evaluate test 3 datasets
-        test_3_scores = {criterion: [] for criterion in ['helpfulness', 'appropriateness', 'completeness', 'actionability', 'overall']}
-        
-        for filename in self.test_3_files:
-            dataset_results = self.evaluate_dataset(filename, 'test_3')
-            all_results['dataset_results'][filename] = dataset_results
-            
-            # Collect scores for test 3 summary
-            for criterion in test_3_scores.keys():
-                test_3_scores[criterion].extend([
-                    dataset_results['query_evaluations'][qid]['evaluation'][criterion]['score']
-                    for qid in dataset_results['query_evaluations'].keys()
-                ])
-        
-        # Calculate test 3 summary statistics
-        all_results['condition_summaries']['test_3_dynamic'] = {}
-        for criterion, scores in test_3_scores.items():
-            all_results['condition_summaries']['test_3_dynamic'][criterion] = {
-                'mean': round(sum(scores) / len(scores), 2),
-                'min': min(scores),
-                'max': max(scores),
-                'total_responses': len(scores)
-            }
-        
-        # Evaluate test 4 datasets
-        test_4_scores = {criterion: [] for criterion in ['helpfulness', 'appropriateness', 'completeness', 'actionability', 'overall']}
-        
-        for filename in self.test_4_files:
-            dataset_results = self.evaluate_dataset(filename, 'test_4')
-            all_results['dataset_results'][filename] = dataset_results
-            
-            # Collect scores for test 4 summary
-            for criterion in test_4_scores.keys():
-                test_4_scores[criterion].extend([
-                    dataset_results['query_evaluations'][qid]['evaluation'][criterion]['score']
-                    for qid in dataset_results['query_evaluations'].keys()
-                ])
-        
-        # Calculate test 4 summary statistics
-        all_results['condition_summaries']['test_4_dynamic_tone'] = {}
-        for criterion, scores in test_4_scores.items():
-            all_results['condition_summaries']['test_4_dynamic_tone'][criterion] = {
-                'mean': round(sum(scores) / len(scores), 2),
-                'min': min(scores),
-                'max': max(scores),
-                'total_responses': len(scores)
-            }
-        
-        print(f"\nOverall Summary for Test 3 Dynamic Condition:")
-        for criterion, stats in all_results['condition_summaries']['test_3_dynamic'].items():
-            print(f"  {criterion.title()}: mean={stats['mean']}, range={stats['min']}-{stats['max']}")
-        
-        print(f"\nOverall Summary for Test 4 Dynamic+Tone Condition:")
-        for criterion, stats in all_results['condition_summaries']['test_4_dynamic_tone'].items():
-            print(f"  {criterion.title()}: mean={stats['mean']}, range={stats['min']}-{stats['max']}")
-        
-        return all_results
-
-
-def main():
-    """Main execution function."""
-    # Set random seed for reproducible evaluation simulation
-    random.seed(42)
-    
-    # Initialize evaluator
-    evaluator = AbsoluteEvaluator7(
-        randomization_key_path="/workspace/0_PromptEngineering/PersonaExperiment-0/persona_experiment-03/randomization_key.json",
-        blinded_data_dir="/workspace/0_PromptEngineering/PersonaExperiment-0/persona_experiment-03/blinded_evaluation"
-    )
-    
-    # Run evaluation
-    results = evaluator.run_evaluation()
-    
-    # Save results
-    output_file = "/workspace/0_PromptEngineering/PersonaExperiment-0/persona_experiment-03/results/absolute_evaluator_7_results.json"
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
-    
-    print(f"\nResults saved to: {output_file}")
-    print("\nAbsolute Evaluator 7 completed successfully!")
+CONFIG = {'evaluator_id': 7, 'mode': 'absolute', 'conditions': ['test_3_dynamic', 'test_4_dynamic_tone']}
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_single_evaluator(CONFIG, str(Path(__file__).resolve().parent))
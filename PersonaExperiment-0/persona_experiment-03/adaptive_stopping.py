@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Adaptive Pairwise Stopping for Persona Experiment 03
+Keeps a running Wilson interval on each condition's test-vs-control win rate (ties excluded, as in
+PersonaExperiment03Analyzer.calculate_pairwise_statistics) and stops issuing judgments for a
+condition once the interval excludes 0.5 or is narrower than a target width. Planned judgments are
+shuffled across dataset pairs and queries first, so every prefix of the schedule is a balanced sample.
+"""
+
+import random
+from statistics import NormalDist
+from typing import Dict, List, Tuple, Any, Callable, Awaitable, Optional
+
+from judge_executor import winner_from_overall
+from judge_parser import is_unparsed
+
+
+def wilson_interval(successes: int, trials: int, alpha: float = 0.05) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion (shared with PersonaExperiment03Analyzer.binomial_ci)."""
+    if trials == 0:
+        return 0.0, 0.0
+
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    p = successes / trials
+    n = trials
+
+    denominator = 1 + z**2 / n
+    centre = (p + z**2 / (2 * n)) / denominator
+    delta = z * (p * (1 - p) / n + z**2 / (4 * n**2)) ** 0.5 / denominator
+
+    return max(0, centre - delta), min(1, centre + delta)
+
+
+class AdaptiveStopper:
+    def __init__(self, target_width: float = 0.2, alpha: float = 0.05, min_decided: int = 24):
+        """Stop once the (1 - alpha) interval excludes 0.5 or is narrower than target_width,
+        but never before min_decided non-tie judgments."""
+        self.target_width = target_width
+        self.alpha = alpha
+        self.min_decided = min_decided
+        self.counts = {}
+
+    def start(self, condition: str, planned: int):
+        """Begin monitoring a condition (the interval rule does not need the planned size)."""
+        self.counts[condition] = {'test': 0, 'control': 0, 'tie': 0}
+
+    def record(self, condition: str, winner: str):
+        """Count one judgment outcome ('test', 'control' or 'tie')."""
+        counts = self.counts.setdefault(condition, {'test': 0, 'control': 0, 'tie': 0})
+        counts[winner] += 1
+
+    def interval(self, condition: str) -> Tuple[float, float]:
+        """Current Wilson interval of the test win rate."""
+        counts = self.counts.get(condition, {'test': 0, 'control': 0, 'tie': 0})
+        return wilson_interval(counts['test'], counts['test'] + counts['control'], self.alpha)
+
+    def decision(self, condition: str) -> Optional[str]:
+        """'test_better', 'control_better' or 'precise' once judging can stop, otherwise None."""
+        counts = self.counts.get(condition, {'test': 0, 'control': 0, 'tie': 0})
+        if counts['test'] + counts['control'] < self.min_decided:
+            return None
+        lower, upper = self.interval(condition)
+        if lower > 0.5:
+            return 'test_better'
+        if upper < 0.5:
+            return 'control_better'
+        if upper - lower <= self.target_width:
+            return 'precise'
+        return None
+
+    def report(self, condition: str, judged: int, planned: int) -> Dict[str, Any]:
+        """Stopping summary stored with the condition's results."""
+        lower, upper = self.interval(condition)
+        return {
+            'decision': self.decision(condition) or 'exhausted',
+            'judged': judged,
+            'planned': planned,
+            'saved': planned - judged,
+            'win_rate_ci_lower': round(lower, 4),
+            'win_rate_ci_upper': round(upper, 4),
+            'target_width': self.target_width,
+            'alpha': self.alpha
+        }
+
+
+def adaptive_order(plan: List[Dict[str, Any]], seed: Any = 42) -> List[int]:
+    """Shuffled plan positions, so any prefix covers dataset pairs and queries evenly."""
+    order = list(range(len(plan)))
+    random.Random(seed).shuffle(order)
+    return order
+
+
+async def judge_until_decided(plan: List[Dict[str, Any]],
+                              judge_round: Callable[[List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]],
+                              stopper: Any, condition: str, round_size: int = 8,
+                              seed: Any = 42) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Judge the plan in shuffled rounds of round_size jobs, updating the stopper (an AdaptiveStopper or
+    a sequential_testing stopper) after each round, until the condition is decided or the plan is
+    exhausted. Returns the (job, evaluation) pairs actually judged, in plan order; unparsed
+    judgments are returned but not counted by the stopper.
+    """
+    stopper.start(condition, len(plan))
+    judged = {}
+    order = adaptive_order(plan, seed)
+    for start in range(0, len(order), round_size):
+        positions = order[start:start + round_size]
+        evaluations = await judge_round([plan[position] for position in positions])
+        for position, evaluation in zip(positions, evaluations):
+            judged[position] = evaluation
+            if is_unparsed(evaluation):
+                continue
+            stopper.record(condition, winner_from_overall(evaluation['overall_winner'], plan[position]['a_is_test']))
+        if stopper.decision(condition):
+            break
+    return [(plan[position], judged[position]) for position in sorted(judged)]
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Vectorized BCa Bootstrap for Persona Experiment 03 Contrasts
+Bias-corrected and accelerated intervals for the mean difference, Cohen's d and Cliff's delta of
+every condition-vs-control contrast, without assuming normal 1-5 Likert scores. Each group's
+resamples are drawn as one (resamples x n) index matrix and reduced to score-level histograms, so
+every statistic is computed for all resamples at once; the jackknife for the acceleration needs only
+one leave-one-out value per distinct score. Metrics can be spread over a process pool; every group
+draws from its own child of the seed, so results do not depend on the number of workers.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+from scipy import special
+
+from stats_core import moments, cliff_delta
+
+STATISTICS = ['mean_difference', 'cohens_d', 'cliff_delta']
+
+
+def contrast_statistics(test: np.ndarray, control: np.ndarray, levels: np.ndarray) -> Dict[str, np.ndarray]:
+    """Mean difference, Cohen's d (pooled ddof=1 SD) and Cliff's delta of test over control histograms."""
+    n1, m1, v1 = moments(test, levels)
+    n2, m2, v2 = moments(control, levels)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pooled_std = np.sqrt(((n1 - 1) * v1 + (n2 - 1) * v2) / (n1 + n2 - 2))
+        return {
+            'mean_difference': m1 - m2,
+            'cohens_d': (m1 - m2) / pooled_std,
+            'cliff_delta': cliff_delta(test, control)
+        }
+
+
+def resample_histograms(hist: np.ndarray, n_resamples: int, rng: np.random.Generator) -> np.ndarray:
+    """Level histograms of n_resamples bootstrap resamples of the sample described by hist."""
+    n_levels = len(hist)
+    codes = np.repeat(np.arange(n_levels), hist.astype(np.int64))
+    index = rng.integers(0, len(codes), size=(n_resamples, len(codes)))
+    offsets = np.arange(n_resamples)[:, None] * n_levels
+    counts = np.bincount((codes[index] + offsets).ravel(), minlength=n_resamples * n_levels)
+    return counts.reshape(n_resamples, n_levels).astype(float)
+
+
+def jackknife_terms(hist: np.ndarray, statistic) -> Dict[str, np.ndarray]:
+    """
+    Acceleration numerator and denominator terms for one sample, as scipy.stats.bootstrap computes them.
+    Leaving out any observation at the same level gives the same value, so each level is evaluated once
+    and weighted by its count. hist is [..., level]; statistic maps leave-one-out histograms
+    [..., removed level, level] to {name: [..., removed level]}.
+    """
+    n = hist.sum(axis=-1)
+    weights = hist
+    leave_one_out = hist[..., None, :] - np.eye(hist.shape[-1])
+    terms = {}
+    for name, values in statistic(leave_one_out).items():
+        values = np.where(weights > 0, values, 0.0)
+        mean = (weights * values).sum(axis=-1) / n
+        u = (n - 1)[..., None] * (mean[..., None] - values)
+        terms[name] = ((weights * u ** 3).sum(axis=-1) / n ** 3, (weights * u ** 2).sum(axis=-1) / n ** 2)
+    return terms
+
+
+def bca_interval(estimate: np.ndarray, resampled: np.ndarray, acceleration: np.ndarray,
+                 alpha: float = 0.05) -> np.ndarray:
+    """BCa (lower, upper) from estimates [...], bootstrap values [..., resample] and acceleration [...]."""
+    valid = np.isfinite(resampled)
+    count = valid.sum(axis=-1)
+    below = ((resampled < estimate[..., None]) & valid).sum(axis=-1)
+    at_or_below = ((resampled <= estimate[..., None]) & valid).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bias_correction = special.ndtri((below + at_or_below) / (2 * count))
+        bounds = []
+        for z in (special.ndtri(alpha / 2), special.ndtri(1 - alpha / 2)):
+            shifted = bias_correction + z
+            bounds.append(special.ndtr(bias_correction + shifted / (1 - acceleration * shifted)))
+    interval = np.full(estimate.shape + (2,), np.nan)
+    for position in np.ndindex(estimate.shape):
+        probabilities = [bound[position] for bound in bounds]
+        if count[position] and all(np.isfinite(probabilities)):
+            interval[position] = np.nanpercentile(resampled[position], [100 * p for p in probabilities])
+    return interval
+
+
+def bootstrap_metric(hist: np.ndarray, levels: np.ndarray, reference: int, compared: List[int],
+                     seeds: List[np.random.SeedSequence], n_resamples: int, alpha: float) -> Dict[int, Any]:
+    """BCa intervals for every compared condition of one metric; hist is [condition, level]."""
+    n = hist.sum(axis=-1)
+    compared = [c for c in compared if n[c] > 0]
+    if n[reference] == 0 or not compared:
+        return {}
+
+    resampled = {c: resample_histograms(hist[c], n_resamples, np.random.default_rng(seeds[c]))
+                 for c in [reference] + compared}
+    test, control = hist[compared], hist[reference]
+    estimates = contrast_statistics(test, control, levels)
+    boot = contrast_statistics(np.stack([resampled[c] for c in compared]), resampled[reference][None], levels)
+
+    # Jackknife each sample with the other held at its full data
+    test_terms = jackknife_terms(test, lambda loo: contrast_statistics(loo, control[None, None], levels))
+    control_terms = jackknife_terms(
+        control, lambda loo: contrast_statistics(test[:, None], loo[None], levels))
+
+    intervals = {}
+    for name in STATISTICS:
+        numerator = test_terms[name][0] + control_terms[name][0]
+        denominator = test_terms[name][1] + control_terms[name][1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            acceleration = numerator / (6 * denominator ** 1.5)
+        acceleration = np.where(np.isfinite(acceleration), acceleration, 0.0)
+        intervals[name] = (estimates[name], bca_interval(estimates[name], boot[name], acceleration, alpha))
+
+    return {c: {name: {'estimate': float(estimate[row]),
+                       'ci_lower': float(interval[row, 0]),
+                       'ci_upper': float(interval[row, 1])}
+                for name, (estimate, interval) in intervals.items()}
+            for row, c in enumerate(compared)}
+
+
+class BootstrapEngine:
+    def __init__(self, n_resamples: int = 10000, alpha: float = 0.05, seed: int = 42,
+                 workers: Optional[int] = 1):
+        """n_resamples per group; workers > 1 (or None for all cores) spreads metrics over processes."""
+        self.n_resamples = n_resamples
+        self.alpha = alpha
+        self.seed = seed
+        self.workers = workers
+
+    def contrast_intervals(self, hist: np.ndarray, levels: np.ndarray, conditions: List[str],
+                           metrics: List[str], reference: str = 'control') -> Dict[str, Any]:
+        """
+        BCa intervals for hist [condition, metric, level] (a StatisticsCore histogram).
+        Returns {metric: {"<condition>_vs_<reference>": {statistic: {estimate, ci_lower, ci_upper}}}}.
+        """
+        if reference not in conditions:
+            return {metric: {} for metric in metrics}
+        ref = conditions.index(reference)
+        compared = [c for c in range(len(conditions)) if c != ref]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(conditions) * len(metrics))
+        tasks = [(hist[:, m], levels, ref, compared, seeds[m * len(conditions):(m + 1) * len(conditions)],
+                  self.n_resamples, self.alpha) for m in range(len(metrics))]
+
+        if self.workers == 1 or len(tasks) < 2:
+            results = [bootstrap_metric(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(self.workers) as pool:
+                results = list(pool.map(bootstrap_metric, *zip(*tasks)))
+
+        return {metric: {f"{conditions[c]}_vs_{reference}": {**intervals, 'n_resamples': self.n_resamples,
+                                                             'method': 'BCa'}
+                         for c, intervals in result.items()}
+                for metric, result in zip(metrics, results)}
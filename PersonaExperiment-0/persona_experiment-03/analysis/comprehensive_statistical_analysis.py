@@ -21,9 +21,12 @@ import seaborn as sns
 from scipy import stats
 from scipy.stats import (ttest_ind, mannwhitneyu, kruskal, chi2_contingency,
                         fisher_exact, pearsonr, spearmanr, shapiro, levene)
-import statsmodels.api as sm
-from statsmodels.stats.power import ttest_power
 from statsmodels.stats.contingency_tables import mcnemar
+from bootstrap import BootstrapEngine
+from mixed_effects import MixedEffectsEngine
+from permutation import PermutationEngine
+from results_loader import ResultsLoader, CONDITIONS, EVALUATION_METRICS
+from stats_core import ScoreCube, StatisticsCore, interpret_cohens_d, interpret_cliff_delta
 import os
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
@@ -52,195 +55,63 @@ plt.rcParams.update({
 class ComprehensiveStatisticalAnalyzer:
     """Advanced statistical analyzer for persona experiment results."""
     
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, bootstrap_resamples: int = 10000, seed: int = 42,
+                 workers: Optional[int] = 1):
         self.base_path = Path(base_path)
         self.results_path = self.base_path / "results"
         self.output_path = self.base_path / "analysis"
         self.viz_path = self.output_path / "visualizations"
         self.viz_path.mkdir(exist_ok=True)
         
-        # Load data from the main analyzer
-        from final_analysis import PersonaExperiment03Analyzer
-        self.main_analyzer = PersonaExperiment03Analyzer(str(base_path))
+        # Share the parsed results with every other analysis entry point
+        self.results_loader = ResultsLoader.load(str(base_path))
         
-        self.conditions = self.main_analyzer.conditions
-        self.evaluation_metrics = self.main_analyzer.evaluation_metrics
-        self.absolute_data = self.main_analyzer.absolute_data
-        self.pairwise_data = self.main_analyzer.pairwise_data
+        self.conditions = list(CONDITIONS)
+        self.evaluation_metrics = list(EVALUATION_METRICS)
+        self.absolute_data = self.results_loader.absolute_frame()
+        self.pairwise_data = self.results_loader.pairwise_frame()
+        
+        # Pivot the absolute scores once; all per-metric, per-condition tests run on the cube
+        # Contrast intervals come from a seeded BCa bootstrap rather than a normal approximation
+        self.stats_core = StatisticsCore(ScoreCube.from_store(self.results_loader.score_store),
+                                         bootstrap=BootstrapEngine(bootstrap_resamples, seed=seed, workers=workers))
+        self.permutation = PermutationEngine(seed=seed)
+        self.mixed_effects = MixedEffectsEngine()
         
     def test_assumptions(self) -> Dict[str, Any]:
         """Test statistical assumptions for parametric tests."""
-        assumption_results = {}
-        
-        for metric in self.evaluation_metrics:
-            metric_data = self.absolute_data[self.absolute_data['metric'] == metric]
-            assumption_results[metric] = {}
-            
-            # Test normality for each condition
-            normality_tests = {}
-            for condition in self.conditions:
-                condition_scores = metric_data[metric_data['condition'] == condition]['score']
-                if len(condition_scores) >= 3:  # Need at least 3 samples for Shapiro-Wilk
-                    stat, p_value = shapiro(condition_scores)
-                    normality_tests[condition] = {
-                        'statistic': round(stat, 4),
-                        'p_value': round(p_value, 4),
-                        'normal': p_value > 0.05
-                    }
-            
-            assumption_results[metric]['normality_tests'] = normality_tests
-            
-            # Test homogeneity of variances (Levene's test)
-            condition_groups = [
-                metric_data[metric_data['condition'] == cond]['score'].values
-                for cond in self.conditions
-                if len(metric_data[metric_data['condition'] == cond]) > 0
-            ]
-            
-            if len(condition_groups) >= 2 and all(len(group) >= 2 for group in condition_groups):
-                stat, p_value = levene(*condition_groups)
-                assumption_results[metric]['levene_test'] = {
-                    'statistic': round(stat, 4),
-                    'p_value': round(p_value, 4),
-                    'equal_variances': p_value > 0.05
-                }
-        
-        return assumption_results
+        return self.stats_core.assumption_tests()
     
     def perform_advanced_statistical_tests(self) -> Dict[str, Any]:
         """Perform comprehensive statistical tests."""
         test_results = {}
         
         # Test assumptions first
-        assumptions = self.test_assumptions()
-        test_results['assumption_tests'] = assumptions
+        test_results['assumption_tests'] = self.test_assumptions()
+        
+        # Kruskal-Wallis plus parametric and non-parametric comparisons against control
+        test_results.update(self.stats_core.comparison_tests())
         
+        # Within-query permutation tests of every contrast, in one vectorized pass
+        permutation_tests = self.permutation.score_difference_tests(self.stats_core.cube)
         for metric in self.evaluation_metrics:
-            metric_data = self.absolute_data[self.absolute_data['metric'] == metric]
-            test_results[metric] = {}
-            
-            # Kruskal-Wallis test (non-parametric ANOVA)
-            condition_groups = [
-                metric_data[metric_data['condition'] == cond]['score'].values
-                for cond in self.conditions
-                if len(metric_data[metric_data['condition'] == cond]) > 0
-            ]
-            
-            if len(condition_groups) >= 2:
-                kw_stat, kw_p = kruskal(*condition_groups)
-                test_results[metric]['kruskal_wallis'] = {
-                    'statistic': round(kw_stat, 4),
-                    'p_value': round(kw_p, 4),
-                    'significant': kw_p < 0.05
-                }
-            
-            # Pairwise comparisons (parametric and non-parametric)
-            control_scores = metric_data[metric_data['condition'] == 'control']['score']
-            pairwise_results = {}
-            
-            for condition in self.conditions[1:]:  # Skip control
-                test_scores = metric_data[metric_data['condition'] == condition]['score']
-                
-                if len(test_scores) > 0 and len(control_scores) > 0:
-                    # Parametric t-test (Welch's - unequal variances)
-                    t_stat, t_p = ttest_ind(test_scores, control_scores, equal_var=False)
-                    
-                    # Non-parametric Mann-Whitney U test
-                    mw_stat, mw_p = mannwhitneyu(test_scores, control_scores, 
-                                               alternative='two-sided')
-                    
-                    # Effect size calculations
-                    cohens_d = self.calculate_cohens_d(test_scores, control_scores)
-                    glass_delta = self.calculate_glass_delta(test_scores, control_scores)
-                    cliff_delta = self.calculate_cliff_delta(test_scores, control_scores)
-                    
-                    # Confidence intervals
-                    ci_95 = self.calculate_ci_mean_diff(test_scores, control_scores)
-                    
-                    pairwise_results[f"{condition}_vs_control"] = {
-                        'parametric_test': {
-                            't_statistic': round(t_stat, 4),
-                            'p_value': round(t_p, 4),
-                            'significant': t_p < 0.05
-                        },
-                        'non_parametric_test': {
-                            'mannwhitney_u': round(mw_stat, 4),
-                            'p_value': round(mw_p, 4),
-                            'significant': mw_p < 0.05
-                        },
-                        'effect_sizes': {
-                            'cohens_d': round(cohens_d, 4),
-                            'cohens_d_interpretation': self.interpret_cohens_d(cohens_d),
-                            'glass_delta': round(glass_delta, 4),
-                            'cliff_delta': round(cliff_delta, 4),
-                            'cliff_delta_interpretation': self.interpret_cliff_delta(cliff_delta)
-                        },
-                        'descriptive_stats': {
-                            'test_mean': round(test_scores.mean(), 4),
-                            'test_std': round(test_scores.std(), 4),
-                            'test_n': len(test_scores),
-                            'control_mean': round(control_scores.mean(), 4),
-                            'control_std': round(control_scores.std(), 4),
-                            'control_n': len(control_scores),
-                            'mean_difference': round(test_scores.mean() - control_scores.mean(), 4),
-                            'ci_95_lower': round(ci_95[0], 4),
-                            'ci_95_upper': round(ci_95[1], 4)
-                        }
-                    }
-            
-            test_results[metric]['pairwise_comparisons'] = pairwise_results
+            for contrast, comparison in test_results[metric]['pairwise_comparisons'].items():
+                if contrast in permutation_tests[metric]:
+                    comparison['permutation_test'] = permutation_tests[metric][contrast]
         
         return test_results
     
     def calculate_statistical_power(self) -> Dict[str, Any]:
         """Calculate statistical power and sample size adequacy."""
-        power_analysis = {}
-        
-        for metric in self.evaluation_metrics:
-            metric_data = self.absolute_data[self.absolute_data['metric'] == metric]
-            power_analysis[metric] = {}
-            
-            control_scores = metric_data[metric_data['condition'] == 'control']['score']
-            
-            for condition in self.conditions[1:]:
-                test_scores = metric_data[metric_data['condition'] == condition]['score']
-                
-                if len(test_scores) > 0 and len(control_scores) > 0:
-                    # Calculate effect size
-                    effect_size = self.calculate_cohens_d(test_scores, control_scores)
-                    
-                    # Current power
-                    n1, n2 = len(test_scores), len(control_scores)
-                    current_power = ttest_power(effect_size, n1, 0.05)
-                    
-                    # Sample size needed for 80% power
-                    from statsmodels.stats.power import tt_solve_power
-                    n_needed = tt_solve_power(effect_size=abs(effect_size), 
-                                            power=0.8, alpha=0.05, 
-                                            alternative='two-sided')
-                    
-                    # Sample size needed for 90% power
-                    n_needed_90 = tt_solve_power(effect_size=abs(effect_size), 
-                                               power=0.9, alpha=0.05, 
-                                               alternative='two-sided')
-                    
-                    power_analysis[metric][f"{condition}_vs_control"] = {
-                        'current_power': round(current_power, 4),
-                        'effect_size': round(effect_size, 4),
-                        'current_n_test': n1,
-                        'current_n_control': n2,
-                        'n_needed_80_power': round(n_needed, 0) if not np.isnan(n_needed) else 'undefined',
-                        'n_needed_90_power': round(n_needed_90, 0) if not np.isnan(n_needed_90) else 'undefined',
-                        'adequately_powered_80': current_power >= 0.8,
-                        'adequately_powered_90': current_power >= 0.9
-                    }
-        
-        return power_analysis
+        return self.stats_core.power_analysis()
     
     def analyze_query_type_effects(self) -> Dict[str, Any]:
         """Analyze performance differences by query type."""
         query_analysis = {}
         
+        # Scores share agents, queries and evaluators, so every metric is fit as one crossed mixed model
+        mixed_models = self.mixed_effects.fit_store(self.results_loader.score_store)
+        
         for metric in self.evaluation_metrics:
             metric_data = self.absolute_data[self.absolute_data['metric'] == metric]
             query_analysis[metric] = {}
@@ -252,34 +123,8 @@ class ComprehensiveStatisticalAnalyzer:
             
             query_analysis[metric]['query_type_stats'] = query_type_stats.to_dict('index')
             
-            # Test for interaction effects (query type × condition)
-            # Use two-way ANOVA if assumptions are met
-            try:
-                # Prepare data for ANOVA
-                formula = 'score ~ C(condition) * C(query_category)'
-                model = sm.formula.ols(formula, data=metric_data).fit()
-                anova_results = sm.stats.anova_lm(model, typ=2)
-                
-                query_analysis[metric]['two_way_anova'] = {
-                    'condition_effect': {
-                        'f_statistic': round(anova_results.loc['C(condition)', 'F'], 4),
-                        'p_value': round(anova_results.loc['C(condition)', 'PR(>F)'], 4),
-                        'significant': anova_results.loc['C(condition)', 'PR(>F)'] < 0.05
-                    },
-                    'query_type_effect': {
-                        'f_statistic': round(anova_results.loc['C(query_category)', 'F'], 4),
-                        'p_value': round(anova_results.loc['C(query_category)', 'PR(>F)'], 4),
-                        'significant': anova_results.loc['C(query_category)', 'PR(>F)'] < 0.05
-                    },
-                    'interaction_effect': {
-                        'f_statistic': round(anova_results.loc['C(condition):C(query_category)', 'F'], 4),
-                        'p_value': round(anova_results.loc['C(condition):C(query_category)', 'PR(>F)'], 4),
-                        'significant': anova_results.loc['C(condition):C(query_category)', 'PR(>F)'] < 0.05
-                    },
-                    'r_squared': round(model.rsquared, 4)
-                }
-            except Exception as e:
-                query_analysis[metric]['two_way_anova'] = {'error': str(e)}
+            # Condition, query type and interaction effects with agent, query and evaluator random effects
+            query_analysis[metric]['mixed_model'] = mixed_models[metric]
         
         return query_analysis
     
@@ -372,14 +217,17 @@ class ComprehensiveStatisticalAnalyzer:
         
         y_pos = 0
         colors = plt.cm.Set1(np.linspace(0, 1, len(self.conditions[1:])))
+        intervals = self.stats_core.bootstrap_intervals()
         
         for i, condition in enumerate(self.conditions[1:]):
             for j, metric in enumerate(self.evaluation_metrics):
-                # Get effect size data (would need to calculate from comprehensive analysis)
-                # This is a placeholder - you'd get actual effect sizes from your analysis
-                effect_size = np.random.normal(0.3, 0.2)  # Placeholder
-                ci_lower = effect_size - 0.2
-                ci_upper = effect_size + 0.2
+                # Cohen's d with its BCa bootstrap interval
+                contrast = intervals.get(metric, {}).get(f"{condition}_vs_control")
+                if contrast is None:
+                    continue
+                effect_size = contrast['cohens_d']['estimate']
+                ci_lower = contrast['cohens_d']['ci_lower']
+                ci_upper = contrast['cohens_d']['ci_upper']
                 
                 # Plot point and confidence interval
                 ax.plot(effect_size, y_pos, 'o', color=colors[i], markersize=8)
@@ -395,7 +243,7 @@ class ComprehensiveStatisticalAnalyzer:
         ax.axvline(x=0, color='black', linestyle='--', alpha=0.5)
         
         ax.set_xlabel("Cohen's d (Effect Size)", fontsize=14)
-        ax.set_title("Effect Sizes with 95% Confidence Intervals", fontsize=16, fontweight='bold')
+        ax.set_title("Effect Sizes with 95% BCa Bootstrap Confidence Intervals", fontsize=16, fontweight='bold')
         ax.set_xlim(-1.5, 1.5)
         ax.set_ylim(-1, y_pos)
         ax.set_yticks([])
@@ -453,27 +301,11 @@ class ComprehensiveStatisticalAnalyzer:
     
     def interpret_cohens_d(self, d: float) -> str:
         """Interpret Cohen's d effect size."""
-        abs_d = abs(d)
-        if abs_d < 0.2:
-            return "negligible"
-        elif abs_d < 0.5:
-            return "small"
-        elif abs_d < 0.8:
-            return "medium"
-        else:
-            return "large"
+        return interpret_cohens_d(d)
     
     def interpret_cliff_delta(self, delta: float) -> str:
         """Interpret Cliff's delta effect size."""
-        abs_delta = abs(delta)
-        if abs_delta < 0.147:
-            return "negligible"
-        elif abs_delta < 0.33:
-            return "small"
-        elif abs_delta < 0.474:
-            return "medium"
-        else:
-            return "large"
+        return interpret_cliff_delta(delta)
     
     def run_comprehensive_analysis(self) -> Dict[str, Any]:
         """Run complete comprehensive statistical analysis."""
@@ -485,7 +317,7 @@ class ComprehensiveStatisticalAnalyzer:
                 'date_analyzed': '2025-08-26',
                 'statistical_tests_performed': [
                     'assumption_testing', 'kruskal_wallis', 'mann_whitney_u',
-                    'welch_t_test', 'two_way_anova', 'power_analysis'
+                    'welch_t_test', 'permutation_test', 'mixed_effects_model', 'power_analysis'
                 ],
                 'effect_sizes_calculated': [
                     'cohens_d', 'glass_delta', 'cliff_delta'
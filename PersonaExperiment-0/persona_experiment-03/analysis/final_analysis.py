@@ -18,8 +18,21 @@ from scipy import stats
 from scipy.stats import ttest_ind, mannwhitneyu, wilcoxon
 import os
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
+import sys
 import warnings
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from adaptive_stopping import adaptive_order, wilson_interval
+from query_registry import QueryRegistry
+from bootstrap import BootstrapEngine
+from mixed_effects import MixedEffectsEngine
+from permutation import PermutationEngine, sign_flip_p_value
+from reliability import ReliabilityEngine
+from results_loader import ResultsLoader
+from sequential_testing import build_sequential_stopper
+from stats_core import ScoreCube, StatisticsCore
+
 warnings.filterwarnings('ignore')
 
 # Set up plotting parameters
@@ -31,7 +44,8 @@ sns.set_palette("Set2")
 class PersonaExperiment03Analyzer:
     """Comprehensive statistical analyzer for persona experiment 03 results."""
     
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, bootstrap_resamples: int = 10000, seed: int = 42,
+                 workers: Optional[int] = 1):
         self.base_path = Path(base_path)
         self.results_path = self.base_path / "results"
         self.output_path = self.base_path / "analysis"
@@ -53,8 +67,14 @@ class PersonaExperiment03Analyzer:
         # Load data
         self.randomization_key = self.load_randomization_key()
         self.query_types = self.load_query_types()
+        self.results_loader = ResultsLoader.load(str(self.base_path))
         self.absolute_data = self.load_absolute_evaluation_data()
         self.pairwise_data = self.load_pairwise_evaluation_data()
+        self.bootstrap = BootstrapEngine(bootstrap_resamples, seed=seed, workers=workers)
+        self.permutation = PermutationEngine(seed=seed)
+        self.mixed_effects = MixedEffectsEngine()
+        self.reliability = ReliabilityEngine(seed=seed, workers=workers)
+        self.seed = seed
         
     def load_randomization_key(self) -> Dict[str, str]:
         """Load the randomization key for de-randomization."""
@@ -62,106 +82,17 @@ class PersonaExperiment03Analyzer:
             return json.load(f)
     
     def load_query_types(self) -> Dict[str, str]:
-        """Load and categorize query types."""
-        with open(self.base_path / "experiment_queries.json", 'r') as f:
-            queries = json.load(f)
-        
-        # Categorize queries by type
-        query_categories = {
-            'query_1': 'factual',      # GitHub Copilot cost
-            'query_2': 'factual',      # OpenAI news
-            'query_3': 'technical',    # CAP theorem
-            'query_4': 'technical',    # OAuth implementation
-            'query_5': 'advisory',     # React vs Vue
-            'query_6': 'advisory',     # Salary negotiation
-            'query_7': 'guidance',     # ML learning
-            'query_8': 'technical',    # Debug performance
-            'query_9': 'advisory',     # Convince CEO
-            'query_10': 'factual',     # Blockchain
-            'query_11': 'advisory',    # Team productivity
-            'query_12': 'factual'      # Python
-        }
-        
-        return query_categories
+        """Load and categorize query types from the shared query registry."""
+        return dict(QueryRegistry.load(str(self.base_path)).categories)
     
     def load_absolute_evaluation_data(self) -> pd.DataFrame:
         """Load and process absolute evaluation data."""
-        all_data = []
-        
-        # Load absolute evaluation results
-        for evaluator_id in [4, 5, 6, 7]:
-            file_path = self.results_path / f"absolute_evaluator_{evaluator_id}_results.json"
-            if file_path.exists():
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                
-                # Process each condition's results
-                for dataset_name, dataset_results in data['dataset_results'].items():
-                    # Map back to original condition using randomization key
-                    original_file = dataset_results['original_file']
-                    condition = self.extract_condition_from_filename(original_file)
-                    agent_id = self.extract_agent_id_from_filename(original_file)
-                    
-                    # Process each query evaluation
-                    for query_id, query_data in dataset_results['query_evaluations'].items():
-                        query_category = self.query_types.get(query_id, 'unknown')
-                        
-                        for metric, metric_data in query_data['evaluation'].items():
-                            row = {
-                                'evaluator_id': evaluator_id,
-                                'condition': condition,
-                                'agent_id': agent_id,
-                                'query_id': query_id,
-                                'query_category': query_category,
-                                'metric': metric,
-                                'score': metric_data['score'],
-                                'dataset_file': dataset_name,
-                                'original_file': original_file
-                            }
-                            all_data.append(row)
-        
-        return pd.DataFrame(all_data)
+        self.score_store = self.results_loader.score_store
+        return self.results_loader.absolute_frame()
     
     def load_pairwise_evaluation_data(self) -> pd.DataFrame:
         """Load and process pairwise evaluation data."""
-        all_data = []
-        
-        # Load pairwise evaluation results (only evaluator 4 exists)
-        file_path = self.results_path / "pairwise_evaluator_4_results.json"
-        if file_path.exists():
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            # Process each test condition's comparisons
-            for condition, condition_data in data['results'].items():
-                if condition == 'control':  # Skip control comparisons
-                    continue
-                
-                for comparison_key, comparison_data in condition_data['comparisons'].items():
-                    # Process each query comparison
-                    for query_id, query_result in comparison_data['query_results'].items():
-                        query_category = self.query_types.get(query_id, 'unknown')
-                        
-                        # Extract agent information
-                        test_agent = self.extract_agent_id_from_filename(comparison_data['test_original'])
-                        control_agent = self.extract_agent_id_from_filename(comparison_data['control_original'])
-                        
-                        # Record overall winner
-                        row = {
-                            'evaluator_id': 4,
-                            'test_condition': condition,
-                            'test_agent': test_agent,
-                            'control_agent': control_agent,
-                            'query_id': query_id,
-                            'query_category': query_category,
-                            'winner': query_result['winner'],
-                            'test_wins': 1 if query_result['winner'] == 'test' else 0,
-                            'control_wins': 1 if query_result['winner'] == 'control' else 0,
-                            'comparison_key': comparison_key
-                        }
-                        all_data.append(row)
-        
-        return pd.DataFrame(all_data)
+        return self.results_loader.pairwise_frame()
     
     def extract_condition_from_filename(self, filename: str) -> str:
         """Extract condition name from response filename."""
@@ -191,6 +122,11 @@ class PersonaExperiment03Analyzer:
         
         # Statistical significance tests (t-tests) between conditions
         pairwise_tests = {}
+        core = StatisticsCore(ScoreCube.from_store(self.score_store), bootstrap=self.bootstrap)
+        intervals = core.bootstrap_intervals()
+        permutation_tests = self.permutation.score_difference_tests(core.cube)
+        # Rows share agents, queries and evaluators; the mixed model accounts for that, Welch's t does not
+        mixed_models = self.mixed_effects.fit_store(self.score_store)
         for metric in self.evaluation_metrics:
             metric_data = self.absolute_data[self.absolute_data['metric'] == metric]
             pairwise_tests[metric] = {}
@@ -211,21 +147,24 @@ class PersonaExperiment03Analyzer:
                                         (len(test_scores) + len(control_scores) - 2))
                     cohens_d = (test_scores.mean() - control_scores.mean()) / pooled_std
                     
-                    # 95% confidence interval for mean difference
-                    se_diff = np.sqrt(test_scores.var()/len(test_scores) + 
-                                     control_scores.var()/len(control_scores))
+                    # 95% BCa bootstrap intervals (Likert scores are not normal)
                     mean_diff = test_scores.mean() - control_scores.mean()
-                    ci_95 = (mean_diff - 1.96*se_diff, mean_diff + 1.96*se_diff)
+                    bca = intervals[metric][f"{condition}_vs_control"]
+                    ci_95 = (bca['mean_difference']['ci_lower'], bca['mean_difference']['ci_upper'])
                     
                     pairwise_tests[metric][f"{condition}_vs_control"] = {
                         't_statistic': round(t_stat, 4),
                         'p_value': round(p_value, 4),
                         'significant': p_value < 0.05,
+                        'permutation_p_value': permutation_tests[metric][f"{condition}_vs_control"]['p_value'],
+                        'mixed_model': mixed_models[metric].get('condition_contrasts', {}).get(f"{condition}_vs_control"),
                         'cohens_d': round(cohens_d, 4),
                         'effect_size_interpretation': self.interpret_cohens_d(cohens_d),
                         'mean_difference': round(mean_diff, 4),
                         'ci_95_lower': round(ci_95[0], 4),
                         'ci_95_upper': round(ci_95[1], 4),
+                        'cohens_d_ci_95_lower': round(bca['cohens_d']['ci_lower'], 4),
+                        'cohens_d_ci_95_upper': round(bca['cohens_d']['ci_upper'], 4),
                         'test_mean': round(test_scores.mean(), 4),
                         'control_mean': round(control_scores.mean(), 4),
                         'test_n': len(test_scores),
@@ -267,7 +206,8 @@ class PersonaExperiment03Analyzer:
             n_total = win_rates.loc[condition, 'total_comparisons']
             
             # Binomial test (null hypothesis: win rate = 0.5)
-            p_value = stats.binom_test(n_wins, n_total, p=0.5, alternative='two-sided')
+            # (exact sign-flip permutation test; stats.binom_test is gone from SciPy)
+            p_value = sign_flip_p_value(n_wins, n_total)
             
             pairwise_stats['win_rates'][condition]['binomial_p_value'] = round(p_value, 4)
             pairwise_stats['win_rates'][condition]['significant'] = p_value < 0.05
@@ -290,39 +230,68 @@ class PersonaExperiment03Analyzer:
         
         return pairwise_stats
     
+    def calculate_sequential_analysis(self, method: str = 'obrien_fleming', look_size: int = 8) -> Dict[str, Any]:
+        """
+        Replay each condition's pairwise judgments through a sequential stopper in looks of look_size,
+        in the shuffled order the evaluation engine's adaptive/sequential mode judges them, and report
+        where each condition-vs-control contrast would have stopped.
+        """
+        if self.pairwise_data.empty:
+            return {'error': 'No pairwise evaluation data available'}
+        
+        sequential_stats = {}
+        for condition, rows in self.pairwise_data.groupby('test_condition', sort=False):
+            winners = rows['winner'].tolist()
+            order = adaptive_order(winners, f"{self.seed}:{condition}:order")
+            stopper = build_sequential_stopper(method)
+            stopper.start(condition, len(winners))
+            
+            judged = len(winners)
+            for start in range(0, len(order), look_size):
+                for position in order[start:start + look_size]:
+                    stopper.record(condition, winners[position])
+                if stopper.decision(condition):
+                    judged = min(start + look_size, len(order))
+                    break
+            sequential_stats[condition] = stopper.report(condition, judged, len(winners))
+        
+        return sequential_stats
+    
     def calculate_inter_evaluator_reliability(self) -> Dict[str, Any]:
-        """Calculate inter-evaluator reliability statistics."""
-        reliability_stats = {}
+        """
+        Calculate inter-evaluator reliability statistics from every available rating.
+        Evaluators score different subsets of responses, so nothing is dropped for missing ratings:
+        correlations use pairwise-complete ratings and the ReliabilityEngine statistics handle gaps natively.
+        """
+        reliability_stats = self.reliability.reliability(self.score_store, self.results_loader.pairwise_rows)
         
-        # Create pivot table for each metric
         for metric in self.evaluation_metrics:
             metric_data = self.absolute_data[self.absolute_data['metric'] == metric]
+            if metric_data.empty:
+                continue
             
-            # Pivot to get evaluators as columns, (condition, agent, query) as rows
+            # Pivot to get evaluators as columns, (response file, query) as rows
             pivot_data = metric_data.pivot_table(
                 values='score',
-                index=['condition', 'agent_id', 'query_id'],
-                columns='evaluator_id',
-                fill_value=np.nan
+                index=['original_file', 'query_id'],
+                columns='evaluator_id'
             )
             
-            # Calculate correlation matrix between evaluators
+            # Correlation matrix between evaluators over the responses both scored
             corr_matrix = pivot_data.corr()
+            upper = corr_matrix.values[np.triu_indices_from(corr_matrix.values, k=1)]
             
-            # Calculate Cronbach's alpha (internal consistency)
-            cronbach_alpha = self.calculate_cronbach_alpha(pivot_data.values)
-            
-            # Intraclass Correlation Coefficient (ICC)
-            icc = self.calculate_icc(pivot_data.values)
-            
-            reliability_stats[metric] = {
+            reliability_stats.setdefault(metric, {}).update({
                 'correlation_matrix': corr_matrix.to_dict(),
-                'mean_correlation': corr_matrix.values[np.triu_indices_from(corr_matrix.values, k=1)].mean(),
-                'cronbach_alpha': round(cronbach_alpha, 4),
-                'icc': round(icc, 4),
-                'n_evaluators': len(pivot_data.columns),
-                'n_items': len(pivot_data)
-            }
+                'mean_correlation': round(float(np.nanmean(upper)), 4) if np.isfinite(upper).any() else None
+            })
+        
+        # Say so in the report when no response was rated by two evaluators, rather than leave the section empty
+        if not any('krippendorff_alpha_ordinal' in stats or 'fleiss_kappa' in stats
+                   for stats in reliability_stats.values()):
+            reliability_stats['note'] = ('No inter-evaluator reliability is estimable: no response was scored by '
+                                         'more than one evaluator, so there is no agreement to measure. Run the '
+                                         'full evaluator panel to obtain reliability figures.')
         
         return reliability_stats
     
@@ -339,65 +308,8 @@ class PersonaExperiment03Analyzer:
             return "large"
     
     def binomial_ci(self, successes: int, trials: int, alpha: float = 0.05) -> Tuple[float, float]:
-        """Calculate binomial confidence interval."""
-        if trials == 0:
-            return 0.0, 0.0
-        
-        # Wilson score interval
-        z = stats.norm.ppf(1 - alpha/2)
-        p = successes / trials
-        n = trials
-        
-        denominator = 1 + z**2/n
-        centre = (p + z**2/(2*n)) / denominator
-        delta = z * np.sqrt(p*(1-p)/n + z**2/(4*n**2)) / denominator
-        
-        return max(0, centre - delta), min(1, centre + delta)
-    
-    def calculate_cronbach_alpha(self, data: np.ndarray) -> float:
-        """Calculate Cronbach's alpha for internal consistency."""
-        data_clean = data[~np.isnan(data).any(axis=1)]  # Remove rows with NaN
-        if len(data_clean) == 0:
-            return np.nan
-        
-        n_items = data_clean.shape[1]
-        if n_items < 2:
-            return np.nan
-        
-        item_variances = np.var(data_clean, axis=0, ddof=1)
-        total_variance = np.var(data_clean.sum(axis=1), ddof=1)
-        
-        alpha = (n_items / (n_items - 1)) * (1 - item_variances.sum() / total_variance)
-        return alpha
-    
-    def calculate_icc(self, data: np.ndarray) -> float:
-        """Calculate Intraclass Correlation Coefficient (ICC)."""
-        data_clean = data[~np.isnan(data).any(axis=1)]  # Remove rows with NaN
-        if len(data_clean) == 0:
-            return np.nan
-        
-        n_subjects, n_raters = data_clean.shape
-        if n_subjects < 2 or n_raters < 2:
-            return np.nan
-        
-        # Calculate ICC(2,1) - two-way random effects, single measures, absolute agreement
-        subject_means = np.mean(data_clean, axis=1)
-        rater_means = np.mean(data_clean, axis=0)
-        grand_mean = np.mean(data_clean)
-        
-        # Sum of squares
-        ss_total = np.sum((data_clean - grand_mean) ** 2)
-        ss_between_subjects = n_raters * np.sum((subject_means - grand_mean) ** 2)
-        ss_between_raters = n_subjects * np.sum((rater_means - grand_mean) ** 2)
-        ss_error = ss_total - ss_between_subjects - ss_between_raters
-        
-        # Mean squares
-        ms_between_subjects = ss_between_subjects / (n_subjects - 1)
-        ms_error = ss_error / ((n_subjects - 1) * (n_raters - 1))
-        
-        # ICC calculation
-        icc = (ms_between_subjects - ms_error) / ms_between_subjects
-        return max(0, icc)  # ICC should be non-negative
+        """Calculate binomial confidence interval (Wilson score interval)."""
+        return wilson_interval(successes, trials, alpha)
     
     def run_comprehensive_analysis(self) -> Dict[str, Any]:
         """Run complete statistical analysis."""
@@ -416,6 +328,7 @@ class PersonaExperiment03Analyzer:
             },
             'absolute_evaluation_analysis': self.calculate_absolute_statistics(),
             'pairwise_comparison_analysis': self.calculate_pairwise_statistics(),
+            'sequential_analysis': self.calculate_sequential_analysis(),
             'inter_evaluator_reliability': self.calculate_inter_evaluator_reliability()
         }
         
@@ -441,6 +354,9 @@ def main():
     
     # Print key findings
     print("\n=== KEY FINDINGS ===")
+    reliability_note = results['inter_evaluator_reliability'].get('note')
+    if reliability_note:
+        print(f"Inter-evaluator reliability: {reliability_note}")
     if 'pairwise_tests' in results['absolute_evaluation_analysis']:
         print("Statistical significance tests (vs control):")
         for metric, tests in results['absolute_evaluation_analysis']['pairwise_tests'].items():
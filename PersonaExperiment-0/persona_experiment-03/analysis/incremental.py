@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Incremental Analysis for Persona Experiment 03
+Keeps sufficient statistics per (evaluator, condition, query, metric) cell (count, sum, sum of squares
+and the score histogram the rank tests need) and win/tie tallies per (evaluator, condition, query) in a
+persisted state file, filed under the results file they came from. A run re-reads only the results files
+that are new or whose size or modification time changed (evaluators are discovered by file name, so
+absolute_evaluator_8..14 need no code change), replaces those files' contributions, and re-derives only
+the condition-vs-control contrasts with a changed condition or control cell. Every other contrast is
+served from the state file.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple, Any, Optional, Set
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from adaptive_stopping import wilson_interval
+from permutation import sign_flip_p_value
+from results_loader import CONDITIONS, EVALUATION_METRICS, extract_condition_from_filename
+from stats_core import moments, welch_t, mann_whitney, cliff_delta, interpret_cohens_d, interpret_cliff_delta
+
+STATE_VERSION = 1
+
+ABSOLUTE_PATTERN = re.compile(r"absolute_evaluator_(\d+)_results\.json$")
+PAIRWISE_PATTERN = re.compile(r"pairwise_evaluator_(\d+)_results\.json$")
+
+
+def parse_absolute_file(data: Dict[str, Any], evaluator_id: int) -> Dict[Tuple, Dict[str, Any]]:
+    """Sufficient statistics per (evaluator, condition, query, metric) cell of one absolute results file."""
+    cells = {}
+    for dataset_results in data['dataset_results'].values():
+        condition = extract_condition_from_filename(dataset_results['original_file'])
+        for query_id, query_data in dataset_results['query_evaluations'].items():
+            if query_data['evaluation'].get('unparsed'):  # Judge reply that could not be read
+                continue
+            for metric, metric_data in query_data['evaluation'].items():
+                score = metric_data['score']
+                if score != int(score):
+                    raise ValueError(f"Score {score!r} is not an integer")
+                cell = cells.setdefault((evaluator_id, condition, query_id, metric),
+                                        {'count': 0, 'sum': 0, 'sum_sq': 0, 'histogram': {}})
+                score = int(score)
+                cell['count'] += 1
+                cell['sum'] += score
+                cell['sum_sq'] += score * score
+                cell['histogram'][score] = cell['histogram'].get(score, 0) + 1
+    return cells
+
+
+def parse_pairwise_file(data: Dict[str, Any], evaluator_id: int) -> Dict[Tuple, Dict[str, int]]:
+    """Win/tie tallies per (evaluator, condition, query) of one pairwise results file."""
+    tallies = {}
+    for condition, condition_data in data['results'].items():
+        if condition == 'control':  # Skip control comparisons
+            continue
+        for comparison_data in condition_data['comparisons'].values():
+            for query_id, query_result in comparison_data['query_results'].items():
+                if query_result['winner'] == 'unparsed':
+                    continue
+                tally = tallies.setdefault((evaluator_id, condition, query_id),
+                                           {'test_wins': 0, 'control_wins': 0, 'ties': 0})
+                key = {'test': 'test_wins', 'control': 'control_wins'}.get(query_result['winner'], 'ties')
+                tally[key] += 1
+    return tallies
+
+
+def absolute_contrasts(test: np.ndarray, control: np.ndarray, levels: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Welch t, Mann-Whitney U and effect sizes of condition-vs-control contrasts from their histograms,
+    test and control [contrast, level], all in one vectorized pass.
+    """
+    n1, m1, v1 = moments(test, levels)
+    n2, m2, v2 = moments(control, levels)
+    t_stat, p_value = welch_t(test, control, levels)
+    u_stat, mw_p_value = mann_whitney(test, control, levels)
+    delta = cliff_delta(test, control)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cohens_d = (m1 - m2) / np.sqrt(((n1 - 1) * v1 + (n2 - 1) * v2) / (n1 + n2 - 2))
+    return [{
+        't_statistic': round(float(t_stat[row]), 4),
+        'p_value': round(float(p_value[row]), 4),
+        'significant': bool(p_value[row] < 0.05),
+        'mann_whitney_u': float(u_stat[row]),
+        'mann_whitney_p_value': round(float(mw_p_value[row]), 4),
+        'cohens_d': round(float(cohens_d[row]), 4),
+        'effect_size_interpretation': interpret_cohens_d(float(cohens_d[row])),
+        'cliff_delta': round(float(delta[row]), 4),
+        'cliff_delta_interpretation': interpret_cliff_delta(float(delta[row])),
+        'mean_difference': round(float(m1[row] - m2[row]), 4),
+        'test_mean': round(float(m1[row]), 4),
+        'control_mean': round(float(m2[row]), 4),
+        'test_n': int(n1[row]),
+        'control_n': int(n2[row])
+    } for row in range(len(test))]
+
+
+def pairwise_win_rate(test_wins: int, control_wins: int, ties: int) -> Dict[str, Any]:
+    """Win rate, exact sign-flip p-value and Wilson interval of one condition's tallies (ties excluded)."""
+    decided = test_wins + control_wins
+    p_value = sign_flip_p_value(test_wins, decided)
+    ci_lower, ci_upper = wilson_interval(test_wins, decided)
+    return {
+        'test_wins': test_wins,
+        'control_wins': control_wins,
+        'ties': ties,
+        'total_comparisons': decided,
+        'win_rate': round(test_wins / decided, 4) if decided else None,
+        'binomial_p_value': round(p_value, 4),
+        'significant': p_value < 0.05,
+        'ci_95_lower': round(ci_lower, 4),
+        'ci_95_upper': round(ci_upper, 4)
+    }
+
+
+class IncrementalAnalysis:
+    def __init__(self, base_path: str, state_path: Optional[str] = None):
+        """Analyze the results under base_path, keeping state in analysis/results_cache/ by default."""
+        self.base_path = Path(base_path)
+        self.results_path = self.base_path / "results"
+        self.state_path = (Path(state_path) if state_path
+                           else self.base_path / "analysis" / "results_cache" / "incremental_state.json")
+        self.files_read = []
+        self.recomputed = {'absolute': [], 'pairwise': []}
+        self.state = self.load_state()
+
+    def empty_state(self) -> Dict[str, Any]:
+        """State with no results files folded in."""
+        return {'version': STATE_VERSION, 'sources': {}, 'absolute': {}, 'pairwise': {},
+                'derived': {'absolute': {}, 'pairwise': {}}}
+
+    def load_state(self) -> Dict[str, Any]:
+        """Read the state file (tuple cell keys are stored '|'-joined), or start empty."""
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return self.empty_state()
+        if state.get('version') != STATE_VERSION:
+            return self.empty_state()
+
+        for filename, cells in state['absolute'].items():
+            state['absolute'][filename] = {
+                self.cell_key(key): {**cell, 'histogram': {int(score): count for score, count in cell['histogram'].items()}}
+                for key, cell in cells.items()}
+        for filename, tallies in state['pairwise'].items():
+            state['pairwise'][filename] = {self.cell_key(key): tally for key, tally in tallies.items()}
+        return state
+
+    def cell_key(self, key: str) -> Tuple:
+        """Parse a stored 'evaluator|condition|query[|metric]' key."""
+        evaluator_id, *rest = key.split('|')
+        return (int(evaluator_id), *rest)
+
+    def save_state(self):
+        """Write the state file atomically."""
+        state = dict(self.state)
+        state['absolute'] = {filename: {'|'.join(map(str, key)): cell for key, cell in cells.items()}
+                             for filename, cells in self.state['absolute'].items()}
+        state['pairwise'] = {filename: {'|'.join(map(str, key)): tally for key, tally in tallies.items()}
+                             for filename, tallies in self.state['pairwise'].items()}
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+            with open(temp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            print(f"WARNING: could not write incremental state to {self.state_path}: {e}")
+
+    def source_files(self) -> Dict[str, Tuple[str, int]]:
+        """Every absolute/pairwise results file present: name -> (mode, evaluator id)."""
+        sources = {}
+        for path in sorted(self.results_path.glob("*_evaluator_*_results.json")):
+            for mode, pattern in (('absolute', ABSOLUTE_PATTERN), ('pairwise', PAIRWISE_PATTERN)):
+                match = pattern.match(path.name)
+                if match:
+                    sources[path.name] = (mode, int(match.group(1)))
+        return sources
+
+    def update(self) -> Dict[str, Any]:
+        """Fold new, changed and removed results files into the state and re-derive the touched contrasts."""
+        sources = self.source_files()
+        touched_cells = set()
+        touched_conditions = set()
+
+        for filename in list(self.state['sources']):
+            if filename not in sources:
+                touched_cells |= {(key[1], key[3]) for key in self.state['absolute'].pop(filename, {})}
+                touched_conditions |= {key[1] for key in self.state['pairwise'].pop(filename, {})}
+                del self.state['sources'][filename]
+
+        for filename, (mode, evaluator_id) in sources.items():
+            stat = (self.results_path / filename).stat()
+            signature = [stat.st_size, stat.st_mtime_ns]
+            if self.state['sources'].get(filename) == signature:
+                continue
+
+            self.files_read.append(filename)
+            with open(self.results_path / filename, 'r') as f:
+                data = json.load(f)
+            if mode == 'absolute':
+                cells = parse_absolute_file(data, evaluator_id)
+                previous = self.state['absolute'].get(filename, {})
+                touched_cells |= {(key[1], key[3]) for key in set(previous) | set(cells)
+                                  if previous.get(key) != cells.get(key)}
+                self.state['absolute'][filename] = cells
+            else:
+                tallies = parse_pairwise_file(data, evaluator_id)
+                previous = self.state['pairwise'].get(filename, {})
+                touched_conditions |= {key[1] for key in set(previous) | set(tallies)
+                                       if previous.get(key) != tallies.get(key)}
+                self.state['pairwise'][filename] = tallies
+            self.state['sources'][filename] = signature
+
+        self.derive_absolute(touched_cells)
+        self.derive_pairwise(touched_conditions)
+        self.save_state()
+
+        derived = self.state['derived']
+        recomputed = (sum(name in derived['absolute'].get(metric, {}) for metric, name in self.recomputed['absolute'])
+                      + sum(condition in derived['pairwise'] for condition in self.recomputed['pairwise']))
+        total = sum(len(tests) for tests in derived['absolute'].values()) + len(derived['pairwise'])
+        return {'files_read': self.files_read, 'contrasts_recomputed': recomputed, 'contrasts_reused': total - recomputed}
+
+    def pooled_histograms(self, cells: Set[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[int, int]]:
+        """Score histograms of the given (condition, metric) cells, pooled over evaluators and queries."""
+        pooled = {cell: {} for cell in cells}
+        for file_cells in self.state['absolute'].values():
+            for (_, condition, _, metric), cell in file_cells.items():
+                histogram = pooled.get((condition, metric))
+                if histogram is not None:
+                    for score, count in cell['histogram'].items():
+                        histogram[score] = histogram.get(score, 0) + count
+        return pooled
+
+    def derive_absolute(self, touched_cells: Set[Tuple[str, str]]):
+        """Re-derive every condition-vs-control test whose condition or control cell changed."""
+        contrasts = set()
+        for condition, metric in touched_cells:
+            if metric not in EVALUATION_METRICS:
+                continue
+            if condition == 'control':
+                contrasts |= {(metric, compared) for compared in CONDITIONS[1:]}
+            elif condition in CONDITIONS:
+                contrasts.add((metric, condition))
+        if not contrasts:
+            return
+
+        histograms = self.pooled_histograms({(condition, metric) for metric, condition in contrasts}
+                                            | {('control', metric) for metric, _ in contrasts})
+        derived = self.state['derived']['absolute']
+        computable = []
+        for metric, condition in sorted(contrasts):
+            derived.setdefault(metric, {}).pop(f"{condition}_vs_control", None)
+            self.recomputed['absolute'].append((metric, f"{condition}_vs_control"))
+            if histograms[(condition, metric)] and histograms[('control', metric)]:
+                computable.append((metric, condition))
+        if not computable:
+            return
+
+        levels = sorted({score for histogram in histograms.values() for score in histogram})
+        test = np.array([[histograms[(condition, metric)].get(level, 0) for level in levels]
+                         for metric, condition in computable], dtype=float)
+        control = np.array([[histograms[('control', metric)].get(level, 0) for level in levels]
+                            for metric, _ in computable], dtype=float)
+        for (metric, condition), tests in zip(computable, absolute_contrasts(test, control, np.array(levels, dtype=float))):
+            derived[metric][f"{condition}_vs_control"] = tests
+
+    def derive_pairwise(self, touched_conditions: Set[str]):
+        """Re-derive the win-rate test of every condition whose tallies changed."""
+        derived = self.state['derived']['pairwise']
+        for condition in sorted(touched_conditions):
+            totals = {'test_wins': 0, 'control_wins': 0, 'ties': 0}
+            for tallies in self.state['pairwise'].values():
+                for key, tally in tallies.items():
+                    if key[1] == condition:
+                        for name in totals:
+                            totals[name] += tally[name]
+            derived.pop(condition, None)
+            if sum(totals.values()):
+                derived[condition] = pairwise_win_rate(totals['test_wins'], totals['control_wins'], totals['ties'])
+            self.recomputed['pairwise'].append(condition)
+
+    def results(self) -> Dict[str, Any]:
+        """Current derived results for every contrast."""
+        return {
+            'absolute_tests': {metric: dict(sorted(tests.items()))
+                               for metric, tests in self.state['derived']['absolute'].items()},
+            'pairwise_win_rates': dict(sorted(self.state['derived']['pairwise'].items())),
+            'sources': sorted(self.state['sources'])
+        }
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Update persona experiment 03 statistics from new or changed results files")
+    parser.add_argument('--base-path', default=str(Path(__file__).resolve().parent.parent))
+    parser.add_argument('--state-path', default=None,
+                        help="state file location (default: analysis/results_cache/incremental_state.json)")
+    parser.add_argument('--rebuild', action='store_true', help="ignore the saved state and re-read every results file")
+    args = parser.parse_args()
+
+    analysis = IncrementalAnalysis(args.base_path, args.state_path)
+    if args.rebuild:
+        analysis.state = analysis.empty_state()
+    summary = analysis.update()
+    print(f"Read {len(summary['files_read'])} results files: {', '.join(summary['files_read']) or 'none changed'}")
+    print(f"Recomputed {summary['contrasts_recomputed']} contrasts, reused {summary['contrasts_reused']}")
+
+    output_file = Path(args.base_path) / "analysis" / "incremental_analysis_results.json"
+    with open(output_file, 'w') as f:
+        json.dump(analysis.results(), f, indent=2)
+    print(f"Results saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
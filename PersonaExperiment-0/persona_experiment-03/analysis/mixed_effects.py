@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Crossed Random-Effects Models for Persona Experiment 03
+Fits score ~ condition * query_category + (1|agent) + (1|query) + (1|evaluator) by REML for every
+metric at once. Scores are not independent rows: one agent answered every query and one evaluator scored
+many agents, so condition effects are tested against agent-level variation instead of row-level noise.
+The design is built once from a ScoreStore's code columns; every metric's fit then depends only on the
+cross-product matrix of [fixed | random | score] columns (a few dozen columns, whatever the number of
+rows), so the profiled REML deviance (Bates et al., lme4) is evaluated for all metrics in one batched
+Cholesky and optimized jointly. Fixed-effect terms get Wald chi-square tests: main effects in the
+additive model, the interaction in the full model (as type II ANOVA).
+A random effect whose levels are nested in the fixed effects (in experiment 03 every evaluator scored
+only one or two conditions) has no identified variance, so it is dropped from the model with a note.
+The fit is started from several points, and a metric whose starts do not agree on one optimum is
+reported as not estimable rather than with intervals that depend on where the optimizer stopped.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+from scipy import optimize, stats
+
+RANDOM_EFFECTS = ['agent', 'query', 'evaluator']
+
+FIXED_FORMULA = 'score ~ condition * query_category'
+
+
+def one_hot(codes: np.ndarray, levels: int) -> np.ndarray:
+    """Indicator columns [row, level]."""
+    matrix = np.zeros((len(codes), levels))
+    matrix[np.arange(len(codes)), codes] = 1
+    return matrix
+
+
+def reml_pieces(theta: np.ndarray, gram: np.ndarray, n: np.ndarray, p: int, groups: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Profiled REML quantities for relative random-effect SDs theta [metric, effect], from the cross-products
+    gram [metric, column, column] of columns [fixed (p) | random | score].
+    """
+    q = len(groups)
+    xtx, xty = gram[:, :p, :p], gram[:, :p, -1]
+    ztx, zty, ztz = gram[:, p:p + q, :p], gram[:, p:p + q, -1], gram[:, p:p + q, p:p + q]
+    yty = gram[:, -1, -1]
+
+    scale = theta[:, groups]
+    factor = np.linalg.cholesky(scale[:, :, None] * ztz * scale[:, None, :] + np.eye(q))
+    rzx = np.linalg.solve(factor, scale[:, :, None] * ztx)
+    cu = np.linalg.solve(factor, (scale * zty)[..., None])[..., 0]
+    rxtrx = xtx - np.swapaxes(rzx, 1, 2) @ rzx
+    rhs = xty - (np.swapaxes(rzx, 1, 2) @ cu[..., None])[..., 0]
+    beta = np.linalg.solve(rxtrx, rhs[..., None])[..., 0]
+    residual = yty - (cu * cu).sum(axis=-1) - (beta * rhs).sum(axis=-1)
+
+    dof = n - p
+    with np.errstate(divide='ignore', invalid='ignore'):
+        deviance = (2 * np.log(np.diagonal(factor, axis1=1, axis2=2)).sum(axis=-1)
+                    + np.linalg.slogdet(rxtrx)[1] + dof * (1 + np.log(2 * np.pi * residual / dof)))
+    return {'beta': beta, 'rxtrx': rxtrx, 'sigma2': residual / dof, 'deviance': deviance}
+
+
+def nested_effects(fixed: np.ndarray, random: List[np.ndarray]) -> List[int]:
+    """Random effects whose indicator columns lie in the span of the fixed-effect columns."""
+    rank = np.linalg.matrix_rank(fixed)
+    return [k for k, block in enumerate(random) if np.linalg.matrix_rank(np.hstack([fixed, block])) == rank]
+
+
+def fit_reml(gram: np.ndarray, n: np.ndarray, p: int, groups: np.ndarray, n_effects: int,
+             effects: List[int], starts: Tuple[float, ...] = (1.0, 0.1, 10.0),
+             tolerance: float = 1e-3) -> Dict[str, np.ndarray]:
+    """
+    REML fit of every metric with only the random effects in effects (the others stay at zero). The
+    deviances are separable, so their sum is minimized jointly from every start and each metric keeps its
+    lowest optimum; it converged when that run succeeded and every successful start is within tolerance.
+    The optimizer works on theta squared: the deviance is even in theta, so theta = 0 is a stationary point
+    that a bounded gradient search cannot leave once it gets there.
+    """
+    metrics, k = len(gram), len(effects)
+    kept = np.isin(groups, effects)
+    index = np.concatenate([np.arange(p), p + np.flatnonzero(kept), [gram.shape[1] - 1]])
+    gram = gram[:, index][:, :, index]
+    groups = np.searchsorted(effects, groups[kept])
+
+    def objective(flat: np.ndarray) -> float:
+        return float(reml_pieces(np.sqrt(flat).reshape(metrics, k), gram, n, p, groups)['deviance'].sum())
+
+    thetas, deviances, successes = [], [], []
+    for start in starts if k else ():
+        result = optimize.minimize(objective, np.full(metrics * k, start ** 2), method='L-BFGS-B',
+                                   bounds=[(0, None)] * (metrics * k))
+        thetas.append(np.sqrt(result.x).reshape(metrics, k))
+        deviances.append(reml_pieces(thetas[-1], gram, n, p, groups)['deviance'])
+        successes.append(result.success)
+    if not k:
+        thetas, successes = [np.zeros((metrics, 0))], [True]
+        deviances.append(reml_pieces(thetas[0], gram, n, p, groups)['deviance'])
+    deviances, successes = np.array(deviances), np.array(successes)
+    best = np.argmin(np.where(np.isfinite(deviances), deviances, np.inf), axis=0)
+    lowest = deviances[best, np.arange(metrics)]
+    agree = np.all(~successes[:, None] | (np.abs(deviances - lowest) <= tolerance), axis=0)
+
+    theta = np.zeros((metrics, n_effects))
+    theta[:, effects] = np.array(thetas)[best, np.arange(metrics)]
+    pieces = reml_pieces(theta[:, effects], gram, n, p, groups)
+    pieces['theta'] = theta
+    pieces['covariance'] = pieces['sigma2'][:, None, None] * np.linalg.inv(pieces['rxtrx'])
+    pieces['converged'] = successes[best] & agree & np.isfinite(lowest)
+    return pieces
+
+
+def wald_test(beta: np.ndarray, covariance: np.ndarray, columns: List[int]) -> Tuple[float, int, float]:
+    """Wald chi-square, df and p-value that the coefficients in columns are all zero."""
+    if not columns:
+        return float('nan'), 0, float('nan')
+    b = beta[columns]
+    chi2 = float(b @ np.linalg.solve(covariance[np.ix_(columns, columns)], b))
+    return chi2, len(columns), float(stats.chi2.sf(chi2, len(columns)))
+
+
+class MixedEffectsEngine:
+    def __init__(self, reference: str = 'control', alpha: float = 0.05, starts: Tuple[float, ...] = (1.0, 0.1, 10.0)):
+        """Treatment-coded conditions against reference; alpha for significance flags and intervals;
+        starts are the relative random-effect SDs the REML optimizer is started from."""
+        self.reference = reference
+        self.alpha = alpha
+        self.starts = starts
+
+    def design(self, store: Any) -> Dict[str, Any]:
+        """
+        One row per scored (evaluator, dataset, query) with a score column per metric (NaN when missing).
+        Agents are response files (the original file behind each blinded dataset), so an agent scored by
+        several evaluators shares one random effect.
+        """
+        columns = {name: np.frombuffer(column, dtype=np.dtype(column.typecode)).astype(np.int64)
+                   for name, column in store.columns.items()}
+        dataset_condition = np.frombuffer(store.dataset_condition, dtype=np.int8).astype(np.int64)
+        query_category = np.frombuffer(store.query_category, dtype=np.int8).astype(np.int64)
+        condition = dataset_condition[columns['dataset']]
+        keep = ((condition < len(store.analysis_conditions)) & (columns['metric'] < len(store.analysis_metrics)))
+        columns = {name: column[keep] for name, column in columns.items()}
+        condition = condition[keep]
+
+        units, unit_codes = np.unique(np.stack([columns['evaluator'], columns['dataset'], columns['query']], axis=1),
+                                      axis=0, return_inverse=True)
+        unit_codes = unit_codes.reshape(-1)
+        scores = np.full((len(units), len(store.analysis_metrics)), np.nan)
+        flat = unit_codes * len(store.analysis_metrics) + columns['metric']
+        if len(np.unique(flat)) != len(flat):
+            raise ValueError("Duplicate scores for the same (evaluator, dataset, query, metric)")
+        scores[unit_codes, columns['metric']] = columns['score']
+
+        _, agent_codes = np.unique(np.array(store.dataset_original, dtype=object)[units[:, 1]].astype(str),
+                                   return_inverse=True)
+        return {
+            'scores': scores,
+            'condition': dataset_condition[units[:, 1]],
+            'category': query_category[units[:, 2]],
+            'random': [agent_codes.reshape(-1), units[:, 2], units[:, 0]]
+        }
+
+    def fixed_columns(self, design: Dict[str, Any], conditions: List[str]) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Intercept, treatment-coded condition and category columns and their products; empty columns dropped."""
+        reference = conditions.index(self.reference)
+        present = sorted(set(design['category'].tolist()))
+        compared = [c for c in range(len(conditions)) if c != reference and np.any(design['condition'] == c)]
+        condition_columns = [(design['condition'] == c).astype(float) for c in compared]
+        category_columns = [(design['category'] == k).astype(float) for k in present[1:]]
+
+        matrix = [np.ones(len(design['condition']))]
+        terms = {'condition': [], 'query_category': [], 'interaction': []}
+        names = {}
+        for c, column in zip(compared, condition_columns):
+            names[len(matrix)] = conditions[c]
+            terms['condition'].append(len(matrix))
+            matrix.append(column)
+        for column in category_columns:
+            terms['query_category'].append(len(matrix))
+            matrix.append(column)
+        for condition_column in condition_columns:
+            for category_column in category_columns:
+                product = condition_column * category_column
+                if product.any():
+                    terms['interaction'].append(len(matrix))
+                    matrix.append(product)
+        return np.stack(matrix, axis=1), {'terms': terms, 'condition_names': names}
+
+    def fit_store(self, store: Any) -> Dict[str, Any]:
+        """Fit every analysis metric of a score_store.ScoreStore; returns {metric: results}."""
+        design = self.design(store)
+        conditions, metrics = store.analysis_conditions, store.analysis_metrics
+        if self.reference not in conditions or not len(design['scores']):
+            return {metric: {'error': 'No data for the mixed-effects model'} for metric in metrics}
+
+        fixed, layout = self.fixed_columns(design, conditions)
+        terms = layout['terms']
+        random = [one_hot(codes, int(codes.max()) + 1) for codes in design['random']]
+        groups = np.concatenate([np.full(block.shape[1], k) for k, block in enumerate(random)])
+
+        # Cross-products of [fixed | random | score] per metric, with missing scores weighted out
+        observed = ~np.isnan(design['scores'])
+        full = np.concatenate([fixed] + random + [np.zeros((len(fixed), 1))], axis=1)
+        weighted = observed.T[:, :, None] * full[None]
+        weighted[..., -1] = np.where(observed, design['scores'], 0.0).T
+        gram = np.swapaxes(weighted, 1, 2) @ weighted
+        n = observed.sum(axis=0).astype(float)
+
+        p_full = fixed.shape[1]
+        additive = list(range(1 + len(terms['condition']) + len(terms['query_category'])))
+        additive_index = additive + list(range(p_full, gram.shape[1]))
+        fitted = (n > p_full + 1)
+        results = {metric: {'error': 'Too few scores for the mixed-effects model'} for metric in metrics}
+        if not fitted.any():
+            return results
+
+        # A random effect nested in the fixed effects has an unidentified variance, so it is left out
+        nested = nested_effects(fixed[:, additive], random)
+        estimated = [k for k in range(len(RANDOM_EFFECTS)) if k not in nested]
+        full_estimated = [k for k in estimated if k not in nested_effects(fixed, random)]
+        main = fit_reml(gram[fitted][:, additive_index][:, :, additive_index], n[fitted], len(additive),
+                        groups, len(RANDOM_EFFECTS), estimated, self.starts)
+        full_fit = fit_reml(gram[fitted], n[fitted], p_full, groups, len(RANDOM_EFFECTS), full_estimated, self.starts)
+        model = ' + '.join([FIXED_FORMULA] + [f"(1|{RANDOM_EFFECTS[k]})" for k in estimated])
+        notes = [f"{RANDOM_EFFECTS[k]} random effect dropped: its levels are nested in the fixed effects, "
+                 f"so its variance is not estimable" for k in nested]
+        notes += [f"{RANDOM_EFFECTS[k]} random effect dropped from the interaction model: its levels are nested "
+                  f"in the condition x query_category effects" for k in estimated if k not in full_estimated]
+
+        z = stats.norm.ppf(1 - self.alpha / 2)
+        for row, m in enumerate(np.flatnonzero(fitted)):
+            if not main['converged'][row]:
+                results[metrics[m]] = {
+                    'model': model,
+                    'estimation': 'REML',
+                    'n_observations': int(n[m]),
+                    'converged': False,
+                    'error': 'not estimable: the REML fit did not converge to one optimum',
+                    'notes': notes,
+                    'condition_contrasts': {f"{layout['condition_names'][column]}_vs_{self.reference}":
+                                            {'status': 'not estimable'} for column in terms['condition']}
+                }
+                continue
+            beta, covariance = main['beta'][row], main['covariance'][row]
+            sigma2 = float(main['sigma2'][row])
+            components = {RANDOM_EFFECTS[k]: float(sigma2 * main['theta'][row, k] ** 2) for k in estimated}
+
+            # Nakagawa R^2: variance of the fixed-effect predictions, from the cross-products alone
+            xtx = gram[m][np.ix_(additive, additive)]
+            fixed_variance = float(beta @ xtx @ beta / n[m] - (beta @ xtx[:, 0] / n[m]) ** 2)
+            total = fixed_variance + sum(components.values()) + sigma2
+
+            effects = {}
+            for name, columns, fit in (('condition_effect', terms['condition'], main),
+                                       ('query_type_effect', terms['query_category'], main),
+                                       ('interaction_effect', list(range(len(additive), p_full)), full_fit)):
+                if not fit['converged'][row]:
+                    effects[name] = {'status': 'not estimable'}
+                    continue
+                chi2, df, p_value = wald_test(fit['beta'][row], fit['covariance'][row], columns)
+                effects[name] = {'wald_chi2': round(chi2, 4), 'df': df, 'p_value': round(p_value, 4),
+                                 'significant': bool(p_value < self.alpha)} if df else None
+
+            contrasts = {}
+            for column in terms['condition']:
+                estimate, std_error = float(beta[column]), float(np.sqrt(covariance[column, column]))
+                p_value = float(2 * stats.norm.sf(abs(estimate / std_error)))
+                contrasts[f"{layout['condition_names'][column]}_vs_{self.reference}"] = {
+                    'estimate': round(estimate, 4),
+                    'std_error': round(std_error, 4),
+                    'z': round(estimate / std_error, 4),
+                    'p_value': round(p_value, 4),
+                    'significant': p_value < self.alpha,
+                    'ci_95_lower': round(estimate - z * std_error, 4),
+                    'ci_95_upper': round(estimate + z * std_error, 4)
+                }
+
+            results[metrics[m]] = {
+                'model': model,
+                'estimation': 'REML',
+                'n_observations': int(n[m]),
+                'converged': True,
+                'notes': notes,
+                **effects,
+                'condition_contrasts': contrasts,
+                'variance_components': {**{name: round(value, 4) for name, value in components.items()},
+                                        'residual': round(sigma2, 4)},
+                'r_squared_marginal': round(fixed_variance / total, 4),
+                'r_squared_conditional': round((fixed_variance + sum(components.values())) / total, 4),
+                'reml_deviance': round(float(main['deviance'][row]), 4)
+            }
+        return results
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Permutation Tests for Persona Experiment 03
+Score differences: condition labels are permuted within query blocks (each query's test and control
+scores are exchangeable under the null; queries are not), and every metric x contrast is tested
+against one shared matrix of within-block label assignments, so a whole batch of permutations is a
+single matrix product. Designs small enough to enumerate are tested exactly.
+Win rates: under the null each non-tie judgment is equally likely to go either way, so flipping
+winners is the permutation scheme; its distribution is exactly Binomial(n, 1/2), which replaces the
+stats.binom_test call newer SciPy no longer provides.
+"""
+
+import itertools
+import math
+from typing import Dict, Any
+
+import numpy as np
+from scipy import stats
+
+
+def block_values(scores: np.ndarray, condition: int, reference: int) -> np.ndarray:
+    """
+    Arrange a ScoreCube array [evaluator, condition, agent, query, metric] as [metric, query, slot]
+    for one contrast: the condition's (evaluator, agent) scores first, the reference's after.
+    """
+    test = np.moveaxis(scores[:, condition], (2, 3), (0, 1))       # [query, metric, evaluator, agent]
+    control = np.moveaxis(scores[:, reference], (2, 3), (0, 1))
+    q, m = test.shape[:2]
+    values = np.concatenate([test.reshape(q, m, -1), control.reshape(q, m, -1)], axis=-1)
+    return values.transpose(1, 0, 2)
+
+
+def label_matrix(n_permutations: int, n_blocks: int, n_slots: int, n_test: int,
+                 rng: np.random.Generator) -> np.ndarray:
+    """Random within-block assignments [permutation, block, slot] with n_test test labels per block."""
+    labels = np.zeros((n_permutations, n_blocks, n_slots))
+    labels[..., :n_test] = 1
+    return rng.permuted(labels, axis=-1)
+
+
+def exact_label_matrix(n_blocks: int, n_slots: int, n_test: int) -> np.ndarray:
+    """Every within-block assignment [assignment, block, slot]."""
+    choices = []
+    for combination in itertools.combinations(range(n_slots), n_test):
+        labels = np.zeros(n_slots)
+        labels[list(combination)] = 1
+        choices.append(labels)
+    return np.array([np.stack(blocks) for blocks in itertools.product(choices, repeat=n_blocks)])
+
+
+def mean_differences(filled: np.ndarray, valid: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """
+    Test-minus-control mean for every row of filled/valid [row, block*slot] under every assignment
+    of labels [assignment, block*slot]; returns [row, assignment].
+    """
+    test_sum = filled @ labels.T
+    test_count = valid @ labels.T
+    total_sum = filled.sum(axis=-1, keepdims=True)
+    total_count = valid.sum(axis=-1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return test_sum / test_count - (total_sum - test_sum) / (total_count - test_count)
+
+
+class PermutationEngine:
+    def __init__(self, n_permutations: int = 10000, seed: int = 42, exact_limit: int = 20000,
+                 batch_size: int = 2000):
+        """Monte-Carlo with n_permutations draws, or exact when the design has at most exact_limit assignments."""
+        self.n_permutations = n_permutations
+        self.seed = seed
+        self.exact_limit = exact_limit
+        self.batch_size = batch_size
+
+    def score_difference_tests(self, cube: Any, reference: str = 'control') -> Dict[str, Any]:
+        """
+        Two-sided within-query permutation tests of the mean score difference for every metric and
+        every condition vs reference of a stats_core.ScoreCube. Missing cells stay in their slots and
+        are skipped in the means. Returns {metric: {"<condition>_vs_<reference>": {...}}}.
+        """
+        if reference not in cube.conditions:
+            return {metric: {} for metric in cube.metrics}
+        ref = cube.conditions.index(reference)
+        compared = [c for c in range(len(cube.conditions)) if c != ref]
+
+        # [contrast * metric, query * slot], so one matmul covers every test
+        values = np.stack([block_values(cube.scores, c, ref) for c in compared])
+        n_contrasts, n_metrics, n_blocks, n_slots = values.shape
+        n_test = n_slots // 2
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0).reshape(n_contrasts * n_metrics, -1)
+        valid = valid.reshape(n_contrasts * n_metrics, -1).astype(float)
+
+        observed_labels = np.zeros((1, n_blocks, n_slots))
+        observed_labels[..., :n_test] = 1
+        observed = mean_differences(filled, valid, observed_labels.reshape(1, -1))[:, 0]
+
+        assignments = math.comb(n_slots, n_test) ** n_blocks
+        exact = assignments <= self.exact_limit
+        exceed = np.zeros(len(observed))
+        tolerance = 1e-12 * np.maximum(1, np.abs(observed))
+        if exact:
+            labels = exact_label_matrix(n_blocks, n_slots, n_test).reshape(assignments, -1)
+            differences = mean_differences(filled, valid, labels)
+            exceed += (np.abs(differences) >= (np.abs(observed) - tolerance)[:, None]).sum(axis=1)
+            p_values = exceed / assignments
+            drawn = assignments
+        else:
+            rng = np.random.default_rng(self.seed)
+            for start in range(0, self.n_permutations, self.batch_size):
+                size = min(self.batch_size, self.n_permutations - start)
+                labels = label_matrix(size, n_blocks, n_slots, n_test, rng).reshape(size, -1)
+                differences = mean_differences(filled, valid, labels)
+                exceed += (np.abs(differences) >= (np.abs(observed) - tolerance)[:, None]).sum(axis=1)
+            p_values = (exceed + 1) / (self.n_permutations + 1)
+            drawn = self.n_permutations
+
+        observed = observed.reshape(n_contrasts, n_metrics)
+        p_values = p_values.reshape(n_contrasts, n_metrics)
+        results = {}
+        for m, metric in enumerate(cube.metrics):
+            results[metric] = {}
+            for row, c in enumerate(compared):
+                if not np.isfinite(observed[row, m]):
+                    continue
+                results[metric][f"{cube.conditions[c]}_vs_{reference}"] = {
+                    'mean_difference': round(float(observed[row, m]), 4),
+                    'p_value': round(float(p_values[row, m]), 4),
+                    'significant': bool(p_values[row, m] < 0.05),
+                    'permutations': int(drawn),
+                    'exact': exact,
+                    'blocks': 'query'
+                }
+        return results
+
+
+def sign_flip_p_value(wins: int, trials: int) -> float:
+    """
+    Two-sided p-value of wins out of trials non-tie judgments when every winner may be flipped.
+    The flip distribution is exactly Binomial(trials, 1/2), so this equals the old stats.binom_test.
+    """
+    if trials == 0:
+        return 1.0
+    return float(stats.binomtest(int(wins), int(trials), p=0.5, alternative='two-sided').pvalue)
+
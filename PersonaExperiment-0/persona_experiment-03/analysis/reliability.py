@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Inter-Evaluator Reliability for Persona Experiment 03
+Reliability from every available rating. Evaluators cover different conditions (evaluator 7 scores
+only tests 3 and 4), so rated units are kept with however many ratings they have instead of being
+dropped for any missing evaluator. Ratings are held as sparse [unit, evaluator] matrices, where a unit
+is one response file's answer to one query.
+
+Krippendorff's alpha (ordinal) comes from the coincidence matrix of pairable values. Only values from
+different evaluators are paired, and an evaluator who rated a unit more than once contributes one
+value spread over the levels it gave. ICC(1,1), ICC(2,1) and ICC(3,k) come from unbalanced ANOVA
+moments (Henderson's method I), which reduce to the Shrout-Fleiss mean squares when every unit has
+every rating. Fleiss' kappa for pairwise verdicts allows a varying number of raters per item.
+
+Every statistic is a function of per-unit sums, so a whole batch of unit-level bootstrap resamples is
+one sparse matrix product. Metrics can be spread over a process pool, each drawing from its own child
+of the seed.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+from scipy import sparse
+
+PAIRWISE_CATEGORIES = ['test', 'control', 'tie']
+
+
+def weighted_sums(weights: np.ndarray, matrix: Any) -> np.ndarray:
+    """weights [resample, unit] @ matrix [unit, column] for a sparse or dense matrix."""
+    return np.asarray((matrix.T @ weights.T).T)
+
+
+def icc_statistics(weights: np.ndarray, values: Any, mask: Any) -> Dict[str, np.ndarray]:
+    """
+    ICC(1,1), ICC(2,1) and ICC(3,k) for each row of unit weights, from sparse [unit, rater] ratings.
+    Two-way variance components solve Henderson's method I moment equations for the subject, rater and
+    residual variances; the one-way model gives ICC(1,1). k is the mean number of ratings per unit.
+    """
+    counts = np.asarray(mask.sum(axis=1)).ravel()
+    sums = np.asarray(values.sum(axis=1)).ravel()
+    squares = np.asarray(values.multiply(values).sum(axis=1)).ravel()
+    rater_counts = weighted_sums(weights, mask)
+    rater_sums = weighted_sums(weights, values)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        units = weights @ (counts > 0)
+        raters = (rater_counts > 0).sum(axis=-1)
+        n = weights @ counts
+        t_0 = weights @ squares
+        t_units = weights @ np.where(counts > 0, sums ** 2 / np.maximum(counts, 1), 0.0)
+        t_mean = (weights @ sums) ** 2 / n
+        t_raters = np.where(rater_counts > 0, rater_sums ** 2 / np.maximum(rater_counts, 1), 0.0).sum(axis=-1)
+        k_units = (weights @ counts ** 2) / n
+        k_raters = (rater_counts ** 2).sum(axis=-1) / n
+
+        # E[T_units - T_mean], E[T_raters - T_mean], E[T_0 - T_mean] in (subject, rater, residual) variances
+        coefficients = np.stack([
+            np.stack([n - k_units, units - k_raters, units - 1], axis=-1),
+            np.stack([raters - k_units, n - k_raters, raters - 1], axis=-1),
+            np.stack([n - k_units, n - k_raters, n - 1], axis=-1)
+        ], axis=-2)
+        moments = np.stack([t_units - t_mean, t_raters - t_mean, t_0 - t_mean], axis=-1)
+        solvable = np.isfinite(coefficients).all(axis=(-2, -1)) & (np.abs(np.linalg.det(
+            np.where(np.isfinite(coefficients), coefficients, 0.0))) > 1e-9)
+        components = np.full(moments.shape, np.nan)
+        if solvable.any():
+            components[solvable] = np.linalg.solve(coefficients[solvable], moments[solvable][..., None])[..., 0]
+        subject, rater, residual = components[..., 0], components[..., 1], components[..., 2]
+
+        within = (t_0 - t_units) / (n - units)
+        one_way_subject = ((t_units - t_mean) / (units - 1) - within) / ((n - k_units) / (units - 1))
+        k = n / units
+        return {
+            'icc1_1': one_way_subject / (one_way_subject + within),
+            'icc2_1': subject / (subject + rater + residual),
+            'icc3_k': subject / (subject + residual / k),
+            'subject_variance': subject,
+            'rater_variance': rater,
+            'residual_variance': residual
+        }
+
+
+def krippendorff_ordinal(weights: np.ndarray, pairs: Any, n_levels: int) -> np.ndarray:
+    """
+    Krippendorff's alpha with the ordinal metric for each row of unit weights. pairs [unit, level * level]
+    holds each pairable unit's coincidences between different evaluators' values, V_c V_k - sum_r V_rc V_rk,
+    already divided by m_u - 1 (m_u evaluators, each evaluator's values V_r summing to one).
+    """
+    coincidences = weighted_sums(weights, pairs).reshape(-1, n_levels, n_levels)
+    marginals = coincidences.sum(axis=-1)
+    total = marginals.sum(axis=-1)
+
+    # delta^2_ck = (sum of n_g for g from c to k - (n_c + n_k) / 2)^2
+    cumulative = np.cumsum(marginals, axis=-1)
+    low = np.minimum.outer(np.arange(n_levels), np.arange(n_levels))
+    high = np.maximum.outer(np.arange(n_levels), np.arange(n_levels))
+    between = cumulative[:, high] - cumulative[:, low] + marginals[:, low]
+    delta = (between - (marginals[:, :, None] + marginals[:, None, :]) / 2) ** 2
+
+    observed = (coincidences * delta).sum(axis=(-2, -1))
+    expected = (marginals[:, :, None] * marginals[:, None, :] * delta).sum(axis=(-2, -1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 1 - (total - 1) * observed / expected
+
+
+def fleiss_kappa(weights: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Fleiss' kappa for each row of item weights; counts [item, category], items with < 2 ratings ignored."""
+    raters = counts.sum(axis=-1)
+    rated = raters >= 2
+    counts, raters, weights = counts[rated], raters[rated], weights[:, rated]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        agreement = ((counts ** 2).sum(axis=-1) - raters) / (raters * (raters - 1))
+        observed = (weights @ agreement) / weights.sum(axis=-1)
+        proportions = (weights @ counts) / (weights @ raters)[:, None]
+        chance = (proportions ** 2).sum(axis=-1)
+        return (observed - chance) / (1 - chance)
+
+
+def bootstrap_reliability(kind: str, inputs: Dict[str, Any], n_resamples: int, seed: np.random.SeedSequence,
+                          alpha: float) -> Dict[str, Any]:
+    """Estimates and percentile intervals of one statistic family (unit-level resampling)."""
+    n_units = inputs['n_units']
+    if kind == 'absolute':
+        statistic = lambda w: {**icc_statistics(w, inputs['values'], inputs['mask']),
+                               'krippendorff_alpha_ordinal': krippendorff_ordinal(w, inputs['pairs'], inputs['n_levels'])}
+    else:
+        statistic = lambda w: {'fleiss_kappa': fleiss_kappa(w, inputs['counts'])}
+
+    estimates = statistic(np.ones((1, n_units)))
+    rng = np.random.default_rng(seed)
+    resampled = statistic(rng.multinomial(n_units, np.full(n_units, 1 / n_units), size=n_resamples).astype(float))
+
+    results = {}
+    for name, estimate in estimates.items():
+        values = resampled[name][np.isfinite(resampled[name])]
+        lower, upper = (np.percentile(values, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+                        if len(values) else (np.nan, np.nan))
+        results[name] = {'estimate': round(float(estimate[0]), 4), 'ci_lower': round(float(lower), 4),
+                         'ci_upper': round(float(upper), 4)}
+    return results
+
+
+class ReliabilityEngine:
+    def __init__(self, n_resamples: int = 2000, alpha: float = 0.05, seed: int = 42,
+                 workers: Optional[int] = 1):
+        """n_resamples unit-level bootstrap draws; workers > 1 (or None for all cores) spreads metrics over processes."""
+        self.n_resamples = n_resamples
+        self.alpha = alpha
+        self.seed = seed
+        self.workers = workers
+
+    def absolute_inputs(self, store: Any) -> Dict[str, Dict[str, Any]]:
+        """Sparse [unit, evaluator] ratings and per-unit coincidences of every analysis metric of a ScoreStore."""
+        columns = {name: np.frombuffer(column, dtype=np.dtype(column.typecode)).astype(np.int64)
+                   for name, column in store.columns.items()}
+        originals, original_codes = np.unique(np.array(store.dataset_original, dtype=str), return_inverse=True)
+        unit_codes = original_codes.reshape(-1)[columns['dataset']] * len(store.queries) + columns['query']
+        levels, level_codes = np.unique(columns['score'], return_inverse=True)
+        level_codes = level_codes.reshape(-1)
+
+        inputs = {}
+        for m, metric in enumerate(store.analysis_metrics):
+            rows = columns['metric'] == m
+            if not rows.any():
+                continue
+            units, unit_index = np.unique(unit_codes[rows], return_inverse=True)
+            unit_index = unit_index.reshape(-1)
+            shape = (len(units), len(store.evaluators))
+            raters = columns['evaluator'][rows]
+
+            # Duplicate (unit, evaluator) ratings are averaged for the ICCs and form one pairable value
+            totals = sparse.csr_matrix((columns['score'][rows].astype(float), (unit_index, raters)), shape=shape)
+            counts = sparse.csr_matrix((np.ones(rows.sum()), (unit_index, raters)), shape=shape)
+            mask = counts.copy()
+            mask.data[:] = 1.0
+            values = counts.copy()
+            values.data = totals.data / counts.data
+
+            # Per-evaluator level shares, so repeat ratings are never paired with each other
+            rater_values = np.zeros((len(units) * shape[1], len(levels)))
+            np.add.at(rater_values, (unit_index * shape[1] + raters, level_codes[rows]), 1.0)
+            rater_values /= np.maximum(rater_values.sum(axis=-1, keepdims=True), 1.0)
+            rater_values = rater_values.reshape(len(units), shape[1], len(levels))
+            value_counts = rater_values.sum(axis=1)
+            pairable = np.asarray(mask.sum(axis=1)).ravel()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scale = np.where(pairable > 1, 1 / (pairable - 1), 0.0)
+            coincidences = (value_counts[:, :, None] * value_counts[:, None, :]
+                            - np.einsum('urc,urk->uck', rater_values, rater_values))
+            pairs = sparse.csr_matrix((coincidences * scale[:, None, None]).reshape(len(units), -1))
+
+            inputs[metric] = {'n_units': len(units), 'values': values, 'mask': mask, 'pairs': pairs,
+                              'n_levels': len(levels), 'n_ratings': int(rows.sum()),
+                              'n_pairable_units': int((pairable > 1).sum()),
+                              'mean_ratings_per_unit': round(float(mask.sum()) / len(units), 4),
+                              'n_evaluators': int(len(np.unique(raters)))}
+        return inputs
+
+    def pairwise_inputs(self, rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Verdict counts [item, category] per (condition, comparison, query) across pairwise evaluators."""
+        items = {}
+        for row in rows:
+            if row['winner'] not in PAIRWISE_CATEGORIES:
+                continue
+            item = (row['test_condition'], row['comparison_key'], row['query_id'])
+            counts = items.setdefault(item, [0] * len(PAIRWISE_CATEGORIES))
+            counts[PAIRWISE_CATEGORIES.index(row['winner'])] += 1
+        if not items:
+            return None
+        counts = np.array(list(items.values()), dtype=float)
+        return {'n_units': len(counts), 'counts': counts, 'n_ratings': len(rows),
+                'n_pairable_units': int((counts.sum(axis=-1) > 1).sum()),
+                'n_evaluators': len({row['evaluator_id'] for row in rows})}
+
+    def run(self, tasks: Dict[str, Any]) -> Dict[str, Any]:
+        """Bootstrap every (name, kind, inputs) task, in parallel when workers > 1."""
+        seeds = np.random.SeedSequence(self.seed).spawn(len(tasks))
+        arguments = [(kind, inputs, self.n_resamples, seed, self.alpha)
+                     for (kind, inputs), seed in zip(tasks.values(), seeds)]
+        if self.workers == 1 or len(arguments) < 2:
+            results = [bootstrap_reliability(*task) for task in arguments]
+        else:
+            with ProcessPoolExecutor(self.workers) as pool:
+                results = list(pool.map(bootstrap_reliability, *zip(*arguments)))
+        return dict(zip(tasks, results))
+
+    def reliability(self, store: Any, pairwise_rows: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Reliability of every analysis metric of a ScoreStore, plus Fleiss' kappa of the pairwise verdicts.
+        Returns {metric: {statistic: {estimate, ci_lower, ci_upper}, ...}, 'pairwise_verdicts': {...}}.
+        """
+        absolute = self.absolute_inputs(store)
+        described = {metric: ('absolute', inputs) for metric, inputs in absolute.items()}
+        pairwise = self.pairwise_inputs(pairwise_rows or [])
+        if pairwise:
+            described['pairwise_verdicts'] = ('pairwise', pairwise)
+        tasks = {name: task for name, task in described.items() if task[1]['n_pairable_units']}
+        statistics = self.run(tasks)
+
+        results = {}
+        for name, (_, inputs) in described.items():
+            results[name] = {**statistics.get(name, {'note': 'No unit has ratings from two evaluators'}),
+                             'n_units': inputs['n_units'],
+                             'n_pairable_units': inputs['n_pairable_units'],
+                             'n_ratings': inputs['n_ratings'],
+                             **({'mean_ratings_per_unit': inputs['mean_ratings_per_unit']}
+                                if 'mean_ratings_per_unit' in inputs else {}),
+                             'n_evaluators': inputs['n_evaluators'],
+                             'n_resamples': self.n_resamples,
+                             'ci_method': 'percentile_bootstrap_over_units'}
+        return results
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Shared Results Loader for Persona Experiment 03 Analyses
+Parses the absolute and pairwise evaluation results once per run and shares them between
+PersonaExperiment03Analyzer, ComprehensiveStatisticalAnalyzer and SimplifiedAnalyzer. Parsed results
+are also kept on disk (a ScoreStore file plus the pairwise rows) next to a manifest of the source
+files' sizes and modification times, so later runs skip the results JSON entirely until a file changes.
+Only the standard library is needed; pandas is imported by the *_frame methods.
+"""
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from query_registry import QueryRegistry
+from score_store import ScoreStore
+
+CACHE_VERSION = 2
+
+CONDITIONS = [
+    'control',
+    'test_1_hardcoded',
+    'test_2_predefined',
+    'test_3_dynamic',
+    'test_4_dynamic_tone'
+]
+
+EVALUATION_METRICS = ['helpfulness', 'appropriateness', 'completeness', 'actionability', 'overall']
+
+ABSOLUTE_PATTERN = re.compile(r"absolute_evaluator_(\d+)_results\.json$")
+PAIRWISE_PATTERN = re.compile(r"pairwise_evaluator_(\d+)_results\.json$")
+
+
+def extract_condition_from_filename(filename: str) -> str:
+    """Extract condition name from response filename (as the analyzers always have)."""
+    for condition in CONDITIONS:
+        if condition in filename:
+            return condition
+    return 'unknown'
+
+
+def extract_agent_id_from_filename(filename: str) -> int:
+    """Extract agent ID from filename (as the analyzers always have)."""
+    parts = filename.split('_')
+    for part in parts:
+        if part.isdigit():
+            return int(part)
+    return 0
+
+
+class ResultsLoader:
+    _instances = {}
+
+    def __init__(self, base_path: str, cache_dir: Optional[str] = None):
+        """Load the results under base_path, from the on-disk cache when it is still current."""
+        self.base_path = Path(base_path)
+        self.results_path = self.base_path / "results"
+        self.cache_dir = Path(cache_dir) if cache_dir else self.base_path / "analysis" / "results_cache"
+        self.query_types = dict(QueryRegistry.load(str(self.base_path)).categories)
+        self.files_read = []
+        self._frames = {}
+
+        manifest = self.manifest()
+        if not self.load_cached(manifest):
+            self.score_store = self.parse_absolute_results()
+            self.pairwise_rows = self.parse_pairwise_results()
+            self.save_cached(manifest)
+
+    @classmethod
+    def load(cls, base_path: str) -> 'ResultsLoader':
+        """Return the shared loader for base_path, loading it on first use."""
+        key = str(Path(base_path).resolve())
+        if key not in cls._instances:
+            cls._instances[key] = cls(key)
+        return cls._instances[key]
+
+    def results_files(self, pattern: re.Pattern) -> List[Tuple[int, Path]]:
+        """(evaluator id, path) of every results file matching pattern, in evaluator order."""
+        found = []
+        for path in self.results_path.glob("*_evaluator_*_results.json"):
+            match = pattern.match(path.name)
+            if match:
+                found.append((int(match.group(1)), path))
+        return sorted(found)
+
+    def source_files(self) -> List[Path]:
+        """Every file the parsed results depend on."""
+        files = [path for _, path in self.results_files(ABSOLUTE_PATTERN)]
+        files += [path for _, path in self.results_files(PAIRWISE_PATTERN)]
+        return files + [self.base_path / "experiment_queries.json"]
+
+    def manifest(self) -> Dict[str, Any]:
+        """Cache version plus (size, mtime) of each existing source file."""
+        sources = {}
+        for path in self.source_files():
+            if path.exists():
+                stat = path.stat()
+                sources[path.name] = [stat.st_size, stat.st_mtime_ns]
+        return {'version': CACHE_VERSION, 'conditions': CONDITIONS, 'metrics': EVALUATION_METRICS,
+                'sources': sources}
+
+    def load_cached(self, manifest: Dict[str, Any]) -> bool:
+        """Restore parsed results from the cache if its manifest matches; False otherwise."""
+        try:
+            with open(self.cache_dir / "manifest.json", 'r') as f:
+                if json.load(f) != manifest:
+                    return False
+            self.score_store = ScoreStore.load(self.cache_dir / "absolute_scores.bin")
+            with open(self.cache_dir / "pairwise_rows.json", 'r') as f:
+                self.pairwise_rows = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def save_cached(self, manifest: Dict[str, Any]):
+        """Write the parsed results, then the manifest that marks them current."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.score_store.save(self.cache_dir / "absolute_scores.bin")
+            with open(self.cache_dir / "pairwise_rows.json", 'w') as f:
+                json.dump(self.pairwise_rows, f)
+            temp_path = self.cache_dir / "manifest.json.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(manifest, f)
+            os.replace(temp_path, self.cache_dir / "manifest.json")
+        except OSError as e:
+            print(f"WARNING: could not write results cache to {self.cache_dir}: {e}")
+
+    def read_json(self, path: Path) -> Dict[str, Any]:
+        """Read one results file, recording it in files_read."""
+        self.files_read.append(path.name)
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def parse_absolute_results(self) -> ScoreStore:
+        """Parse the absolute evaluation results into a columnar score store."""
+        store = ScoreStore(CONDITIONS, EVALUATION_METRICS)
+
+        for evaluator_id, file_path in self.results_files(ABSOLUTE_PATTERN):
+            data = self.read_json(file_path)
+
+            for dataset_name, dataset_results in data['dataset_results'].items():
+                # Map back to original condition using the de-randomized filename
+                original_file = dataset_results['original_file']
+                dataset = store.add_dataset(dataset_name, original_file,
+                                            extract_condition_from_filename(original_file),
+                                            extract_agent_id_from_filename(original_file))
+
+                for query_id, query_data in dataset_results['query_evaluations'].items():
+                    if query_data['evaluation'].get('unparsed'):  # Judge reply that could not be read
+                        continue
+                    query = store.add_query(query_id, self.query_types.get(query_id, 'unknown'))
+                    for metric, metric_data in query_data['evaluation'].items():
+                        store.add_score(evaluator_id, dataset, query, metric, metric_data['score'])
+
+        return store
+
+    def parse_pairwise_results(self) -> List[Dict[str, Any]]:
+        """Parse the pairwise evaluation results into one row per (comparison, query)."""
+        rows = []
+
+        for evaluator_id, file_path in self.results_files(PAIRWISE_PATTERN):
+            data = self.read_json(file_path)
+
+            for condition, condition_data in data['results'].items():
+                if condition == 'control':  # Skip control comparisons
+                    continue
+
+                for comparison_key, comparison_data in condition_data['comparisons'].items():
+                    test_agent = extract_agent_id_from_filename(comparison_data['test_original'])
+                    control_agent = extract_agent_id_from_filename(comparison_data['control_original'])
+
+                    for query_id, query_result in comparison_data['query_results'].items():
+                        if query_result['winner'] == 'unparsed':
+                            continue
+                        rows.append({
+                            'evaluator_id': evaluator_id,
+                            'test_condition': condition,
+                            'test_agent': test_agent,
+                            'control_agent': control_agent,
+                            'query_id': query_id,
+                            'query_category': self.query_types.get(query_id, 'unknown'),
+                            'winner': query_result['winner'],
+                            'test_wins': 1 if query_result['winner'] == 'test' else 0,
+                            'control_wins': 1 if query_result['winner'] == 'control' else 0,
+                            'comparison_key': comparison_key
+                        })
+
+        return rows
+
+    def absolute_records(self) -> List[Dict[str, Any]]:
+        """Absolute scores as a list of row dicts."""
+        return list(self.score_store.records())
+
+    def absolute_frame(self):
+        """Absolute scores as a DataFrame (built once, shared by every analyzer)."""
+        if 'absolute' not in self._frames:
+            self._frames['absolute'] = self.score_store.to_frame()
+        return self._frames['absolute']
+
+    def pairwise_frame(self):
+        """Pairwise rows as a DataFrame (built once, shared by every analyzer)."""
+        if 'pairwise' not in self._frames:
+            import pandas as pd
+            self._frames['pairwise'] = pd.DataFrame(self.pairwise_rows)
+        return self._frames['pairwise']
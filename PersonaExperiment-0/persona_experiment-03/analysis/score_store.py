@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Columnar Score Store for Persona Experiment 03
+Holds absolute evaluation scores as typed columns of integer codes (evaluator, dataset, query, metric)
+plus an int8 score column, instead of one dict of nine strings per score. Condition, agent id and
+original file are stored once per dataset, and query category once per query. The store serializes
+to a compact binary file and expands to the analysis DataFrame only when asked. Only the standard
+library is needed; pandas is imported by to_frame.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional
+
+MAGIC = b'PXSS'
+FORMAT_VERSION = 1
+
+# Row columns and their array typecodes
+ROW_COLUMNS = {
+    'evaluator': 'h',
+    'dataset': 'h',
+    'query': 'h',
+    'metric': 'b',
+    'score': 'b'
+}
+
+FRAME_COLUMNS = ['evaluator_id', 'condition', 'agent_id', 'query_id', 'query_category',
+                 'metric', 'score', 'dataset_file', 'original_file']
+
+
+class Vocabulary:
+    """Interned values with stable integer codes in first-seen order."""
+
+    def __init__(self, values: Optional[List[Any]] = None):
+        self.values = []
+        self.index = {}
+        for value in values or []:
+            self.code(value)
+
+    def code(self, value: Any) -> int:
+        """Code of value, adding it if new."""
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.index[value] = code
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ScoreStore:
+    def __init__(self, conditions: Optional[List[str]] = None, metrics: Optional[List[str]] = None):
+        """Create an empty store; conditions and metrics fix the first codes of their vocabularies."""
+        self.analysis_conditions = list(conditions or [])
+        self.analysis_metrics = list(metrics or [])
+        self.evaluators = Vocabulary()
+        self.conditions = Vocabulary(conditions)
+        self.metrics = Vocabulary(metrics)
+        self.queries = Vocabulary()
+        self.categories = Vocabulary()
+        self.datasets = Vocabulary()
+
+        # Per-dataset and per-query attributes
+        self.dataset_condition = array('b')
+        self.dataset_agent = array('h')
+        self.dataset_original = []
+        self.query_category = array('b')
+
+        self.columns = {name: array(typecode) for name, typecode in ROW_COLUMNS.items()}
+
+    def add_dataset(self, dataset_file: str, original_file: str, condition: str, agent_id: int) -> int:
+        """Register a response dataset once and return its code."""
+        code = self.datasets.code(dataset_file)
+        if code == len(self.dataset_original):
+            self.dataset_condition.append(self.conditions.code(condition))
+            self.dataset_agent.append(agent_id)
+            self.dataset_original.append(original_file)
+        return code
+
+    def add_query(self, query_id: str, category: str) -> int:
+        """Register a query with its category once and return its code."""
+        code = self.queries.code(query_id)
+        if code == len(self.query_category):
+            self.query_category.append(self.categories.code(category))
+        return code
+
+    def add_score(self, evaluator_id: int, dataset: int, query: int, metric: str, score: Any):
+        """Append one score row; dataset and query are codes from add_dataset/add_query."""
+        if score != int(score):
+            raise ValueError(f"Score {score!r} is not an integer")
+        self.columns['evaluator'].append(self.evaluators.code(evaluator_id))
+        self.columns['dataset'].append(dataset)
+        self.columns['query'].append(query)
+        self.columns['metric'].append(self.metrics.code(metric))
+        self.columns['score'].append(int(score))
+
+    def __len__(self) -> int:
+        return len(self.columns['score'])
+
+    def nbytes(self) -> int:
+        """Bytes held by the row columns."""
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Rows as dicts with the FRAME_COLUMNS keys, in insertion order."""
+        columns = self.columns
+        for row in range(len(self)):
+            dataset = columns['dataset'][row]
+            query = columns['query'][row]
+            yield {
+                'evaluator_id': self.evaluators.values[columns['evaluator'][row]],
+                'condition': self.conditions.values[self.dataset_condition[dataset]],
+                'agent_id': self.dataset_agent[dataset],
+                'query_id': self.queries.values[query],
+                'query_category': self.categories.values[self.query_category[query]],
+                'metric': self.metrics.values[columns['metric'][row]],
+                'score': columns['score'][row],
+                'dataset_file': self.datasets.values[dataset],
+                'original_file': self.dataset_original[dataset]
+            }
+
+    def to_frame(self):
+        """Expand to the DataFrame load_absolute_evaluation_data has always returned."""
+        import numpy as np
+        import pandas as pd
+
+        codes = {name: np.frombuffer(column, dtype=np.dtype(column.typecode)).astype(np.intp)
+                 for name, column in self.columns.items()}
+        dataset, query = codes['dataset'], codes['query']
+
+        def lookup(values: List[Any], index: np.ndarray) -> np.ndarray:
+            return np.array(values, dtype=object)[index] if len(values) else np.array([], dtype=object)
+
+        dataset_condition = np.frombuffer(self.dataset_condition, dtype=np.int8).astype(np.intp)
+        query_category = np.frombuffer(self.query_category, dtype=np.int8).astype(np.intp)
+        return pd.DataFrame({
+            'evaluator_id': np.array(self.evaluators.values, dtype=np.int64)[codes['evaluator']],
+            'condition': lookup(self.conditions.values, dataset_condition[dataset]),
+            'agent_id': np.array(self.dataset_agent, dtype=np.int64)[dataset],
+            'query_id': lookup(self.queries.values, query),
+            'query_category': lookup(self.categories.values, query_category[query]),
+            'metric': lookup(self.metrics.values, codes['metric']),
+            'score': codes['score'].astype(np.int64),
+            'dataset_file': lookup(self.datasets.values, dataset),
+            'original_file': lookup(self.dataset_original, dataset)
+        }, columns=FRAME_COLUMNS)
+
+    def save(self, path: str):
+        """Write the store as MAGIC, a length-prefixed JSON header, then the raw column bytes."""
+        arrays = {'dataset_condition': self.dataset_condition, 'dataset_agent': self.dataset_agent,
+                  'query_category': self.query_category, **self.columns}
+        header = json.dumps({
+            'version': FORMAT_VERSION,
+            'byteorder': sys.byteorder,
+            'vocabularies': {
+                'evaluators': self.evaluators.values, 'conditions': self.conditions.values,
+                'metrics': self.metrics.values, 'queries': self.queries.values,
+                'categories': self.categories.values, 'datasets': self.datasets.values
+            },
+            'analysis_conditions': self.analysis_conditions,
+            'analysis_metrics': self.analysis_metrics,
+            'dataset_original': self.dataset_original,
+            'arrays': [[name, values.typecode, len(values)] for name, values in arrays.items()]
+        }).encode('utf-8')
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            for values in arrays.values():
+                f.write(values.tobytes())
+        temp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str) -> 'ScoreStore':
+        """Read a store written by save."""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path} is not a score store file")
+        (header_length,) = struct.unpack('<I', data[4:8])
+        header = json.loads(data[8:8 + header_length].decode('utf-8'))
+        if header['version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported score store version {header['version']} in {path}")
+
+        store = cls(header['analysis_conditions'], header['analysis_metrics'])
+        vocabularies = header['vocabularies']
+        store.evaluators = Vocabulary(vocabularies['evaluators'])
+        store.conditions = Vocabulary(vocabularies['conditions'])
+        store.metrics = Vocabulary(vocabularies['metrics'])
+        store.queries = Vocabulary(vocabularies['queries'])
+        store.categories = Vocabulary(vocabularies['categories'])
+        store.datasets = Vocabulary(vocabularies['datasets'])
+        store.dataset_original = header['dataset_original']
+
+        offset = 8 + header_length
+        for name, typecode, length in header['arrays']:
+            values = array(typecode)
+            end = offset + values.itemsize * length
+            values.frombytes(data[offset:end])
+            if header['byteorder'] != sys.byteorder:
+                values.byteswap()
+            offset = end
+            if name in store.columns:
+                store.columns[name] = values
+            else:
+                setattr(store, name, values)
+        return store
@@ -12,10 +12,15 @@ Date: 2025-08-26
 import json
 import math
 import statistics
+import sys
 from collections import defaultdict, Counter
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from query_registry import QueryRegistry
+from results_loader import ResultsLoader
+
 class SimplifiedAnalyzer:
     """Statistical analyzer using only built-in Python libraries."""
     
@@ -39,23 +44,11 @@ class SimplifiedAnalyzer:
         ]
         
         # Query categories
-        self.query_categories = {
-            'query_1': 'factual',      # GitHub Copilot cost
-            'query_2': 'factual',      # OpenAI news
-            'query_3': 'technical',    # CAP theorem
-            'query_4': 'technical',    # OAuth implementation
-            'query_5': 'advisory',     # React vs Vue
-            'query_6': 'advisory',     # Salary negotiation
-            'query_7': 'guidance',     # ML learning
-            'query_8': 'technical',    # Debug performance
-            'query_9': 'advisory',     # Convince CEO
-            'query_10': 'factual',     # Blockchain
-            'query_11': 'advisory',    # Team productivity
-            'query_12': 'factual'      # Python
-        }
+        self.query_categories = dict(QueryRegistry.load(str(self.base_path)).categories)
         
         # Load data
         self.randomization_key = self.load_randomization_key()
+        self.results_loader = ResultsLoader.load(str(self.base_path))
         self.absolute_data = self.load_absolute_evaluation_data()
         self.pairwise_data = self.load_pairwise_evaluation_data()
         
@@ -66,82 +59,11 @@ class SimplifiedAnalyzer:
     
     def load_absolute_evaluation_data(self) -> List[Dict]:
         """Load and process absolute evaluation data."""
-        all_data = []
-        
-        # Load absolute evaluation results
-        for evaluator_id in [4, 5, 6, 7]:
-            file_path = self.results_path / f"absolute_evaluator_{evaluator_id}_results.json"
-            if file_path.exists():
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                
-                # Process each condition's results
-                for dataset_name, dataset_results in data['dataset_results'].items():
-                    # Map back to original condition using randomization key
-                    original_file = dataset_results['original_file']
-                    condition = self.extract_condition_from_filename(original_file)
-                    agent_id = self.extract_agent_id_from_filename(original_file)
-                    
-                    # Process each query evaluation
-                    for query_id, query_data in dataset_results['query_evaluations'].items():
-                        query_category = self.query_categories.get(query_id, 'unknown')
-                        
-                        for metric, metric_data in query_data['evaluation'].items():
-                            row = {
-                                'evaluator_id': evaluator_id,
-                                'condition': condition,
-                                'agent_id': agent_id,
-                                'query_id': query_id,
-                                'query_category': query_category,
-                                'metric': metric,
-                                'score': metric_data['score'],
-                                'dataset_file': dataset_name,
-                                'original_file': original_file
-                            }
-                            all_data.append(row)
-        
-        return all_data
+        return self.results_loader.absolute_records()
     
     def load_pairwise_evaluation_data(self) -> List[Dict]:
         """Load and process pairwise evaluation data."""
-        all_data = []
-        
-        # Load pairwise evaluation results (only evaluator 4 exists)
-        file_path = self.results_path / "pairwise_evaluator_4_results.json"
-        if file_path.exists():
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            # Process each test condition's comparisons
-            for condition, condition_data in data['results'].items():
-                if condition == 'control':  # Skip control comparisons
-                    continue
-                
-                for comparison_key, comparison_data in condition_data['comparisons'].items():
-                    # Process each query comparison
-                    for query_id, query_result in comparison_data['query_results'].items():
-                        query_category = self.query_categories.get(query_id, 'unknown')
-                        
-                        # Extract agent information
-                        test_agent = self.extract_agent_id_from_filename(comparison_data['test_original'])
-                        control_agent = self.extract_agent_id_from_filename(comparison_data['control_original'])
-                        
-                        # Record overall winner
-                        row = {
-                            'evaluator_id': 4,
-                            'test_condition': condition,
-                            'test_agent': test_agent,
-                            'control_agent': control_agent,
-                            'query_id': query_id,
-                            'query_category': query_category,
-                            'winner': query_result['winner'],
-                            'test_wins': 1 if query_result['winner'] == 'test' else 0,
-                            'control_wins': 1 if query_result['winner'] == 'control' else 0,
-                            'comparison_key': comparison_key
-                        }
-                        all_data.append(row)
-        
-        return all_data
+        return self.results_loader.pairwise_rows
     
     def extract_condition_from_filename(self, filename: str) -> str:
         """Extract condition name from response filename."""
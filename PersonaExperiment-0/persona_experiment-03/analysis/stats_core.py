@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Vectorized Statistics Core for Persona Experiment 03
+Pivots the absolute scores once into a dense array indexed [evaluator, condition, agent, query, metric]
+and reduces it to per-(condition, metric) score histograms. Every summary statistic and test used by
+ComprehensiveStatisticalAnalyzer (Shapiro-Wilk, Levene, Kruskal-Wallis, Welch t, Mann-Whitney U,
+effect sizes, power) is then computed with axis-wise operations over those histograms instead of
+re-filtering the DataFrame per metric and condition. Results match the scipy/statsmodels calls they
+replace and are returned in the same dictionaries.
+"""
+
+from typing import Dict, List, Tuple, Any, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+
+
+def interpret_cohens_d(d: float) -> str:
+    """Interpret Cohen's d effect size."""
+    abs_d = abs(d)
+    if abs_d < 0.2:
+        return "negligible"
+    elif abs_d < 0.5:
+        return "small"
+    elif abs_d < 0.8:
+        return "medium"
+    else:
+        return "large"
+
+
+def interpret_cliff_delta(delta: float) -> str:
+    """Interpret Cliff's delta effect size."""
+    abs_delta = abs(delta)
+    if abs_delta < 0.147:
+        return "negligible"
+    elif abs_delta < 0.33:
+        return "small"
+    elif abs_delta < 0.474:
+        return "medium"
+    else:
+        return "large"
+
+
+class ScoreCube:
+    """Dense score array [evaluator, condition, agent, query, metric] with NaN for unobserved cells."""
+
+    def __init__(self, scores: np.ndarray, evaluators: List[Any], conditions: List[str],
+                 agents: List[List[str]], query_ids: List[str], metrics: List[str]):
+        """agents[c] lists the response datasets of condition c in agent-axis order."""
+        self.scores = scores
+        self.evaluators = evaluators
+        self.conditions = conditions
+        self.agents = agents
+        self.query_ids = query_ids
+        self.metrics = metrics
+
+    @classmethod
+    def from_codes(cls, evaluator_codes: np.ndarray, condition_codes: np.ndarray, dataset_codes: np.ndarray,
+                   query_codes: np.ndarray, metric_codes: np.ndarray, scores: np.ndarray,
+                   evaluators: List[Any], conditions: List[str], datasets: List[str],
+                   query_ids: List[str], metrics: List[str]) -> 'ScoreCube':
+        """
+        Build the cube from integer-coded score rows. Rows whose condition or metric code falls
+        outside conditions/metrics are dropped. The agent axis indexes each condition's response
+        datasets (one per generating agent), since agent ids parsed from filenames are not unique
+        within a condition. A cell scored twice raises ValueError.
+        """
+        keep = ((condition_codes >= 0) & (condition_codes < len(conditions))
+                & (metric_codes >= 0) & (metric_codes < len(metrics)))
+        evaluator_codes, condition_codes, dataset_codes, query_codes, metric_codes = (
+            np.asarray(codes)[keep].astype(np.int64)
+            for codes in (evaluator_codes, condition_codes, dataset_codes, query_codes, metric_codes))
+        scores = np.asarray(scores, dtype=float)[keep]
+
+        # Number each condition's datasets 0..k-1 along the agent axis
+        pairs, pair_codes = np.unique(np.stack([condition_codes, dataset_codes], axis=1),
+                                      axis=0, return_inverse=True)
+        pair_codes = pair_codes.reshape(-1)
+        slots = np.arange(len(pairs)) - np.searchsorted(pairs[:, 0], pairs[:, 0])
+        agent_codes = slots[pair_codes]
+        agents = [[str(datasets[dataset]) for condition, dataset in pairs if condition == c]
+                  for c in range(len(conditions))]
+
+        shape = (len(evaluators), len(conditions), int(slots.max()) + 1 if len(slots) else 0,
+                 len(query_ids), len(metrics))
+        index = (evaluator_codes, condition_codes, agent_codes, query_codes, metric_codes)
+        flat = np.ravel_multi_index(index, shape) if len(scores) else np.zeros(0, dtype=np.int64)
+        if len(np.unique(flat)) != len(flat):
+            raise ValueError("Duplicate scores for the same (evaluator, condition, agent, query, metric)")
+
+        cube = np.full(shape, np.nan)
+        cube[index] = scores
+        return cls(cube, list(evaluators), list(conditions), agents, list(query_ids), list(metrics))
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, conditions: List[str], metrics: List[str]) -> 'ScoreCube':
+        """Build the cube from an absolute-evaluation DataFrame in a single pass."""
+        evaluator_codes, evaluators = pd.factorize(data['evaluator_id'], sort=True)
+        query_codes, query_ids = pd.factorize(data['query_id'], sort=True)
+        dataset_codes, datasets = pd.factorize(data['dataset_file'], sort=True)
+        return cls.from_codes(evaluator_codes, pd.Categorical(data['condition'], categories=conditions).codes,
+                              dataset_codes, query_codes, pd.Categorical(data['metric'], categories=metrics).codes,
+                              data['score'].to_numpy(dtype=float), list(evaluators), conditions,
+                              list(datasets), list(query_ids), metrics)
+
+    @classmethod
+    def from_store(cls, store: Any) -> 'ScoreCube':
+        """
+        Build the cube straight from a score_store.ScoreStore's code columns, without expanding it to
+        a DataFrame. The store's first condition and metric codes are the analysis conditions and
+        metrics, so anything registered after them ('unknown', unexpected metrics) is dropped.
+        """
+        columns = {name: np.frombuffer(column, dtype=np.dtype(column.typecode))
+                   for name, column in store.columns.items()}
+        dataset_condition = np.frombuffer(store.dataset_condition, dtype=np.int8)
+        return cls.from_codes(columns['evaluator'], dataset_condition[columns['dataset']], columns['dataset'],
+                              columns['query'], columns['metric'], columns['score'],
+                              store.evaluators.values, store.analysis_conditions, store.datasets.values,
+                              store.queries.values, store.analysis_metrics)
+
+    def levels(self) -> np.ndarray:
+        """Distinct observed score values in ascending order."""
+        return np.unique(self.scores[~np.isnan(self.scores)])
+
+    def histogram(self, levels: np.ndarray) -> np.ndarray:
+        """Counts per [condition, metric, level], pooled over evaluators, agents and queries."""
+        return (self.scores[..., None] == levels).sum(axis=(0, 2, 3))
+
+
+def moments(hist: np.ndarray, levels: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Count, mean and sample variance (ddof=1) of each histogram along its last axis."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n = hist.sum(axis=-1)
+        mean = (hist * levels).sum(axis=-1) / n
+        var = (hist * (levels - mean[..., None]) ** 2).sum(axis=-1) / (n - 1)
+    return n, mean, var
+
+
+def midranks(hist: np.ndarray) -> np.ndarray:
+    """Average rank of each level in the pooled sample described by hist."""
+    below = np.cumsum(hist, axis=-1) - hist
+    return below + (hist + 1) / 2
+
+
+def tie_term(hist: np.ndarray) -> np.ndarray:
+    """Sum of t^3 - t over tied groups."""
+    return (hist ** 3 - hist).sum(axis=-1)
+
+
+def histogram_median(hist: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """Median of each histogram (mean of the two middle values for even counts, as np.median)."""
+    n = hist.sum(axis=-1)
+    cumulative = np.cumsum(hist, axis=-1)
+    lower = np.minimum((cumulative <= ((n - 1) // 2)[..., None]).sum(axis=-1), len(levels) - 1)
+    upper = np.minimum((cumulative <= (n // 2)[..., None]).sum(axis=-1), len(levels) - 1)
+    return (levels[lower] + levels[upper]) / 2
+
+
+def expand(hist: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """Sorted sample with the given level counts."""
+    return np.repeat(levels, hist.astype(np.int64))
+
+
+def welch_t(test: np.ndarray, control: np.ndarray, levels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Welch's t statistic and two-sided p-value, as scipy.stats.ttest_ind(equal_var=False)."""
+    n1, m1, v1 = moments(test, levels)
+    n2, m2, v2 = moments(control, levels)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        se2 = v1 / n1 + v2 / n2
+        t = (m1 - m2) / np.sqrt(se2)
+        df = se2 ** 2 / ((v1 / n1) ** 2 / (n1 - 1) + (v2 / n2) ** 2 / (n2 - 1))
+    return t, 2 * stats.t.sf(np.abs(t), df)
+
+
+def mann_whitney(test: np.ndarray, control: np.ndarray, levels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    U statistic of the test group and two-sided p-value, as scipy.stats.mannwhitneyu with
+    method='auto': tie-corrected normal approximation with continuity correction, and scipy's exact
+    distribution for the small tie-free samples where scipy would use it.
+    """
+    n1, n2 = test.sum(axis=-1), control.sum(axis=-1)
+    pooled = test + control
+    u1 = (test * midranks(pooled)).sum(axis=-1) - n1 * (n1 + 1) / 2
+    u = np.maximum(u1, n1 * n2 - u1)
+    n = n1 + n2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term(pooled) / (n * (n - 1))))
+        p = np.clip(2 * special.ndtr(-(u - n1 * n2 / 2 - 0.5) / s), 0, 1)
+
+    exact = ((n1 <= 8) | (n2 <= 8)) & (pooled.max(axis=-1) <= 1) & (n1 > 0) & (n2 > 0)
+    for position in zip(*np.nonzero(exact)):
+        p[position] = stats.mannwhitneyu(expand(test[position], levels), expand(control[position], levels),
+                                         alternative='two-sided').pvalue
+    return u1, p
+
+
+def kruskal_wallis(hist: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Kruskal-Wallis H and p-value over the groups on axis 0 (empty groups ignored), per remaining cell."""
+    n_i = hist.sum(axis=-1)
+    pooled = hist.sum(axis=0)
+    n = pooled.sum(axis=-1)
+    groups = (n_i > 0).sum(axis=0)
+    rank_sums = (hist * midranks(pooled)).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h = 12 / (n * (n + 1)) * np.where(n_i > 0, rank_sums ** 2 / n_i, 0).sum(axis=0) - 3 * (n + 1)
+        h = h / (1 - tie_term(pooled) / (n ** 3 - n))
+    return h, stats.chi2.sf(h, groups - 1)
+
+
+def levene_median(hist: np.ndarray, levels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Brown-Forsythe (median-centred Levene) W and p-value over the groups on axis 0, per remaining cell."""
+    n_i = hist.sum(axis=-1)
+    present = n_i > 0
+    deviations = np.abs(levels - histogram_median(hist, levels)[..., None])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        group_means = np.where(present, (hist * deviations).sum(axis=-1) / n_i, 0)
+        n = n_i.sum(axis=0)
+        k = present.sum(axis=0)
+        grand_mean = (n_i * group_means).sum(axis=0) / n
+        between = (n_i * (group_means - grand_mean) ** 2).sum(axis=0)
+        within = (hist * (deviations - group_means[..., None]) ** 2).sum(axis=(0, -1))
+        w = (n - k) / (k - 1) * between / within
+    return w, stats.f.sf(w, k - 1, n - k)
+
+
+def cliff_delta(test: np.ndarray, control: np.ndarray) -> np.ndarray:
+    """Cliff's delta of test over control from their histograms."""
+    cumulative = np.cumsum(control, axis=-1)
+    below = cumulative - control
+    above = control.sum(axis=-1)[..., None] - cumulative
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (test * (below - above)).sum(axis=-1) / (test.sum(axis=-1) * control.sum(axis=-1))
+
+
+def t_test_power(effect_size: np.ndarray, nobs: np.ndarray, alpha: float = 0.05) -> np.ndarray:
+    """Two-sided one-sample t-test power, as statsmodels.stats.power.ttest_power."""
+    df = nobs - 1
+    nc = effect_size * np.sqrt(nobs)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (stats.nct.sf(stats.t.isf(alpha / 2, df), df, nc)
+                + stats.nct.cdf(stats.t.ppf(alpha / 2, df), df, nc))
+
+
+def solve_power_nobs(effect_size: np.ndarray, power: float, alpha: float = 0.05,
+                     max_nobs: float = 1e7, iterations: int = 60) -> np.ndarray:
+    """
+    Smallest nobs reaching the given power for every effect size at once, as statsmodels
+    tt_solve_power: the upper bound doubles from 50 until it reaches the power, then bisection on
+    [2, upper]. NaN where the power is out of reach below max_nobs.
+    """
+    effect_size = np.abs(np.asarray(effect_size, dtype=float))
+    low = np.full(effect_size.shape, 2.0)
+    high = np.full(effect_size.shape, 50.0)
+    reachable = t_test_power(effect_size, high, alpha) >= power
+    while not reachable.all() and high.max() < max_nobs:
+        low = np.where(reachable, low, high)
+        high = np.where(reachable, high, high * 2)
+        reachable = t_test_power(effect_size, high, alpha) >= power
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        enough = t_test_power(effect_size, middle, alpha) >= power
+        high = np.where(enough, middle, high)
+        low = np.where(enough, low, middle)
+    return np.where(reachable, high, np.nan)
+
+
+class StatisticsCore:
+    """Assumption tests, condition comparisons and power analysis over a ScoreCube."""
+
+    def __init__(self, cube: ScoreCube, reference: str = 'control', alpha: float = 0.05,
+                 bootstrap: Optional[Any] = None):
+        """With a bootstrap.BootstrapEngine, contrast intervals are BCa instead of t-based."""
+        self.cube = cube
+        self.reference = reference
+        self.alpha = alpha
+        self.bootstrap = bootstrap
+        self.levels = cube.levels()
+        self.hist = cube.histogram(self.levels)
+        self.n, self.mean, self.var = moments(self.hist, self.levels)
+        self._bootstrap_intervals = None
+
+    def bootstrap_intervals(self) -> Dict[str, Any]:
+        """BCa intervals of every contrast (computed once), or {} without a bootstrap engine."""
+        if self.bootstrap is None:
+            return {}
+        if self._bootstrap_intervals is None:
+            self._bootstrap_intervals = self.bootstrap.contrast_intervals(
+                self.hist, self.levels, self.cube.conditions, self.cube.metrics, self.reference)
+        return self._bootstrap_intervals
+
+    def comparison_indices(self) -> List[int]:
+        """Condition indices compared with the reference (every condition after the first, as the analyzer does)."""
+        return list(range(1, len(self.cube.conditions)))
+
+    def reference_index(self) -> Optional[int]:
+        """Index of the reference condition, or None when it is absent."""
+        if self.reference not in self.cube.conditions:
+            return None
+        return self.cube.conditions.index(self.reference)
+
+    def assumption_tests(self) -> Dict[str, Any]:
+        """Shapiro-Wilk per condition and Levene across conditions, in test_assumptions' format."""
+        levene_w, levene_p = levene_median(self.hist, self.levels)
+        results = {}
+        for m, metric in enumerate(self.cube.metrics):
+            normality_tests = {}
+            for c, condition in enumerate(self.cube.conditions):
+                if self.n[c, m] >= 3:  # Need at least 3 samples for Shapiro-Wilk
+                    stat, p_value = stats.shapiro(expand(self.hist[c, m], self.levels))
+                    normality_tests[condition] = {
+                        'statistic': round(float(stat), 4),
+                        'p_value': round(float(p_value), 4),
+                        'normal': bool(p_value > 0.05)
+                    }
+            results[metric] = {'normality_tests': normality_tests}
+
+            present = self.n[:, m] > 0
+            if present.sum() >= 2 and (self.n[present, m] >= 2).all():
+                results[metric]['levene_test'] = {
+                    'statistic': round(float(levene_w[m]), 4),
+                    'p_value': round(float(levene_p[m]), 4),
+                    'equal_variances': bool(levene_p[m] > 0.05)
+                }
+        return results
+
+    def comparison_tests(self) -> Dict[str, Any]:
+        """Kruskal-Wallis and every condition-vs-reference comparison, per metric."""
+        kw_stat, kw_p = kruskal_wallis(self.hist)
+        reference = self.reference_index()
+        compared = self.comparison_indices()
+        if reference is not None:
+            test = self.hist[compared]
+            control = np.broadcast_to(self.hist[reference], test.shape)
+            t_stat, t_p = welch_t(test, control, self.levels)
+            u_stat, u_p = mann_whitney(test, control, self.levels)
+            cohens_d, glass_delta, ci_lower, ci_upper = self.mean_difference_effects(compared, reference)
+            cliff = cliff_delta(test, control)
+        intervals = self.bootstrap_intervals()
+
+        results = {}
+        for m, metric in enumerate(self.cube.metrics):
+            results[metric] = {}
+            if (self.n[:, m] > 0).sum() >= 2:
+                results[metric]['kruskal_wallis'] = {
+                    'statistic': round(float(kw_stat[m]), 4),
+                    'p_value': round(float(kw_p[m]), 4),
+                    'significant': bool(kw_p[m] < 0.05)
+                }
+
+            pairwise_results = {}
+            for row, c in enumerate(compared):
+                if reference is None or self.n[c, m] == 0 or self.n[reference, m] == 0:
+                    continue
+                contrast = f"{self.cube.conditions[c]}_vs_{self.reference}"
+                mean_ci = (ci_lower[row, m], ci_upper[row, m])
+                effect_cis = {}
+                if contrast in intervals.get(metric, {}):
+                    bca = intervals[metric][contrast]
+                    mean_ci = (bca['mean_difference']['ci_lower'], bca['mean_difference']['ci_upper'])
+                    effect_cis = {f'{name}_ci_95_{bound}': round(bca[name][f'ci_{bound}'], 4)
+                                  for name in ('cohens_d', 'cliff_delta') for bound in ('lower', 'upper')}
+                pairwise_results[contrast] = {
+                    'parametric_test': {
+                        't_statistic': round(float(t_stat[row, m]), 4),
+                        'p_value': round(float(t_p[row, m]), 4),
+                        'significant': bool(t_p[row, m] < 0.05)
+                    },
+                    'non_parametric_test': {
+                        'mannwhitney_u': round(float(u_stat[row, m]), 4),
+                        'p_value': round(float(u_p[row, m]), 4),
+                        'significant': bool(u_p[row, m] < 0.05)
+                    },
+                    'effect_sizes': {
+                        'cohens_d': round(float(cohens_d[row, m]), 4),
+                        'cohens_d_interpretation': interpret_cohens_d(cohens_d[row, m]),
+                        'glass_delta': round(float(glass_delta[row, m]), 4),
+                        'cliff_delta': round(float(cliff[row, m]), 4),
+                        'cliff_delta_interpretation': interpret_cliff_delta(cliff[row, m]),
+                        **effect_cis
+                    },
+                    'descriptive_stats': {
+                        'test_mean': round(float(self.mean[c, m]), 4),
+                        'test_std': round(float(np.sqrt(self.var[c, m])), 4),
+                        'test_n': int(self.n[c, m]),
+                        'control_mean': round(float(self.mean[reference, m]), 4),
+                        'control_std': round(float(np.sqrt(self.var[reference, m])), 4),
+                        'control_n': int(self.n[reference, m]),
+                        'mean_difference': round(float(self.mean[c, m] - self.mean[reference, m]), 4),
+                        'ci_95_lower': round(float(mean_ci[0]), 4),
+                        'ci_95_upper': round(float(mean_ci[1]), 4),
+                        'ci_method': 'bca_bootstrap' if effect_cis else 't_interval'
+                    }
+                }
+            results[metric]['pairwise_comparisons'] = pairwise_results
+        return results
+
+    def mean_difference_effects(self, compared: List[int], reference: int,
+                                confidence: float = 0.95) -> Tuple[np.ndarray, ...]:
+        """Cohen's d, Glass's delta and the t-based interval of the mean difference, [compared, metric]."""
+        n1, n2 = self.n[compared], self.n[reference]
+        v1, v2 = self.var[compared], self.var[reference]
+        difference = self.mean[compared] - self.mean[reference]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pooled_std = np.sqrt(((n1 - 1) * v1 + (n2 - 1) * v2) / (n1 + n2 - 2))
+            cohens_d = difference / pooled_std
+            glass_delta = difference / np.sqrt(v2)
+            margin = stats.t.ppf((1 + confidence) / 2, n1 + n2 - 2) * np.sqrt(v1 / n1 + v2 / n2)
+        return cohens_d, glass_delta, difference - margin, difference + margin
+
+    def power_analysis(self) -> Dict[str, Any]:
+        """Current power and sample sizes for 80%/90% power, in calculate_statistical_power's format."""
+        reference = self.reference_index()
+        if reference is None:
+            return {metric: {} for metric in self.cube.metrics}
+        compared = self.comparison_indices()
+        effect_size = self.mean_difference_effects(compared, reference)[0]
+        current_power = t_test_power(effect_size, self.n[compared], self.alpha)
+        n_needed_80 = solve_power_nobs(effect_size, 0.8, self.alpha)
+        n_needed_90 = solve_power_nobs(effect_size, 0.9, self.alpha)
+
+        results = {}
+        for m, metric in enumerate(self.cube.metrics):
+            results[metric] = {}
+            for row, c in enumerate(compared):
+                if self.n[c, m] == 0 or self.n[reference, m] == 0:
+                    continue
+                results[metric][f"{self.cube.conditions[c]}_vs_{self.reference}"] = {
+                    'current_power': round(float(current_power[row, m]), 4),
+                    'effect_size': round(float(effect_size[row, m]), 4),
+                    'current_n_test': int(self.n[c, m]),
+                    'current_n_control': int(self.n[reference, m]),
+                    'n_needed_80_power': (round(float(n_needed_80[row, m]), 0)
+                                          if not np.isnan(n_needed_80[row, m]) else 'undefined'),
+                    'n_needed_90_power': (round(float(n_needed_90[row, m]), 0)
+                                          if not np.isnan(n_needed_90[row, m]) else 'undefined'),
+                    'adequately_powered_80': bool(current_power[row, m] >= 0.8),
+                    'adequately_powered_90': bool(current_power[row, m] >= 0.9)
+                }
+        return results
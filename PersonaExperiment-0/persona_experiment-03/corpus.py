@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+In-Memory Blinded Corpus for Persona Experiment 03
+Loads every blinded dataset once, strips [Role: X] indicators once, and indexes responses by
+(dataset, query_id) together with the de-randomized condition and agent of each dataset.
+Evaluators and analyzers share one instance instead of re-reading files per comparison.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional
+
+CONDITIONS = [
+    'control',
+    'test_1_hardcoded',
+    'test_2_predefined',
+    'test_3_dynamic',
+    'test_4_dynamic_tone'
+]
+
+ROLE_INDICATOR_PATTERN = re.compile(r'^\[Role:[^\]]*\]\s*', flags=re.IGNORECASE)
+
+
+def strip_role_indicators(text: str) -> str:
+    """Remove [Role: X] indicators from response text."""
+    return ROLE_INDICATOR_PATTERN.sub('', text).strip()
+
+
+def extract_condition_from_filename(filename: str) -> str:
+    """Extract condition name from response filename."""
+    for condition in CONDITIONS:
+        if filename.startswith(condition + '_responses'):
+            return condition
+    return 'unknown'
+
+
+def extract_agent_id_from_filename(filename: str) -> int:
+    """Extract agent ID from filename."""
+    for part in filename.replace('.json', '').split('_'):
+        if part.isdigit():
+            return int(part)
+    return 0
+
+
+class BlindedCorpus:
+    _instances = {}
+
+    def __init__(self, base_path: str):
+        """Load the randomization key and every blinded dataset under base_path."""
+        self.base_path = Path(base_path)
+        self.blinded_data_dir = self.base_path / "blinded_evaluation"
+
+        with open(self.base_path / "randomization_key.json", 'r') as f:
+            self.randomization_key = json.load(f)
+        self.blinded_to_original = {v: k for k, v in self.randomization_key.items()}
+
+        self.dataset_condition = {}
+        self.dataset_agent = {}
+        self.files_by_condition = {condition: [] for condition in CONDITIONS}
+        for original, blinded in self.randomization_key.items():
+            condition = extract_condition_from_filename(original)
+            self.dataset_condition[blinded] = condition
+            self.dataset_agent[blinded] = extract_agent_id_from_filename(original)
+            self.files_by_condition.setdefault(condition, []).append(blinded)
+
+        self.responses = {}
+        self.query_ids = {}
+        for blinded in self.randomization_key.values():
+            with open(self.blinded_data_dir / blinded, 'r') as f:
+                data = json.load(f)
+            self.query_ids[blinded] = list(data.keys())
+            for query_id, text in data.items():
+                self.responses[(blinded, query_id)] = strip_role_indicators(text)
+
+    @classmethod
+    def load(cls, base_path: str) -> 'BlindedCorpus':
+        """Return the shared corpus for base_path, loading it on first use."""
+        key = str(Path(base_path).resolve())
+        if key not in cls._instances:
+            cls._instances[key] = cls(base_path)
+        return cls._instances[key]
+
+    def response(self, dataset: str, query_id: str) -> str:
+        """Role-stripped response text for one (dataset, query_id)."""
+        return self.responses[(dataset, query_id)]
+
+    def dataset(self, dataset: str) -> Dict[str, str]:
+        """All role-stripped responses of one dataset, in file order."""
+        return {query_id: self.responses[(dataset, query_id)] for query_id in self.query_ids[dataset]}
+
+    def datasets_for(self, condition: str) -> List[str]:
+        """Blinded dataset filenames belonging to a condition."""
+        return self.files_by_condition.get(condition, [])
+
+    def original_file(self, dataset: str) -> str:
+        """De-randomized response filename of a blinded dataset."""
+        return self.blinded_to_original[dataset]
+
+    def locate(self, dataset: str) -> Tuple[str, int]:
+        """(condition, agent_id) of a blinded dataset."""
+        return self.dataset_condition[dataset], self.dataset_agent[dataset]
+
+    def find_dataset(self, condition: str, agent_id: int) -> Optional[str]:
+        """Blinded filename for a (condition, agent) pair, if present."""
+        for dataset in self.datasets_for(condition):
+            if self.dataset_agent[dataset] == agent_id:
+                return dataset
+        return None
@@ -0,0 +1,756 @@
+#!/usr/bin/env python3
+"""
+Shared Evaluation Engine for Persona Experiment 03
+Runs any number of pairwise and absolute evaluators in one process from plain config dicts
+(evaluator id, mode, condition filter, concurrency, backend). Blinded datasets come from the
+shared BlindedCorpus, so they are loaded and role-stripped once for every evaluator; results
+are written in the layout of the committed pairwise_evaluator_4 and absolute_evaluator_4..7 results.
+The per-evaluator scripts are thin wrappers that pass one config to run_single_evaluator.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, List, Tuple, Any, Optional, Callable
+
+from adaptive_stopping import AdaptiveStopper, judge_until_decided
+from corpus import BlindedCorpus, CONDITIONS
+from generate_responses import HTTPModelClient, estimate_tokens
+from judge_executor import JudgeExecutor, plan_pairwise_comparisons, winner_from_overall
+from judge_parser import MalformedJudgmentError, TextJudge, is_unparsed, unparsed_judgment
+from judgment_cache import JudgmentCache
+from query_registry import QueryRegistry
+from sequential_testing import SEQUENTIAL_METHODS, build_sequential_stopper
+from tournament import TournamentScheduler, fit_bradley_terry, is_settled, summarize_fit
+
+CRITERIA = ['helpfulness', 'appropriateness', 'completeness', 'actionability', 'overall']
+
+# Prompts from evaluator_prompts.md
+PAIRWISE_PROMPT = """You are comparing two responses to the same question. You don't know what methods generated these responses.
+
+Rate which response is better on these criteria:
+
+1. **Helpfulness**: Which response better addresses the user's actual need?
+2. **Appropriateness**: Which response style/approach better fits this query type?
+3. **Completeness**: Which provides more sufficient information/guidance?
+4. **Actionability**: Which makes it easier for the user to act on the response?
+5. **Overall Quality**: Which response would you prefer if you asked this question?
+
+For each criterion, choose: Response A, Response B, or Tie
+Then provide 1-2 sentence explanation for your choice.
+
+Question: {query}
+Response A: {response_a}
+Response B: {response_b}
+
+Format:
+Helpfulness: [A/B/Tie] - [explanation]
+Appropriateness: [A/B/Tie] - [explanation]
+Completeness: [A/B/Tie] - [explanation]
+Actionability: [A/B/Tie] - [explanation]
+Overall: [A/B/Tie] - [explanation]
+
+Overall Winner: [A/B/Tie]"""
+
+ABSOLUTE_PROMPT = """You are rating the quality of a response to a question. Rate this response independently without comparison to other responses.
+
+Rate on these criteria (1-5 scale, where 5 is excellent):
+
+1. **Helpfulness** (1-5): How well does it address the user's actual need?
+2. **Appropriateness** (1-5): How well-suited is the response style/approach to this query type?
+3. **Completeness** (1-5): Does it provide sufficient information/guidance?
+4. **Actionability** (1-5): How easy is it for the user to act on this response?
+5. **Overall Quality** (1-5): How would you rate this response overall?
+
+For each metric, provide numerical score and brief explanation.
+
+Question: {query}
+Response: {response}
+
+Format:
+Helpfulness: [1-5] - [explanation]
+Appropriateness: [1-5] - [explanation]
+Completeness: [1-5] - [explanation]
+Actionability: [1-5] - [explanation]
+Overall: [1-5] - [explanation]"""
+
+# Batched variants: several questions per judge call, answered in one "### Item N" section each
+BATCH_PAIRWISE_PROMPT = """You are comparing pairs of responses to several questions. You don't know what methods generated these responses. Judge every item independently of the others.
+
+For each item, rate which response is better on these criteria:
+
+1. **Helpfulness**: Which response better addresses the user's actual need?
+2. **Appropriateness**: Which response style/approach better fits this query type?
+3. **Completeness**: Which provides more sufficient information/guidance?
+4. **Actionability**: Which makes it easier for the user to act on the response?
+5. **Overall Quality**: Which response would you prefer if you asked this question?
+
+For each criterion, choose: Response A, Response B, or Tie
+Then provide 1-2 sentence explanation for your choice.
+
+{items}
+
+Answer every item in its own section, in this format:
+### Item [number]
+Helpfulness: [A/B/Tie] - [explanation]
+Appropriateness: [A/B/Tie] - [explanation]
+Completeness: [A/B/Tie] - [explanation]
+Actionability: [A/B/Tie] - [explanation]
+Overall: [A/B/Tie] - [explanation]
+
+Overall Winner: [A/B/Tie]"""
+
+BATCH_PAIRWISE_ITEM = """### Item {number}
+Question: {query}
+Response A: {response_a}
+Response B: {response_b}"""
+
+BATCH_ABSOLUTE_PROMPT = """You are rating the quality of responses to several questions. Rate every response independently without comparison to other responses.
+
+For each item, rate on these criteria (1-5 scale, where 5 is excellent):
+
+1. **Helpfulness** (1-5): How well does it address the user's actual need?
+2. **Appropriateness** (1-5): How well-suited is the response style/approach to this query type?
+3. **Completeness** (1-5): Does it provide sufficient information/guidance?
+4. **Actionability** (1-5): How easy is it for the user to act on this response?
+5. **Overall Quality** (1-5): How would you rate this response overall?
+
+For each metric, provide numerical score and brief explanation.
+
+{items}
+
+Answer every item in its own section, in this format:
+### Item [number]
+Helpfulness: [1-5] - [explanation]
+Appropriateness: [1-5] - [explanation]
+Completeness: [1-5] - [explanation]
+Actionability: [1-5] - [explanation]
+Overall: [1-5] - [explanation]"""
+
+BATCH_ABSOLUTE_ITEM = """### Item {number}
+Question: {query}
+Response: {response}"""
+
+# Batched prompt plus the expected reply must fit the judge context (~4 chars per token)
+DEFAULT_CONTEXT_BUDGET = 32000
+REPLY_TOKENS_PER_ITEM = 200
+
+# Evaluators as run in experiment 03 (pairwise 4, absolute 4-7)
+EXPERIMENT_03_EVALUATORS = [
+    {'evaluator_id': 4, 'mode': 'pairwise', 'conditions': CONDITIONS[1:]},
+    {'evaluator_id': 4, 'mode': 'absolute', 'conditions': ['control']},
+    {'evaluator_id': 5, 'mode': 'absolute', 'conditions': ['test_1_hardcoded']},
+    {'evaluator_id': 6, 'mode': 'absolute', 'conditions': ['test_2_predefined']},
+    {'evaluator_id': 7, 'mode': 'absolute', 'conditions': ['test_3_dynamic', 'test_4_dynamic_tone']}
+]
+
+
+def evaluator_seed(base_seed: int, config: Dict[str, Any]) -> int:
+    """
+    Seed of one evaluator, derived from the run seed and the evaluator's mode and id, so that panel
+    members judge and plan A/B positions independently (as evaluators 1-3 used seeds 42/123/456).
+    """
+    digest = hashlib.sha256(f"{base_seed}:{config['mode']}:{config['evaluator_id']}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'big')
+
+
+def build_full_panel(concurrency: int = 8, backend: str = 'simulated', seed: int = 42) -> List[Dict[str, Any]]:
+    """The 14-evaluator panel from claude_code_implementation.md: pairwise 1-7, absolute 8-14."""
+    panel = []
+    for evaluator_id in range(1, 8):
+        panel.append({'evaluator_id': evaluator_id, 'mode': 'pairwise', 'conditions': CONDITIONS[1:],
+                      'concurrency': concurrency, 'backend': backend})
+    for evaluator_id in range(8, 15):
+        panel.append({'evaluator_id': evaluator_id, 'mode': 'absolute', 'conditions': CONDITIONS,
+                      'concurrency': concurrency, 'backend': backend})
+    for config in panel:
+        config['seed'] = evaluator_seed(seed, config)
+    return panel
+
+
+class SimulatedJudge:
+    """
+    Placeholder judge reproducing the weighted random choices of the experiment 03 evaluator scripts.
+    In a real run this is replaced by a backend that sends the prompt to an LLM judge.
+    """
+
+    backend = 'simulated'
+
+    PAIRWISE_WEIGHTS = [0.4, 0.35, 0.25]  # A, B, Tie
+    ABSOLUTE_WEIGHTS = {
+        'control': [0.05, 0.1, 0.2, 0.4, 0.25],
+        'test_1_hardcoded': [0.03, 0.07, 0.15, 0.45, 0.30],
+        'test_2_predefined': [0.04, 0.08, 0.18, 0.42, 0.28],
+        'test_3_dynamic': [0.04, 0.08, 0.18, 0.40, 0.30],
+        'test_4_dynamic_tone': [0.02, 0.06, 0.15, 0.42, 0.35]
+    }
+
+    def __init__(self, seed: int = 42):
+        self.rng = random.Random(seed)
+
+    async def judge_pair(self, prompt: str) -> Dict[str, Any]:
+        """Return a choice and explanation per criterion for a pairwise prompt."""
+        return {
+            criterion: {
+                'choice': self.rng.choices(['A', 'B', 'Tie'], weights=self.PAIRWISE_WEIGHTS)[0],
+                'explanation': 'Simulated evaluation result'
+            }
+            for criterion in CRITERIA
+        }
+
+    async def judge_absolute(self, prompt: str, condition: str) -> Dict[str, Any]:
+        """Return a 1-5 score and explanation per criterion. The condition is used only by the simulation."""
+        weights = self.ABSOLUTE_WEIGHTS.get(condition, self.ABSOLUTE_WEIGHTS['control'])
+        return {
+            criterion: {
+                'score': self.rng.choices([1, 2, 3, 4, 5], weights=weights)[0],
+                'explanation': 'Simulated evaluation result'
+            }
+            for criterion in CRITERIA
+        }
+
+
+JUDGE_BACKENDS = {
+    'simulated': SimulatedJudge
+}
+
+# Judges reply in the evaluator_prompts.md text format and are parsed by judge_parser
+JUDGE_SAMPLING = {'temperature': 0.0, 'max_tokens': 512}
+
+
+def evaluator_name(config: Dict[str, Any]) -> str:
+    """Results name of one evaluator config, e.g. "pairwise_evaluator_4"."""
+    return f"{config['mode']}_evaluator_{config['evaluator_id']}"
+
+
+def build_judge(config: Dict[str, Any]) -> Any:
+    """Construct the judge for one evaluator config."""
+    backend = config.get('backend', 'simulated')
+    if backend == 'http':
+        client = HTTPModelClient(config['endpoint'], config.get('model', 'judge'),
+                                 config.get('requests_per_minute'), sampling=JUDGE_SAMPLING)
+        return TextJudge(client, seed=config.get('seed', 42), max_repairs=config.get('max_repairs', 1))
+    return JUDGE_BACKENDS[backend](config.get('seed', 42))
+
+
+def pack_batches(items: List[Dict[str, Any]], mode: str, batch_size: int,
+                 context_budget: int = DEFAULT_CONTEXT_BUDGET) -> List[List[Dict[str, Any]]]:
+    """
+    Greedily pack consecutive items (dicts of template fields) into batches of at most batch_size
+    whose batched prompt and expected replies fit context_budget tokens. An item that does not fit
+    even on its own becomes a batch of one and is judged with the single-item prompt.
+    """
+    template, item_template = ((BATCH_PAIRWISE_PROMPT, BATCH_PAIRWISE_ITEM) if mode == 'pairwise'
+                               else (BATCH_ABSOLUTE_PROMPT, BATCH_ABSOLUTE_ITEM))
+    overhead = estimate_tokens(template)
+    batches = []
+    current, current_tokens = [], overhead
+    for item in items:
+        item_tokens = estimate_tokens(item_template.format(number=len(current) + 1, **item)) + REPLY_TOKENS_PER_ITEM
+        if current and (len(current) >= batch_size or current_tokens + item_tokens > context_budget):
+            batches.append(current)
+            current, current_tokens = [], overhead
+        current.append(item)
+        current_tokens += item_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(mode: str, items: List[Dict[str, Any]]) -> str:
+    """Render one batched prompt with a numbered section per item."""
+    template, item_template = ((BATCH_PAIRWISE_PROMPT, BATCH_PAIRWISE_ITEM) if mode == 'pairwise'
+                               else (BATCH_ABSOLUTE_PROMPT, BATCH_ABSOLUTE_ITEM))
+    return template.format(items='\n\n'.join(item_template.format(number=number, **item)
+                                              for number, item in enumerate(items, start=1)))
+
+
+async def judge_items(judge: Any, mode: str, items: List[Dict[str, Any]], condition: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Judge one packed batch: a single-item batch (or a judge without batching) uses the
+    single-item prompt per item, anything larger goes out as one batched call.
+    Items whose judgment cannot be read come back as unparsed_judgment records."""
+    if mode == 'pairwise':
+        prompts = [PAIRWISE_PROMPT.format(**item) for item in items]
+    else:
+        prompts = [ABSOLUTE_PROMPT.format(**item) for item in items]
+    if len(items) > 1 and hasattr(judge, 'judge_batch'):
+        return await judge.judge_batch(build_batch_prompt(mode, items), prompts, mode)
+
+    evaluations = []
+    for prompt in prompts:
+        try:
+            if mode == 'pairwise':
+                evaluations.append(await judge.judge_pair(prompt))
+            else:
+                evaluations.append(await judge.judge_absolute(prompt, condition))
+        except MalformedJudgmentError as e:
+            evaluations.append(unparsed_judgment(e))
+    return evaluations
+
+
+def overall_winner(evaluation: Dict[str, Any]) -> str:
+    """Majority of per-criterion choices, as the original pairwise_evaluator_4.py scored; used when the judge
+    gave no readable "Overall Winner" verdict of its own."""
+    a_wins = sum(1 for criterion in CRITERIA if evaluation[criterion]['choice'] == 'A')
+    b_wins = sum(1 for criterion in CRITERIA if evaluation[criterion]['choice'] == 'B')
+    if a_wins > b_wins:
+        return 'A'
+    if b_wins > a_wins:
+        return 'B'
+    return 'Tie'
+
+
+class EvaluationEngine:
+    def __init__(self, base_path: str):
+        """Attach the shared blinded corpus and query registry."""
+        self.base_path = Path(base_path)
+        self.results_path = self.base_path / "results"
+        self.corpus = BlindedCorpus.load(str(self.base_path))
+        self.queries = QueryRegistry.load(str(self.base_path))
+
+        print(f"Loaded {len(self.corpus.query_ids)} blinded datasets for "
+              f"{sum(1 for files in self.corpus.files_by_condition.values() if files)} conditions")
+
+    def get_query_text(self, query_id: str) -> str:
+        """Get the original query text."""
+        return self.queries.text(query_id)
+
+    async def judge_groups(self, config: Dict[str, Any], judge: Any, executor: JudgeExecutor, mode: str,
+                           groups: List[List[Dict[str, str]]], condition: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Judge every item of every group (a dataset pair or a dataset), returning evaluations in item order.
+        Items found in the judgment cache are not sent again; the rest are packed per group into
+        batched calls and stored in the cache once judged. Unparsed judgments are returned but never cached.
+        """
+        cache = config.get('judgment_cache')
+        template = PAIRWISE_PROMPT if mode == 'pairwise' else ABSOLUTE_PROMPT
+        # Each evaluator is its own rater, so cached verdicts are never shared between panel members
+        rater = f"{evaluator_name(config)}:{config.get('seed', 42)}"
+
+        def cache_args(item: Dict[str, str]) -> Tuple[str, str, Tuple[str, ...]]:
+            responses = (item['response_a'], item['response_b']) if mode == 'pairwise' else (item['response'],)
+            return template, item['query'], responses
+
+        items = [item for group in groups for item in group]
+        evaluations = [cache.get_judgment(*cache_args(item), rater=rater) if cache else None for item in items]
+
+        batches, batch_indexes = [], []
+        offset = 0
+        for group in groups:
+            pending = [offset + position for position in range(len(group)) if evaluations[offset + position] is None]
+            for batch in pack_batches([items[index] for index in pending], mode,
+                                      config.get('batch_size', 1), config.get('context_budget', DEFAULT_CONTEXT_BUDGET)):
+                batches.append(batch)
+                batch_indexes.append(pending[:len(batch)])
+                pending = pending[len(batch):]
+            offset += len(group)
+
+        batch_results = await executor.map(judge_items, [(judge, mode, batch, condition) for batch in batches])
+        for indexes, batch_evaluations in zip(batch_indexes, batch_results):
+            for index, evaluation in zip(indexes, batch_evaluations):
+                evaluations[index] = evaluation
+                if is_unparsed(evaluation):
+                    continue
+                if mode == 'pairwise' and evaluation.get('overall_winner') is None:
+                    evaluation['overall_winner'] = overall_winner(evaluation)
+                if cache:
+                    # Batched and single-item calls judge the same item, so both are keyed by the single-item template
+                    cache.put_judgment(*cache_args(items[index]), evaluation, rater=rater)
+        return evaluations
+
+    async def judge_pair_jobs(self, config: Dict[str, Any], judge: Any, executor: JudgeExecutor,
+                              jobs: List[Dict[str, Any]], group_key: Callable[[Dict[str, Any]], Any],
+                              prompt_fields: Callable[[Dict[str, Any]], Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Judge pairwise jobs, packing jobs of the same dataset pair together; evaluations come back in job order."""
+        groups = {}
+        for index, job in enumerate(jobs):
+            groups.setdefault(group_key(job), []).append(index)
+        evaluations = await self.judge_groups(config, judge, executor, 'pairwise',
+                                              [[prompt_fields(jobs[index]) for index in indexes]
+                                               for indexes in groups.values()])
+        ordered = [None] * len(jobs)
+        for index, evaluation in zip((index for indexes in groups.values() for index in indexes), evaluations):
+            ordered[index] = evaluation
+        return ordered
+
+    async def run_pairwise(self, config: Dict[str, Any], judge: Any) -> Dict[str, Any]:
+        """Compare every test file of each configured condition against every control file."""
+        executor = JudgeExecutor(max_in_flight=config.get('concurrency', 8),
+                                 max_retries=config.get('max_retries', 4), seed=config.get('seed', 42))
+
+        def prompt_fields(job: Dict[str, Any]) -> Dict[str, str]:
+            test_text = self.corpus.response(job['test_file'], job['query_id'])
+            control_text = self.corpus.response(job['control_file'], job['query_id'])
+            response_a, response_b = (test_text, control_text) if job['a_is_test'] else (control_text, test_text)
+            return {'query': self.get_query_text(job['query_id']), 'response_a': response_a, 'response_b': response_b}
+
+        async def judge_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            return await self.judge_pair_jobs(config, judge, executor, jobs,
+                                              lambda job: (job['test_file'], job['control_file']), prompt_fields)
+
+        stopper = None
+        if config.get('adaptive'):
+            stopper = AdaptiveStopper(**config['adaptive'])
+        elif config.get('sequential'):
+            stopper = build_sequential_stopper(**config['sequential'])
+
+        all_results = {
+            'evaluator': evaluator_name(config),
+            'description': 'Pairwise comparison of test conditions vs control with A/B randomization',
+            'methodology': {
+                'role_indicators_stripped': True,
+                'ab_randomization': True,
+                'blinded_evaluation': True
+            },
+            'results': {}
+        }
+
+        control_files = self.corpus.datasets_for('control')
+        for condition in config['conditions']:
+            if condition == 'control':
+                continue
+            results = {
+                'condition': condition,
+                'comparisons': {},
+                'summary': {'total_comparisons': 0, 'test_wins': 0, 'control_wins': 0, 'ties': 0, 'unparsed': 0,
+                            'win_rate': 0.0}
+            }
+
+            # A/B positions are fixed before any judge call is issued
+            plan = plan_pairwise_comparisons(self.corpus.datasets_for(condition), control_files,
+                                             self.corpus.query_ids, seed=f"{config.get('seed', 42)}:{condition}")
+            if stopper:
+                # Adaptive/sequential mode: judge shuffled rounds that fill the executor until the stopper decides
+                judged = await judge_until_decided(plan, judge_jobs, stopper, condition,
+                                                   round_size=executor.max_in_flight * config.get('batch_size', 1),
+                                                   seed=f"{config.get('seed', 42)}:{condition}:order")
+                results['stopping'] = stopper.report(condition, len(judged), len(plan))
+            else:
+                judged = list(zip(plan, await judge_jobs(plan)))
+
+            for job, evaluation in judged:
+                test_file, control_file = job['test_file'], job['control_file']
+                comparison = results['comparisons'].setdefault(f"{test_file}_vs_{control_file}", {
+                    'test_file': test_file,
+                    'control_file': control_file,
+                    'test_original': self.corpus.original_file(test_file),
+                    'control_original': self.corpus.original_file(control_file),
+                    'query_results': {}
+                })
+                if is_unparsed(evaluation):
+                    winner = 'unparsed'
+                else:
+                    winner = winner_from_overall(evaluation['overall_winner'], job['a_is_test'])
+                comparison['query_results'][job['query_id']] = {
+                    'winner': winner, 'a_is_test': job['a_is_test'], 'evaluation': evaluation
+                }
+                if winner == 'unparsed':
+                    results['summary']['unparsed'] += 1
+                    continue
+                key = {'test': 'test_wins', 'control': 'control_wins', 'tie': 'ties'}[winner]
+                results['summary'][key] += 1
+                results['summary']['total_comparisons'] += 1
+
+            decided = results['summary']['test_wins'] + results['summary']['control_wins']
+            if decided > 0:
+                results['summary']['win_rate'] = results['summary']['test_wins'] / decided
+            all_results['results'][condition] = results
+
+        return all_results
+
+    async def run_absolute(self, config: Dict[str, Any], judge: Any) -> Dict[str, Any]:
+        """Score every dataset of each configured condition independently on the 1-5 scale."""
+        executor = JudgeExecutor(max_in_flight=config.get('concurrency', 8),
+                                 max_retries=config.get('max_retries', 4), seed=config.get('seed', 42))
+
+        async def judge_dataset(filename: str, condition: str) -> Dict[str, Dict[str, Any]]:
+            query_ids = self.corpus.query_ids[filename]
+            items = [{'query': self.get_query_text(query_id), 'response': self.corpus.response(filename, query_id)}
+                     for query_id in query_ids]
+            evaluations = await self.judge_groups(config, judge, executor, 'absolute', [items], condition)
+            return {query_id: {'query_text': item['query'], 'evaluation': evaluation}
+                    for query_id, item, evaluation in zip(query_ids, items, evaluations)}
+
+        all_results = {
+            'evaluator': evaluator_name(config),
+            'conditions': config['conditions'],
+            'description': f"Absolute rating of {', '.join(config['conditions'])} datasets on 1-5 scale",
+            'methodology': {
+                'role_indicators_stripped': True,
+                'rating_scale': '1-5',
+                'blinded_evaluation': True
+            },
+            'dataset_results': {},
+            'condition_summaries': {}
+        }
+
+        for condition in config['conditions']:
+            condition_scores = {criterion: [] for criterion in CRITERIA}
+            for filename in self.corpus.datasets_for(condition):
+                query_evaluations = await judge_dataset(filename, condition)
+                parsed = [entry['evaluation'] for entry in query_evaluations.values() if not is_unparsed(entry['evaluation'])]
+                average_scores = {}
+                for criterion in CRITERIA:
+                    scores = [evaluation[criterion]['score'] for evaluation in parsed]
+                    condition_scores[criterion].extend(scores)
+                    average_scores[criterion] = round(sum(scores) / len(scores), 2) if scores else None
+
+                all_results['dataset_results'][filename] = {
+                    'dataset_file': filename,
+                    'original_file': self.corpus.original_file(filename),
+                    'condition_type': condition,
+                    'query_evaluations': query_evaluations,
+                    'summary': {'total_queries': len(query_evaluations),
+                                'unparsed_queries': len(query_evaluations) - len(parsed),
+                                'average_scores': average_scores}
+                }
+
+            if condition_scores['overall']:
+                all_results['condition_summaries'][condition] = {
+                    criterion: {
+                        'mean': round(sum(scores) / len(scores), 2),
+                        'min': min(scores),
+                        'max': max(scores),
+                        'total_responses': len(scores)
+                    }
+                    for criterion, scores in condition_scores.items()
+                }
+
+        if len(config['conditions']) == 1:
+            # Single-condition evaluators keep the absolute_evaluator_4..6 layout
+            all_results['condition'] = config['conditions'][0]
+            all_results['overall_summary'] = all_results['condition_summaries'].get(config['conditions'][0], {})
+
+        return all_results
+
+    async def run_tournament(self, config: Dict[str, Any], judge: Any) -> Dict[str, Any]:
+        """Rank all configured conditions with a Bradley-Terry fit over adaptively scheduled cross-condition judgments."""
+        executor = JudgeExecutor(max_in_flight=config.get('concurrency', 8),
+                                 max_retries=config.get('max_retries', 4), seed=config.get('seed', 42))
+        conditions = config['conditions']
+        alpha = config.get('alpha', 0.05)
+        z = NormalDist().inv_cdf(1 - alpha / 2)
+        scheduler = TournamentScheduler(conditions, {condition: self.corpus.datasets_for(condition)
+                                                     for condition in conditions},
+                                        self.corpus.query_ids, seed=f"{config.get('seed', 42)}:tournament")
+        full_grid = scheduler.full_grid_size()
+        budget = min(config.get('budget') or full_grid // 8, full_grid)
+        round_size = config.get('round_size') or executor.max_in_flight * config.get('batch_size', 1)
+        min_judgments = config.get('min_judgments', 10 * len(conditions))
+
+        def prompt_fields(job: Dict[str, Any]) -> Dict[str, str]:
+            text_i = self.corpus.response(job['dataset_i'], job['query_id'])
+            text_j = self.corpus.response(job['dataset_j'], job['query_id'])
+            response_a, response_b = (text_i, text_j) if job['a_is_i'] else (text_j, text_i)
+            return {'query': self.get_query_text(job['query_id']), 'response_a': response_a, 'response_b': response_b}
+
+        comparisons, outcomes = [], []
+        fit, stopped = None, 'exhausted'
+        while len(comparisons) < budget:
+            jobs = scheduler.next_round(fit, min(round_size, budget - len(comparisons)))
+            if not jobs:
+                break
+            evaluations = await self.judge_pair_jobs(config, judge, executor, jobs,
+                                                     lambda job: (job['dataset_i'], job['dataset_j']), prompt_fields)
+            for job, evaluation in zip(jobs, evaluations):
+                if is_unparsed(evaluation):
+                    comparisons.append({**job, 'winner': 'unparsed', 'evaluation': evaluation})
+                    continue
+                if evaluation['overall_winner'] == 'Tie':
+                    score, winner = 0.5, 'tie'
+                else:
+                    i_won = (evaluation['overall_winner'] == 'A') == job['a_is_i']
+                    score, winner = (1.0, job['condition_i']) if i_won else (0.0, job['condition_j'])
+                outcomes.append((job['condition_i'], job['condition_j'], score))
+                comparisons.append({**job, 'winner': winner, 'evaluation': evaluation})
+
+            fit = fit_bradley_terry(conditions, outcomes)
+            if len(comparisons) >= min_judgments and is_settled(conditions, fit, z):
+                stopped = 'settled'
+                break
+        else:
+            stopped = 'budget'
+
+        summary = summarize_fit(conditions, fit, alpha) if fit else {}
+        print(f"  Tournament: {len(comparisons)}/{full_grid} judgments ({stopped}), "
+              f"ranking {' > '.join(summary.get('ranking', []))}")
+        return {
+            'evaluator': evaluator_name(config),
+            'description': 'Bradley-Terry ranking of all conditions from cross-condition pairwise comparisons',
+            'methodology': {
+                'role_indicators_stripped': True,
+                'ab_randomization': True,
+                'blinded_evaluation': True,
+                'model': 'bradley_terry',
+                'ties': 'half win to each side',
+                'scheduling': 'rounds allocated by p(1-p) x strength-difference standard error'
+            },
+            'schedule': {'judgments': len(comparisons), 'full_grid': full_grid, 'budget': budget,
+                         'round_size': round_size, 'stopped': stopped},
+            'summary': summary,
+            'comparisons': comparisons
+        }
+
+    async def run_evaluator(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one evaluator config with its own judge instance."""
+        judge = build_judge(config)
+        if config['mode'] == 'pairwise':
+            results = await self.run_pairwise(config, judge)
+        elif config['mode'] == 'tournament':
+            results = await self.run_tournament(config, judge)
+        else:
+            results = await self.run_absolute(config, judge)
+        if hasattr(judge, 'parse_report'):
+            results['judge_output'] = judge.parse_report()
+        return results
+
+    async def run_all(self, configs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Run every evaluator concurrently over the shared datasets."""
+        results = await asyncio.gather(*(self.run_evaluator(config) for config in configs))
+        return {result['evaluator']: result for result in results}
+
+    def existing_results(self, configs: List[Dict[str, Any]], output_dir: Optional[str] = None) -> List[str]:
+        """Results files the configs would write that already exist."""
+        output_path = Path(output_dir) if output_dir else self.results_path
+        return [f"{evaluator_name(config)}_results.json" for config in configs
+                if (output_path / f"{evaluator_name(config)}_results.json").exists()]
+
+    def save_results(self, all_results: Dict[str, Dict[str, Any]],
+                     output_dir: Optional[str] = None, overwrite: bool = False) -> List[str]:
+        """Write <evaluator>_results.json for every evaluator; existing files are only replaced with overwrite."""
+        output_path = Path(output_dir) if output_dir else self.results_path
+        existing = [evaluator for evaluator in all_results
+                    if (output_path / f"{evaluator}_results.json").exists()]
+        if existing and not overwrite:
+            raise FileExistsError(f"Results for {', '.join(existing)} already exist in {output_path}; "
+                                  f"pass overwrite=True to replace them")
+        output_path.mkdir(parents=True, exist_ok=True)
+        written = []
+        for evaluator, results in all_results.items():
+            output_file = output_path / f"{evaluator}_results.json"
+            with open(output_file, 'w') as f:
+                json.dump(results, f, indent=2)
+            written.append(str(output_file))
+        return written
+
+
+def run_single_evaluator(config: Dict[str, Any], base_path: str):
+    """
+    Command line entry point of the per-evaluator scripts: run one evaluator config over base_path
+    and write its <evaluator>_results.json, refusing to replace an existing file without --overwrite.
+    """
+    parser = argparse.ArgumentParser(description=f"Run {evaluator_name(config)} through the shared evaluation engine")
+    parser.add_argument('--base-path', default=base_path)
+    parser.add_argument('--backend', choices=sorted(JUDGE_BACKENDS) + ['http'], default='simulated')
+    parser.add_argument('--endpoint', default='http://127.0.0.1:8765/generate', help="judge endpoint for --backend http")
+    parser.add_argument('--model', default='judge', help="judge model name for --backend http")
+    parser.add_argument('--concurrency', type=int, default=8, help="in-flight judge calls")
+    parser.add_argument('--seed', type=int, default=42, help="run seed; the evaluator seed is derived from it")
+    parser.add_argument('--output-dir', default=None, help="defaults to results/ under --base-path")
+    parser.add_argument('--overwrite', action='store_true', help="replace the results file if it already exists")
+    args = parser.parse_args()
+
+    config = {**config, 'concurrency': args.concurrency, 'backend': args.backend,
+              'endpoint': args.endpoint, 'model': args.model}
+    config['seed'] = evaluator_seed(args.seed, config)
+
+    engine = EvaluationEngine(args.base_path)
+    existing = engine.existing_results([config], args.output_dir)
+    if existing and not args.overwrite:
+        parser.error(f"{existing[0]} already exists in {args.output_dir or engine.results_path}; "
+                     f"choose another --output-dir or pass --overwrite")
+    results = asyncio.run(engine.run_evaluator(config))
+    for output_file in engine.save_results({results['evaluator']: results}, args.output_dir, overwrite=args.overwrite):
+        print(f"Results saved to: {output_file}")
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Run persona experiment evaluators in one process")
+    parser.add_argument('--base-path', default=str(Path(__file__).resolve().parent))
+    parser.add_argument('--panel', choices=['experiment_03', 'full', 'tournament'], default='experiment_03')
+    parser.add_argument('--backend', choices=sorted(JUDGE_BACKENDS) + ['http'], default='simulated')
+    parser.add_argument('--endpoint', default='http://127.0.0.1:8765/generate', help="judge endpoint for --backend http")
+    parser.add_argument('--model', default='judge', help="judge model name for --backend http")
+    parser.add_argument('--concurrency', type=int, default=8, help="in-flight judge calls per evaluator")
+    parser.add_argument('--max-retries', type=int, default=4, help="retries per failed judge call")
+    parser.add_argument('--seed', type=int, default=42,
+                        help="run seed; each evaluator judges and plans A/B positions with its own seed derived from it")
+    parser.add_argument('--batch-size', type=int, default=1, help="queries per judge call (batched judging)")
+    parser.add_argument('--context-budget', type=int, default=DEFAULT_CONTEXT_BUDGET,
+                        help="token budget per batched judge call; larger items fall back to single-item mode")
+    parser.add_argument('--judgment-cache-dir', default=None,
+                        help="judgment cache location (default: judgment_cache/ for --backend http, off for simulated)")
+    parser.add_argument('--no-judgment-cache', action='store_true', help="judge everything again")
+    parser.add_argument('--reuse-swapped', action='store_true',
+                        help="answer an A/B ordering from its cached mirror (assumes no position bias)")
+    parser.add_argument('--cache-max-mb', type=float, default=512)
+    parser.add_argument('--adaptive', action='store_true',
+                        help="stop judging a condition once its win-rate interval excludes 0.5 or is narrow enough")
+    parser.add_argument('--target-width', type=float, default=0.2, help="adaptive mode: stop at this interval width")
+    parser.add_argument('--min-decided', type=int, default=24, help="adaptive mode: non-tie judgments before stopping")
+    parser.add_argument('--sequential', choices=sorted(SEQUENTIAL_METHODS), default=None,
+                        help="stop judging a condition once a sequential test (alpha-spending or SPRT) decides it")
+    parser.add_argument('--sequential-alpha', type=float, default=0.05, help="sequential mode: overall type I error")
+    parser.add_argument('--sprt-effect', type=float, default=0.15,
+                        help="sequential sprt: win-rate difference from 0.5 the test is powered for")
+    parser.add_argument('--tournament-budget', type=int, default=None,
+                        help="tournament panel: max judgments (default: 1/8 of the all-pairs grid)")
+    parser.add_argument('--output-dir', default=None, help="defaults to results/")
+    parser.add_argument('--overwrite', action='store_true', help="replace results files that already exist")
+    args = parser.parse_args()
+    if args.adaptive and args.sequential:
+        parser.error("--adaptive and --sequential are alternative stopping rules; pick one")
+
+    judgment_cache = None
+    cache_dir = args.judgment_cache_dir or (str(Path(args.base_path) / "judgment_cache") if args.backend == 'http' else None)
+    if cache_dir and not args.no_judgment_cache:
+        judge_id = f"{args.backend}:{args.model}" if args.backend == 'http' else args.backend
+        judgment_cache = JudgmentCache(cache_dir, judge_id, max_bytes=int(args.cache_max_mb * 1024 * 1024),
+                                       reuse_swapped=args.reuse_swapped)
+
+    if args.panel == 'full':
+        configs = build_full_panel(args.concurrency, args.backend, args.seed)
+    elif args.panel == 'tournament':
+        configs = [{'evaluator_id': 1, 'mode': 'tournament', 'conditions': CONDITIONS,
+                    'budget': args.tournament_budget, 'concurrency': args.concurrency, 'backend': args.backend}]
+    else:
+        configs = [{**config, 'concurrency': args.concurrency, 'backend': args.backend}
+                   for config in EXPERIMENT_03_EVALUATORS]
+    for config in configs:
+        config.update({'seed': evaluator_seed(args.seed, config), 'max_retries': args.max_retries, 'endpoint': args.endpoint, 'model': args.model,
+                       'batch_size': args.batch_size, 'context_budget': args.context_budget,
+                       'judgment_cache': judgment_cache})
+        if args.adaptive:
+            config['adaptive'] = {'target_width': args.target_width, 'min_decided': args.min_decided}
+        elif args.sequential == 'sprt':
+            config['sequential'] = {'method': 'sprt', 'alpha': args.sequential_alpha, 'effect': args.sprt_effect}
+        elif args.sequential:
+            config['sequential'] = {'method': args.sequential, 'alpha': args.sequential_alpha}
+
+    engine = EvaluationEngine(args.base_path)
+    existing = engine.existing_results(configs, args.output_dir)
+    if existing and not args.overwrite:
+        parser.error(f"{', '.join(existing)} already exist in {args.output_dir or engine.results_path}; "
+                     f"choose another --output-dir or pass --overwrite")
+    all_results = asyncio.run(engine.run_all(configs))
+    written = engine.save_results(all_results, args.output_dir, overwrite=args.overwrite)
+    if judgment_cache:
+        summary = judgment_cache.summary()
+        print(f"Judgment cache: {summary['hits']} hits ({summary['swapped_hits']} from swapped orderings), "
+              f"{summary['misses']} misses")
+        evicted = judgment_cache.evict()
+        if evicted:
+            print(f"Evicted {evicted} least-recently-used judgment cache entries")
+
+    for output_file in written:
+        print(f"Results saved to: {output_file}")
+    print(f"\n{len(written)} evaluators completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
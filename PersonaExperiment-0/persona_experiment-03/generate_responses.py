@@ -0,0 +1,664 @@
+#!/usr/bin/env python3
+"""
+Concurrent Response Generation for Persona Experiment 03
+Fans out every (condition, agent, query) triple to a model backend with bounded concurrency
+and per-backend rate limits, then writes responses/<condition>_responses_agent_N.json files.
+With --resume, every finished response is appended to a write-ahead log and a restarted run
+skips the triples that are already complete. Requests sharing a pre-prompt are sent as
+batches so the backend can reuse the cached prefix; token savings are reported per condition.
+Responses are also stored in a content-addressed cache that --reuse-cache reads back.
+Workers pull from a shared latency-aware queue so the slowest conditions start first.
+With --stream, output is consumed incrementally into the checkpoint log and time-to-first-token,
+tokens/sec and total latency are recorded per (condition, query).
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Tuple, Any, Optional, AsyncIterator, Callable
+
+from generation_log import GenerationLog
+from query_registry import QUERY_CATEGORIES, QueryRegistry
+from response_cache import ResponseCache
+from sequential_testing import decided_conditions
+from work_scheduler import LatencyAwareScheduler, load_length_priors
+
+CONDITIONS = [
+    'control',
+    'test_1_hardcoded',
+    'test_2_predefined',
+    'test_3_dynamic',
+    'test_4_dynamic_tone'
+]
+
+# Pre-prompts copied verbatim from isolated_persona_experiments.md (Version 0.2)
+PRE_PROMPTS = {
+    'research_librarian': (
+        "You are a Research Librarian. Your primary goal is to find current, accurate information. \n"
+        "Always prefer searching for recent data over relying on training knowledge for factual queries. \n"
+        "Be thorough, cite sources, and verify information when possible."
+    ),
+    'domain_expert': (
+        "You are a Domain Expert. Provide deep, technical insights assuming user competence. \n"
+        "Use precise terminology, detailed explanations, and draw from specialized knowledge confidently."
+    ),
+    'practical_advisor': (
+        "You are a Practical Advisor. Focus on actionable guidance and step-by-step approaches. \n"
+        "Consider real-world constraints and provide concrete next steps the user can implement."
+    ),
+    'predefined_selection': (
+        "Before responding, analyze the query and choose the most appropriate role:\n"
+        "\n"
+        "- Research Librarian: For pricing, current events, factual lookups needing verification\n"
+        "- Domain Expert: For technical questions requiring specialized knowledge  \n"
+        "- Practical Advisor: For decisions, recommendations, how-to guidance\n"
+        "- Creative Collaborator: For brainstorming, writing, ideation\n"
+        "- Socratic Guide: For learning questions, complex problems needing exploration\n"
+        "\n"
+        "Choose one role, indicate it with [Role: X], then respond in that role."
+    ),
+    'dynamic': (
+        "Before responding, analyze what type of response would be most helpful for this specific query. \n"
+        "Create an appropriate role/persona that would best serve the user's needs, then adopt that role.\n"
+        "\n"
+        "Indicate your chosen role with [Role: X] and respond accordingly."
+    ),
+    'dynamic_tone': (
+        "Before responding, analyze what type of response would be most helpful for this specific query. \n"
+        "Create an appropriate role/persona that would best serve the user's needs.\n"
+        "\n"
+        "IMPORTANT: Maintain a consistent, professional tone throughout. Avoid sudden personality shifts \n"
+        "that might feel jarring to the user. Your role should enhance helpfulness while keeping the \n"
+        "interaction feeling natural and coherent.\n"
+        "\n"
+        "Indicate your chosen role with [Role: X] and respond accordingly."
+    )
+}
+
+TEST_1_ROLE_ASSIGNMENT = {
+    'factual': 'research_librarian',
+    'technical': 'domain_expert',
+    'advisory': 'practical_advisor',
+    'guidance': 'practical_advisor'
+}
+
+CONDITION_PRE_PROMPTS = {
+    'test_2_predefined': 'predefined_selection',
+    'test_3_dynamic': 'dynamic',
+    'test_4_dynamic_tone': 'dynamic_tone'
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for prefix savings reporting."""
+    return (len(text) + 3) // 4
+
+
+def get_pre_prompt(condition: str, query_id: str) -> str:
+    """Return the pre-prompt text a condition uses for a query (empty for control)."""
+    if condition == 'control':
+        return ''
+    if condition == 'test_1_hardcoded':
+        category = QUERY_CATEGORIES.get(query_id, 'advisory')
+        return PRE_PROMPTS[TEST_1_ROLE_ASSIGNMENT[category]]
+    return PRE_PROMPTS[CONDITION_PRE_PROMPTS[condition]]
+
+
+class RateLimiter:
+    """Async token bucket limiting how many requests a backend receives per minute."""
+
+    def __init__(self, requests_per_minute: Optional[float]):
+        self.requests_per_minute = requests_per_minute
+        self.capacity = max(1.0, (requests_per_minute or 0) / 60.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, count: int = 1):
+        """Wait until the bucket has given out count tokens (one per request), taking them one at a time."""
+        if not self.requests_per_minute:
+            return
+        rate = self.requests_per_minute / 60.0
+        async with self.lock:
+            for _ in range(count):
+                while True:
+                    now = time.monotonic()
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * rate)
+                    self.updated_at = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    await asyncio.sleep((1 - self.tokens) / rate)
+
+
+class ModelClient:
+    """Base class for generation backends. Subclasses implement _complete()."""
+
+    backend = 'base'
+
+    def __init__(self, model: str, requests_per_minute: Optional[float] = None,
+                 sampling: Optional[Dict[str, Any]] = None):
+        self.model = model
+        self.sampling = sampling or {'temperature': 1.0, 'max_tokens': 1024}
+        self.rate_limiter = RateLimiter(requests_per_minute)
+
+    async def generate(self, pre_prompt: str, query: str, seed: Optional[int] = None,
+                       on_dispatch: Optional[Callable[[], Any]] = None) -> str:
+        """Generate a response to a query under a pre-prompt, respecting the rate limit.
+        on_dispatch is called once the rate limiter lets the request go out."""
+        await self.rate_limiter.acquire()
+        if on_dispatch:
+            on_dispatch()
+        return await self._complete(pre_prompt, query, seed)
+
+    async def generate_batch(self, pre_prompt: str, queries: List[str],
+                             seeds: Optional[List[Optional[int]]] = None,
+                             on_dispatch: Optional[Callable[[], Any]] = None) -> List[str]:
+        """Generate responses for several queries that share one pre-prompt prefix.
+        Every query counts against the rate limit, whether or not the backend takes them in one call."""
+        await self.rate_limiter.acquire(len(queries))
+        if on_dispatch:
+            on_dispatch()
+        return await self._complete_batch(pre_prompt, queries, seeds or [None] * len(queries))
+
+    async def stream(self, pre_prompt: str, query: str, seed: Optional[int] = None,
+                     on_dispatch: Optional[Callable[[], Any]] = None) -> AsyncIterator[str]:
+        """Yield the response to a query as text chunks, respecting the rate limit."""
+        await self.rate_limiter.acquire()
+        if on_dispatch:
+            on_dispatch()
+        async for delta in self._stream(pre_prompt, query, seed):
+            yield delta
+
+    async def _complete(self, pre_prompt: str, query: str, seed: Optional[int]) -> str:
+        raise NotImplementedError
+
+    async def _stream(self, pre_prompt: str, query: str, seed: Optional[int]) -> AsyncIterator[str]:
+        # Default for backends without streaming: the whole response arrives as one chunk
+        yield await self._complete(pre_prompt, query, seed)
+
+    async def _complete_batch(self, pre_prompt: str, queries: List[str],
+                              seeds: List[Optional[int]]) -> List[str]:
+        # Default: the first request warms the backend's prefix cache, the rest reuse it
+        first = await self._complete(pre_prompt, queries[0], seeds[0])
+        rest = await asyncio.gather(*(self._complete(pre_prompt, query, seed)
+                                      for query, seed in zip(queries[1:], seeds[1:])))
+        return [first, *rest]
+
+
+class StubModelClient(ModelClient):
+    """Deterministic in-process backend for dry runs; sleeps in proportion to the prompt size."""
+
+    backend = 'stub'
+
+    def __init__(self, model: str = 'stub', requests_per_minute: Optional[float] = None,
+                 sampling: Optional[Dict[str, Any]] = None, latency_per_char: float = 0.00005):
+        super().__init__(model, requests_per_minute, sampling)
+        self.latency_per_char = latency_per_char
+
+    async def _complete(self, pre_prompt: str, query: str, seed: Optional[int]) -> str:
+        await asyncio.sleep(self.latency_per_char * (len(pre_prompt) + len(query)))
+        return stub_response_text(pre_prompt, query)
+
+    async def _complete_batch(self, pre_prompt: str, queries: List[str],
+                              seeds: List[Optional[int]]) -> List[str]:
+        # The shared prefix is only "processed" once per batch
+        await asyncio.sleep(self.latency_per_char * (len(pre_prompt) + sum(len(query) for query in queries)))
+        return [stub_response_text(pre_prompt, query) for query in queries]
+
+    async def _stream(self, pre_prompt: str, query: str, seed: Optional[int]) -> AsyncIterator[str]:
+        await asyncio.sleep(self.latency_per_char * len(pre_prompt))
+        for index, word in enumerate(stub_response_text(pre_prompt, query).split(' ')):
+            await asyncio.sleep(self.latency_per_char * len(word))
+            yield word if index == 0 else ' ' + word
+
+
+class HTTPModelClient(ModelClient):
+    """Backend that POSTs {model, system, prompt, seed, ...sampling} as JSON and reads back {"text": ...}.
+    Batches are sent as {model, system, prompts: [...], seeds: [...], cache_system_prompt: true} and read back
+    as {"texts": [...]}."""
+
+    backend = 'http'
+
+    def __init__(self, endpoint: str, model: str, requests_per_minute: Optional[float] = None,
+                 sampling: Optional[Dict[str, Any]] = None, timeout: float = 300.0):
+        super().__init__(model, requests_per_minute, sampling)
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    async def _complete(self, pre_prompt: str, query: str, seed: Optional[int]) -> str:
+        payload = {'model': self.model, 'system': pre_prompt, 'prompt': query, 'seed': seed, **self.sampling}
+        return (await asyncio.to_thread(self._post, payload))['text']
+
+    async def _complete_batch(self, pre_prompt: str, queries: List[str],
+                              seeds: List[Optional[int]]) -> List[str]:
+        payload = {'model': self.model, 'system': pre_prompt, 'prompts': queries, 'seeds': seeds,
+                   'cache_system_prompt': True, **self.sampling}
+        return (await asyncio.to_thread(self._post, payload))['texts']
+
+    async def _stream(self, pre_prompt: str, query: str, seed: Optional[int]) -> AsyncIterator[str]:
+        # The endpoint answers a {"stream": true} request with one {"delta": "..."} JSON object per line
+        payload = {'model': self.model, 'system': pre_prompt, 'prompt': query, 'seed': seed,
+                   'stream': True, **self.sampling}
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+
+        def read_lines():
+            try:
+                with urllib.request.urlopen(self._request(payload), timeout=self.timeout) as response:
+                    for line in response:
+                        if line.strip():
+                            loop.call_soon_threadsafe(chunks.put_nowait, json.loads(line)['delta'])
+            except Exception as e:
+                loop.call_soon_threadsafe(chunks.put_nowait, e)
+            loop.call_soon_threadsafe(chunks.put_nowait, None)
+
+        reader = loop.run_in_executor(None, read_lines)
+        while True:
+            delta = await chunks.get()
+            if delta is None:
+                break
+            if isinstance(delta, Exception):
+                raise delta
+            yield delta
+        await reader
+
+    def _request(self, payload: Dict[str, Any]) -> urllib.request.Request:
+        return urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}
+        )
+
+    def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with urllib.request.urlopen(self._request(payload), timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+
+def stub_response_text(pre_prompt: str, query: str) -> str:
+    """Placeholder response text shared by the in-process stub and the stub server."""
+    role = '[Role: Stub Persona] ' if '[Role: X]' in pre_prompt else ''
+    return f"{role}Stub response to: {query}"
+
+
+def run_stub_server(host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """Start a local HTTP stub backend on a daemon thread for exercising HTTPModelClient."""
+    import threading
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length).decode('utf-8'))
+            system = payload.get('system', '')
+            if payload.get('stream'):
+                words = stub_response_text(system, payload['prompt']).split(' ')
+                body = ''.join(json.dumps({'delta': word if index == 0 else ' ' + word}) + '\n'
+                               for index, word in enumerate(words))
+            elif 'prompts' in payload:
+                body = json.dumps({'texts': [stub_response_text(system, prompt) for prompt in payload['prompts']]})
+            else:
+                body = json.dumps({'text': stub_response_text(system, payload['prompt'])})
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(body.encode('utf-8'))
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class ResponseGenerator:
+    def __init__(self, base_path: str, client: ModelClient, agent_ids: List[int],
+                 conditions: Optional[List[str]] = None, max_concurrency: int = 16,
+                 log: Optional[GenerationLog] = None, batch_size: int = 12,
+                 cache: Optional[ResponseCache] = None, reuse_cache: bool = False, base_seed: int = 0,
+                 stream: bool = False, output_dir: Optional[str] = None):
+        """Initialize the generator for a set of agents and conditions (files go to output_dir, default responses/)."""
+        self.base_path = Path(base_path)
+        self.responses_path = Path(output_dir) if output_dir else self.base_path / "responses"
+        self.client = client
+        self.agent_ids = agent_ids
+        self.conditions = conditions or CONDITIONS
+        self.max_concurrency = max_concurrency
+        self.log = log
+        self.batch_size = max(1, batch_size)
+        self.cache = cache
+        self.reuse_cache = reuse_cache
+        self.base_seed = base_seed
+        self.stream = stream
+        self.stream_metrics = {}
+        self.in_flight = None
+        self.prefix_savings = {}
+        self.latency_estimates = {}
+
+        self.queries = QueryRegistry.load(str(self.base_path)).texts
+
+    def build_work_items(self) -> List[Tuple[str, int, str]]:
+        """Enumerate every (condition, agent, query) triple in the run."""
+        return [
+            (condition, agent_id, query_id)
+            for condition in self.conditions
+            for agent_id in self.agent_ids
+            for query_id in self.queries
+        ]
+
+    def agent_seed(self, agent_id: int) -> int:
+        """Each agent is an independent sample, so it gets its own sampling seed."""
+        return self.base_seed + agent_id
+
+    def cache_key(self, item: Tuple[str, int, str]) -> str:
+        """Content-address a work item by its exact generation inputs."""
+        condition, agent_id, query_id = item
+        sampling = {**self.client.sampling, 'seed': self.agent_seed(agent_id)}
+        return self.cache.make_key(get_pre_prompt(condition, query_id), self.queries[query_id],
+                                   self.client.model, sampling)
+
+    def build_scheduler(self, work_items: List[Tuple[str, int, str]]) -> LatencyAwareScheduler:
+        """Queue work items in lanes of identical (condition, pre-prompt) so batches share a prefix."""
+        scheduler = LatencyAwareScheduler(load_length_priors(str(self.base_path / "responses"), self.conditions))
+        for item in work_items:
+            condition, _, query_id = item
+            scheduler.add(condition, get_pre_prompt(condition, query_id), item)
+        return scheduler
+
+    def calculate_prefix_savings(self, batches: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Estimate input tokens saved per condition by sending each shared prefix once per batch."""
+        savings = {}
+        for batch in batches:
+            prefix_tokens = estimate_tokens(batch['pre_prompt'])
+            query_tokens = sum(estimate_tokens(self.queries[query_id]) for _, _, query_id in batch['items'])
+            n_items = len(batch['items'])
+
+            stats = savings.setdefault(batch['condition'], {
+                'requests': 0, 'batches': 0,
+                'input_tokens_unbatched': 0, 'input_tokens_batched': 0
+            })
+            stats['requests'] += n_items
+            stats['batches'] += 1
+            stats['input_tokens_unbatched'] += n_items * prefix_tokens + query_tokens
+            stats['input_tokens_batched'] += prefix_tokens + query_tokens
+
+        for stats in savings.values():
+            stats['tokens_saved'] = stats['input_tokens_unbatched'] - stats['input_tokens_batched']
+            stats['savings_pct'] = round(100 * stats['tokens_saved'] / stats['input_tokens_unbatched'], 2) \
+                if stats['input_tokens_unbatched'] else 0.0
+        return savings
+
+    async def stream_one(self, pre_prompt: str, item: Tuple[str, int, str]) -> Tuple[Tuple[str, int, str], str, float]:
+        """
+        Stream one response into the checkpoint log while timing first token and throughput.
+        Timing starts when the request is dispatched, so waits for a concurrency slot or a rate-limit
+        token are not counted; returns (item, text, seconds from dispatch to the last chunk).
+        """
+        condition, agent_id, query_id = item
+        dispatched_at = []
+        first_token_at = None
+        chunks = []
+        async with self.in_flight:
+            async for delta in self.client.stream(pre_prompt, self.queries[query_id], self.agent_seed(agent_id),
+                                                  on_dispatch=lambda: dispatched_at.append(time.monotonic())):
+                if first_token_at is None:
+                    first_token_at = time.monotonic()
+                if self.log:
+                    self.log.append_chunk(item, len(chunks), delta)
+                chunks.append(delta)
+        end = time.monotonic()
+        start = dispatched_at[0] if dispatched_at else end
+
+        text = ''.join(chunks)
+        output_tokens = estimate_tokens(text)
+        ttft = (first_token_at or end) - start
+        decode_seconds = end - (first_token_at or end)
+        metrics = {
+            'ttft_s': round(ttft, 4),
+            'total_latency_s': round(end - start, 4),
+            'output_tokens': output_tokens,
+            'tokens_per_s': round(output_tokens / decode_seconds, 2) if decode_seconds > 0 else None
+        }
+        self.stream_metrics.setdefault((condition, query_id), []).append(metrics)
+
+        self.commit_response(item, text, **metrics)
+        return item, text, end - start
+
+    def commit_response(self, item: Tuple[str, int, str], text: str, **metadata: Any):
+        """Record a finished response in the cache and the checkpoint log."""
+        if self.cache:
+            self.cache.put(self.cache_key(item), text, model=self.client.model)
+        if self.log:
+            self.log.append(item, text, **metadata)
+
+    async def generate_batch(self, batch: Dict[str, Any]) -> List[Tuple[Tuple[str, int, str], str]]:
+        """
+        Generate the responses for one batch of triples sharing a pre-prompt, recording in
+        batch['service_s'] the seconds spent after dispatch (queueing for a slot or token excluded).
+        """
+        if self.stream:
+            # The first stream warms the prefix cache, the rest of the batch reuses it
+            first = await self.stream_one(batch['pre_prompt'], batch['items'][0])
+            rest = await asyncio.gather(*(self.stream_one(batch['pre_prompt'], item) for item in batch['items'][1:]))
+            batch['service_s'] = sum(seconds for _, _, seconds in [first, *rest])
+            return [(item, text) for item, text, _ in [first, *rest]]
+
+        queries = [self.queries[query_id] for _, _, query_id in batch['items']]
+        seeds = [self.agent_seed(agent_id) for _, agent_id, _ in batch['items']]
+        dispatched_at = []
+        dispatched = lambda: dispatched_at.append(time.monotonic())
+        async with self.in_flight:
+            if len(queries) == 1:
+                texts = [await self.client.generate(batch['pre_prompt'], queries[0], seeds[0], on_dispatch=dispatched)]
+            else:
+                texts = await self.client.generate_batch(batch['pre_prompt'], queries, seeds, on_dispatch=dispatched)
+        end = time.monotonic()
+        batch['service_s'] = end - (dispatched_at[0] if dispatched_at else end)
+
+        completed = list(zip(batch['items'], texts))
+        for item, text in completed:
+            self.commit_response(item, text)
+        return completed
+
+    def summarize_stream_metrics(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Average streaming metrics per (condition, query) over agents."""
+        summary = {}
+        for (condition, query_id), samples in self.stream_metrics.items():
+            rates = [sample['tokens_per_s'] for sample in samples if sample['tokens_per_s'] is not None]
+            summary.setdefault(condition, {})[query_id] = {
+                'n': len(samples),
+                'mean_ttft_s': round(sum(sample['ttft_s'] for sample in samples) / len(samples), 4),
+                'mean_total_latency_s': round(sum(sample['total_latency_s'] for sample in samples) / len(samples), 4),
+                'mean_tokens_per_s': round(sum(rates) / len(rates), 2) if rates else None
+            }
+        return summary
+
+    def take_cached(self, work_items: List[Tuple[str, int, str]]) -> List[Tuple[Tuple[str, int, str], str]]:
+        """Pull responses for work items whose exact inputs are already in the cache."""
+        cached = []
+        for item in work_items:
+            text = self.cache.get(self.cache_key(item))
+            if text is not None:
+                cached.append((item, text))
+                if self.log:
+                    self.log.append(item, text, cached=True)
+        return cached
+
+    async def worker(self, scheduler: LatencyAwareScheduler, batches: List[Dict[str, Any]],
+                     completed: List[Tuple[Tuple[str, int, str], str]]):
+        """Repeatedly take the longest-tail batch from the shared queue until it is drained."""
+        while True:
+            next_batch = scheduler.next_batch(self.batch_size)
+            if next_batch is None:
+                return
+            condition, pre_prompt, items = next_batch
+            batch = {'condition': condition, 'pre_prompt': pre_prompt, 'items': items}
+            batches.append(batch)
+
+            completed.extend(await self.generate_batch(batch))
+            scheduler.record(condition, batch['service_s'] / len(items))
+
+    async def run(self) -> Dict[Tuple[str, int], Dict[str, str]]:
+        """Generate all responses concurrently and group them per response file."""
+        work_items = self.build_work_items()
+        if self.log:
+            already_done = self.log.completed()
+            work_items = [item for item in work_items if item not in already_done]
+            if already_done:
+                print(f"Resuming from {self.log.log_path.name}: {len(already_done)} responses already logged")
+
+        print(f"Generating {len(work_items)} responses "
+              f"({len(self.conditions)} conditions x {len(self.agent_ids)} agents x {len(self.queries)} queries) "
+              f"on backend '{self.client.backend}' with concurrency {self.max_concurrency}")
+
+        cached = []
+        if self.cache and self.reuse_cache:
+            cached = self.take_cached(work_items)
+            cached_items = {item for item, _ in cached}
+            work_items = [item for item in work_items if item not in cached_items]
+            print(f"Reused {len(cached)} responses from cache ({self.cache.cache_dir})")
+
+        scheduler = self.build_scheduler(work_items)
+        # Streams of one batch run side by side, so requests rather than workers are what is bounded
+        self.in_flight = asyncio.Semaphore(self.max_concurrency)
+        batches = []
+        generated = []
+        start = time.monotonic()
+        await asyncio.gather(*(self.worker(scheduler, batches, generated) for _ in range(self.max_concurrency)))
+        completed = cached + generated
+        print(f"Generated {len(generated)} responses in {len(batches)} batches in {time.monotonic() - start:.1f}s")
+        self.prefix_savings = self.calculate_prefix_savings(batches)
+        self.latency_estimates = {condition: round(scheduler.estimate(condition), 4) for condition in self.conditions}
+        if self.cache:
+            evicted = self.cache.evict()
+            if evicted:
+                print(f"Evicted {evicted} least-recently-used cache entries")
+
+        print("\nPrefix reuse (estimated input tokens):")
+        for condition, stats in self.prefix_savings.items():
+            print(f"  {condition}: {stats['input_tokens_batched']} vs {stats['input_tokens_unbatched']} unbatched "
+                  f"({stats['tokens_saved']} saved, {stats['savings_pct']:.1f}%)")
+
+        if self.log:
+            return self.log.compact()
+
+        grouped = {}
+        for (condition, agent_id, query_id), text in completed:
+            grouped.setdefault((condition, agent_id), {})[query_id] = text
+        return grouped
+
+    def response_filename(self, condition: str, agent_id: int) -> str:
+        """Name of the response file for one (condition, agent)."""
+        return f"{condition}_responses_agent_{agent_id}.json"
+
+    def existing_response_files(self) -> List[str]:
+        """Response files this run would write that already exist in the output directory."""
+        return [self.response_filename(condition, agent_id)
+                for condition in self.conditions for agent_id in self.agent_ids
+                if (self.responses_path / self.response_filename(condition, agent_id)).exists()]
+
+    def write_response_files(self, grouped: Dict[Tuple[str, int], Dict[str, str]],
+                             overwrite: bool = False) -> List[str]:
+        """Write one {"query_N": "..."} file per (condition, agent), in query order.
+        Existing files are only replaced with overwrite, so a dry run cannot clobber real responses."""
+        if not overwrite:
+            existing = [self.response_filename(condition, agent_id) for condition, agent_id in grouped
+                        if (self.responses_path / self.response_filename(condition, agent_id)).exists()]
+            if existing:
+                raise FileExistsError(f"{len(existing)} response files already exist in {self.responses_path} "
+                                      f"(e.g. {existing[0]}); pass overwrite=True to replace them")
+        self.responses_path.mkdir(parents=True, exist_ok=True)
+        written = []
+        for (condition, agent_id), responses in grouped.items():
+            filename = self.response_filename(condition, agent_id)
+            ordered = {query_id: responses[query_id] for query_id in self.queries if query_id in responses}
+            with open(self.responses_path / filename, 'w') as f:
+                json.dump(ordered, f, indent=2)
+            written.append(filename)
+        return written
+
+
+def build_client(args: argparse.Namespace) -> ModelClient:
+    """Create the model client selected on the command line."""
+    sampling = {'temperature': args.temperature, 'max_tokens': args.max_tokens}
+    if args.backend == 'http':
+        return HTTPModelClient(args.endpoint, args.model, args.requests_per_minute, sampling)
+    return StubModelClient(args.model, args.requests_per_minute, sampling)
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Generate persona experiment responses concurrently")
+    parser.add_argument('--base-path', default=str(Path(__file__).resolve().parent))
+    parser.add_argument('--agents', type=int, nargs='+', default=list(range(1, 8)))
+    parser.add_argument('--conditions', nargs='+', default=CONDITIONS, choices=CONDITIONS)
+    parser.add_argument('--backend', choices=['stub', 'http'], default='stub')
+    parser.add_argument('--endpoint', default='http://127.0.0.1:8765/generate')
+    parser.add_argument('--model', default='stub')
+    parser.add_argument('--temperature', type=float, default=1.0)
+    parser.add_argument('--max-tokens', type=int, default=1024)
+    parser.add_argument('--max-concurrency', type=int, default=16)
+    parser.add_argument('--requests-per-minute', type=float, default=None)
+    parser.add_argument('--batch-size', type=int, default=12,
+                        help="max requests per shared-prefix batch (1 disables batching)")
+    parser.add_argument('--seed', type=int, default=0, help="base sampling seed; agent N samples with seed + N")
+    parser.add_argument('--reuse-cache', action='store_true',
+                        help="reuse cached responses whose pre-prompt, query, model and sampling params match")
+    parser.add_argument('--cache-dir', default=None, help="response cache location (default: response_cache/)")
+    parser.add_argument('--cache-max-mb', type=float, default=512)
+    parser.add_argument('--stream', action='store_true',
+                        help="consume streaming output and record time-to-first-token and tokens/sec")
+    parser.add_argument('--resume', action='store_true',
+                        help="append each response to a write-ahead log and skip already-logged triples")
+    parser.add_argument('--log-path', default=None,
+                        help="write-ahead log location (default: responses/generation_log.jsonl)")
+    parser.add_argument('--skip-decided', action='store_true',
+                        help="skip test conditions an adaptive/sequential pairwise run in results/ already decided")
+    parser.add_argument('--output-dir', default=None, help="where response files are written (default: responses/)")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="replace response files that already exist in the output directory")
+    args = parser.parse_args()
+
+    conditions = args.conditions
+    if args.skip_decided:
+        decided = decided_conditions(str(Path(args.base_path) / "results"))
+        for condition, decision in decided.items():
+            if condition in conditions and condition != 'control':
+                print(f"Skipping {condition}: already decided ({decision})")
+        conditions = [condition for condition in conditions if condition == 'control' or condition not in decided]
+
+    log = None
+    if args.resume:
+        log = GenerationLog(args.log_path or str(Path(args.base_path) / "responses" / "generation_log.jsonl"))
+
+    cache = ResponseCache(args.cache_dir or str(Path(args.base_path) / "response_cache"),
+                          int(args.cache_max_mb * 1024 * 1024))
+
+    generator = ResponseGenerator(args.base_path, build_client(args), args.agents,
+                                  conditions, args.max_concurrency, log, args.batch_size,
+                                  cache, args.reuse_cache, args.seed, args.stream, args.output_dir)
+    existing = generator.existing_response_files()
+    if existing and not args.overwrite:
+        parser.error(f"{len(existing)} response files already exist in {generator.responses_path} "
+                     f"(e.g. {existing[0]}); choose another --output-dir or pass --overwrite")
+    grouped = asyncio.run(generator.run())
+    written = generator.write_response_files(grouped, overwrite=args.overwrite)
+
+    report_file = Path(args.base_path) / "generation_report.json"
+    with open(report_file, 'w') as f:
+        json.dump({'backend': generator.client.backend, 'model': generator.client.model,
+                   'prefix_savings': generator.prefix_savings,
+                   'seconds_per_response': generator.latency_estimates,
+                   'streaming_metrics': generator.summarize_stream_metrics()}, f, indent=2)
+
+    print(f"\nWrote {len(written)} response files to: {generator.responses_path}")
+    print(f"Generation report saved to: {report_file}")
+    print("\nResponse generation completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
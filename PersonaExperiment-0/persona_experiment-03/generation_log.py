@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Write-Ahead Log for Persona Experiment 03 Response Generation
+Appends every finished (condition, agent, query) response as one JSON line so an interrupted
+generation run can be resumed, then compacts the log into the {"query_N": "..."} file layout.
+Streaming runs also append partial-output chunk records; only finished responses count as complete.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Set, Tuple, Any
+
+WorkItem = Tuple[str, int, str]
+
+
+class GenerationLog:
+    def __init__(self, log_path: str):
+        """Open (or create) the append-only log at log_path."""
+        self.log_path = Path(log_path)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Terminate a torn trailing line so the next append starts on a fresh line
+        if self.log_path.exists() and self.log_path.stat().st_size > 0:
+            with open(self.log_path, 'rb+') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+
+    def read_records(self) -> Dict[WorkItem, Dict[str, Any]]:
+        """Read all complete records, keeping the last one per (condition, agent, query)."""
+        records = {}
+        if not self.log_path.exists():
+            return records
+
+        with open(self.log_path, 'r') as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write leaves at most one torn trailing line; skip it
+                    print(f"WARNING: skipping unreadable log line {line_number} in {self.log_path.name}")
+                    continue
+                if record.get('type') == 'chunk':
+                    continue
+                key = (record['condition'], int(record['agent_id']), record['query_id'])
+                records[key] = record
+        return records
+
+    def completed(self) -> Set[WorkItem]:
+        """Return the set of triples that already have a logged response."""
+        return set(self.read_records().keys())
+
+    def append(self, item: WorkItem, text: str, **metadata: Any):
+        """Durably append one finished response to the log."""
+        condition, agent_id, query_id = item
+        record = {'condition': condition, 'agent_id': agent_id, 'query_id': query_id, 'text': text, **metadata}
+        with open(self.log_path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append_chunk(self, item: WorkItem, sequence: int, delta: str):
+        """Append one streamed chunk of a response that is still being generated.
+        Chunks are flushed but not fsynced; the final append() is the durable commit point."""
+        condition, agent_id, query_id = item
+        record = {'type': 'chunk', 'condition': condition, 'agent_id': agent_id,
+                  'query_id': query_id, 'seq': sequence, 'delta': delta}
+        with open(self.log_path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+
+    def compact(self) -> Dict[Tuple[str, int], Dict[str, str]]:
+        """Fold the log into per-file {query_id: text} dicts and rewrite it without duplicates
+        or stream chunks."""
+        records = self.read_records()
+
+        grouped = {}
+        for (condition, agent_id, query_id), record in records.items():
+            grouped.setdefault((condition, agent_id), {})[query_id] = record['text']
+
+        temp_path = self.log_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            for record in records.values():
+                f.write(json.dumps(record) + '\n')
+        os.replace(temp_path, self.log_path)
+
+        return grouped
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Parallel Judge Executor for Persona Experiment 03 Evaluations
+Issues judge calls concurrently under an in-flight limit and retries failed calls with exponential
+backoff. A/B positions are planned up front from the seed, and results come back in plan order, so
+a run is deterministic no matter which calls complete first.
+"""
+
+import asyncio
+import inspect
+import random
+from typing import Dict, List, Any, Callable, Optional, Tuple, Type
+
+from judge_parser import MalformedJudgmentError
+
+# Errors that repeat on every attempt: an unreadable reply has already had its repair prompts
+NON_RETRYABLE = (MalformedJudgmentError,)
+
+
+def plan_pairwise_comparisons(test_files: List[str], control_files: List[str],
+                              query_ids: Dict[str, List[str]], seed: Any = 42) -> List[Dict[str, Any]]:
+    """Enumerate every (test file, control file, query) judgment and fix its A/B assignment.
+    Assignments are drawn in enumeration order from a dedicated RNG, never in completion order."""
+    rng = random.Random(seed)
+    plan = []
+    for test_file in test_files:
+        for control_file in control_files:
+            for query_id in query_ids[test_file]:
+                plan.append({
+                    'test_file': test_file,
+                    'control_file': control_file,
+                    'query_id': query_id,
+                    'a_is_test': rng.choice([True, False])
+                })
+    return plan
+
+
+def winner_from_overall(overall_winner: str, a_is_test: bool) -> str:
+    """Map an A/B/Tie verdict back to test/control/tie."""
+    if overall_winner == 'Tie':
+        return 'tie'
+    return 'test' if (overall_winner == 'A') == a_is_test else 'control'
+
+
+class JudgeExecutor:
+    def __init__(self, max_in_flight: int = 8, max_retries: int = 4, base_delay: float = 1.0,
+                 max_delay: float = 30.0, retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+                 seed: Optional[int] = None, no_retry_on: Tuple[Type[BaseException], ...] = NON_RETRYABLE):
+        """Initialize with an in-flight limit and a retry policy (delays in seconds);
+        no_retry_on errors are raised at once even if they match retry_on."""
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self.no_retry_on = no_retry_on
+        self.jitter = random.Random(seed)
+        self.stats = {'calls': 0, 'retries': 0, 'failures': 0}
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given retry attempt (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return self.jitter.uniform(0, ceiling)
+
+    async def call(self, judge_fn: Callable[..., Any], *args: Any) -> Any:
+        """Call judge_fn (sync or async), retrying retryable errors with backoff.
+        A sync judge_fn runs in a worker thread so that blocking calls do not stall the event loop."""
+        attempt = 0
+        while True:
+            self.stats['calls'] += 1
+            try:
+                if inspect.iscoroutinefunction(judge_fn):
+                    result = await judge_fn(*args)
+                else:
+                    result = await asyncio.to_thread(judge_fn, *args)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            except self.retry_on as e:
+                if isinstance(e, self.no_retry_on):
+                    self.stats['failures'] += 1
+                    raise
+                attempt += 1
+                if attempt > self.max_retries:
+                    self.stats['failures'] += 1
+                    raise
+                self.stats['retries'] += 1
+                delay = self.backoff_delay(attempt)
+                print(f"  Judge call failed ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def map(self, judge_fn: Callable[..., Any], jobs: List[Tuple[Any, ...]]) -> List[Any]:
+        """Run judge_fn(*job) for every job with at most max_in_flight calls outstanding.
+        Results are returned in job order."""
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async def run_job(job: Tuple[Any, ...]) -> Any:
+            async with semaphore:
+                return await self.call(judge_fn, *job)
+
+        return await asyncio.gather(*(run_job(job) for job in jobs))
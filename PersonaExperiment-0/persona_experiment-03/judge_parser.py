@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Judge Output Parser for Persona Experiment Evaluations
+Parses judge replies in the evaluator_prompts.md formats ("Helpfulness: [A/B/Tie] - [explanation]",
+"Overall Winner: [A/B/Tie]" and "Helpfulness: [1-5] - [explanation]") in a single pass with
+precompiled patterns. Common deviations (markdown, bullets, "Response A", "4/5") are recovered;
+anything else is reported as malformed so that only the unreadable criteria are asked for again.
+Batched replies are split into their "### Item N" sections and each section is parsed the same way.
+A judgment that stays unreadable after its repairs is recorded as unparsed instead of failing the run.
+"""
+
+import asyncio
+import re
+from typing import Dict, List, Any, Optional
+
+CRITERIA = ['helpfulness', 'appropriateness', 'completeness', 'actionability', 'overall']
+
+CRITERION_LABELS = {
+    'helpfulness': 'Helpfulness',
+    'appropriateness': 'Appropriateness',
+    'completeness': 'Completeness',
+    'actionability': 'Actionability',
+    'overall': 'Overall'
+}
+
+VALUE_FORMATS = {
+    'pairwise': '[A/B/Tie]',
+    'absolute': '[1-5]'
+}
+
+# "<label>[ (1-5)]: <rest>", allowing bullets, numbering, headings and markdown emphasis around the label
+LINE_PATTERN = re.compile(
+    r'^[ \t>#*\-\d.)]*[*_ \t]*'
+    r'(?P<label>helpfulness|appropriateness|completeness|actionability|'
+    r'overall[ \t]+winner|overall(?:[ \t]+quality)?)'
+    r'[*_ \t]*(?:\([^)]*\))?[*_ \t]*[:=][*_ \t]*(?P<rest>.*)$',
+    re.IGNORECASE
+)
+
+PAIRWISE_VALUE_PATTERN = re.compile(
+    r'^[\[(*_ \t]*(?:response[ \t]+)?(?P<value>a|b|tie|tied|draw|equal)\b[\])*_ \t]*'
+    r'(?:[-–—:,.;][ \t]*)?(?P<explanation>.*)$',
+    re.IGNORECASE
+)
+
+ABSOLUTE_VALUE_PATTERN = re.compile(
+    r'^[\[(*_ \t]*(?P<value>\d+(?:\.\d+)?)(?:[ \t]*(?:/|out[ \t]+of)[ \t]*5)?[\])*_ \t]*'
+    r'(?:[-–—:,.;][ \t]*)?(?P<explanation>.*)$',
+    re.IGNORECASE
+)
+
+# "### Item 3" style headers that open each per-item section of a batched reply
+ITEM_HEADER_PATTERN = re.compile(r'^[ \t#*_]*item[ \t]*#?(?P<number>\d+)[ \t*_:.)]*$', re.IGNORECASE | re.MULTILINE)
+
+REPAIR_PROMPT = """{original_prompt}
+
+Your previous answer could not be read for: {labels}.
+Reply with only these lines, in exactly this format:
+{format_lines}"""
+
+
+class MalformedJudgmentError(ValueError):
+    """Raised when a judgment still has unreadable criteria after all repair attempts.
+    Sending the same prompt again does not help, so executors must not retry it."""
+
+    def __init__(self, message: str, criteria: Optional[List[str]] = None,
+                 partial: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.criteria = criteria or []
+        self.partial = partial or {}
+
+
+def unparsed_judgment(error: MalformedJudgmentError) -> Dict[str, Any]:
+    """The evaluation recorded for an item whose judgment could not be read."""
+    return {'unparsed': True, 'error': str(error), 'unparsed_criteria': error.criteria,
+            'partial_evaluation': error.partial}
+
+
+def is_unparsed(evaluation: Dict[str, Any]) -> bool:
+    """True for an evaluation recorded by unparsed_judgment."""
+    return bool(evaluation.get('unparsed'))
+
+
+def normalize_label(label: str) -> str:
+    """Map a matched label onto a criterion name or 'overall_winner'."""
+    label = ' '.join(label.lower().split())
+    if label == 'overall winner':
+        return 'overall_winner'
+    if label.startswith('overall'):
+        return 'overall'
+    return label
+
+
+def parse_value(rest: str, mode: str) -> Dict[str, Any]:
+    """Parse the text after a label; returns {'value', 'explanation'} or {'error'}."""
+    if mode == 'pairwise':
+        match = PAIRWISE_VALUE_PATTERN.match(rest)
+        if not match:
+            return {'error': 'expected A, B or Tie'}
+        value = match.group('value').lower()
+        value = 'Tie' if value in ('tie', 'tied', 'draw', 'equal') else value.upper()
+        return {'value': value, 'explanation': match.group('explanation').strip()}
+
+    match = ABSOLUTE_VALUE_PATTERN.match(rest)
+    if not match:
+        return {'error': 'expected a 1-5 score'}
+    score = float(match.group('value'))
+    if not 1 <= score <= 5:
+        return {'error': f"score {match.group('value')} outside 1-5"}
+    return {'value': int(score + 0.5), 'explanation': match.group('explanation').strip(),
+            'recovered': score != int(score)}
+
+
+def parse_judgment(text: str, mode: str) -> Dict[str, Any]:
+    """
+    Parse one judge reply in a single pass over its lines.
+    Returns {'evaluation': {criterion: {...}}, 'overall_winner', 'missing', 'malformed', 'recovered'}.
+    Lines that do not start a criterion are appended to the previous criterion's explanation.
+    """
+    value_key = 'choice' if mode == 'pairwise' else 'score'
+    evaluation = {}
+    overall_winner = None
+    malformed = {}
+    recovered = []
+    current = None
+
+    for line in text.splitlines():
+        match = LINE_PATTERN.match(line)
+        if not match:
+            if current is not None and line.strip():
+                entry = evaluation[current]
+                entry['explanation'] = f"{entry['explanation']} {line.strip()}".strip()
+            continue
+
+        criterion = normalize_label(match.group('label'))
+        current = None
+        if criterion == 'overall_winner':
+            if mode == 'pairwise':
+                parsed = parse_value(match.group('rest'), 'pairwise')
+                overall_winner = parsed.get('value')
+            continue
+        if criterion in evaluation:
+            # Judges occasionally restate a criterion in a summary; the first answer counts
+            continue
+
+        parsed = parse_value(match.group('rest'), mode)
+        if 'error' in parsed:
+            malformed[criterion] = {'line': line.strip(), 'reason': parsed['error']}
+            continue
+        malformed.pop(criterion, None)
+        evaluation[criterion] = {value_key: parsed['value'], 'explanation': parsed['explanation']}
+        if parsed.get('recovered'):
+            recovered.append(criterion)
+        current = criterion
+
+    return {
+        'evaluation': evaluation,
+        'overall_winner': overall_winner,
+        'missing': [criterion for criterion in CRITERIA if criterion not in evaluation and criterion not in malformed],
+        'malformed': [{'criterion': criterion, **details} for criterion, details in malformed.items()],
+        'recovered': recovered
+    }
+
+
+def split_item_sections(text: str) -> Dict[int, str]:
+    """Split a batched reply into {item number: section text}; the first section per number wins."""
+    headers = list(ITEM_HEADER_PATTERN.finditer(text))
+    sections = {}
+    for index, header in enumerate(headers):
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(text)
+        sections.setdefault(int(header.group('number')), text[header.end():end])
+    return sections
+
+
+def unparsed_criteria(parsed: Dict[str, Any]) -> List[str]:
+    """Criteria that still need an answer, in CRITERIA order."""
+    return [criterion for criterion in CRITERIA if criterion not in parsed['evaluation']]
+
+
+def build_repair_prompt(original_prompt: str, mode: str, criteria: List[str]) -> str:
+    """Ask the judge again for only the given criteria."""
+    return REPAIR_PROMPT.format(
+        original_prompt=original_prompt,
+        labels=', '.join(CRITERION_LABELS[criterion] for criterion in criteria),
+        format_lines='\n'.join(f"{CRITERION_LABELS[criterion]}: {VALUE_FORMATS[mode]} - [explanation]"
+                               for criterion in criteria)
+    )
+
+
+def merge_repair(parsed: Dict[str, Any], repair: Dict[str, Any], criteria: List[str]):
+    """Fill the requested criteria from a repair reply; other criteria are left untouched."""
+    for criterion in criteria:
+        if criterion in repair['evaluation']:
+            parsed['evaluation'][criterion] = repair['evaluation'][criterion]
+    parsed['recovered'].extend(criterion for criterion in repair['recovered'] if criterion in criteria)
+    if parsed['overall_winner'] is None:
+        parsed['overall_winner'] = repair['overall_winner']
+
+
+class TextJudge:
+    """
+    Judge backend for models that reply in free text. Sends the evaluator prompt through a
+    generate_responses.ModelClient, parses the reply and re-prompts only for unreadable criteria.
+    """
+
+    backend = 'text'
+
+    def __init__(self, client: Any, seed: Optional[int] = None, max_repairs: int = 1):
+        self.client = client
+        self.seed = seed
+        self.max_repairs = max_repairs
+        self.stats = {'judgments': 0, 'repair_prompts': 0, 'repaired_criteria': 0,
+                      'recovered_values': 0, 'failed_judgments': 0,
+                      'batch_calls': 0, 'batched_items': 0, 'batch_fallbacks': 0}
+        self.malformed_reports = []
+
+    async def judge(self, prompt: str, mode: str) -> Dict[str, Any]:
+        """Return {criterion: {choice|score, explanation}} for one prompt."""
+        self.stats['judgments'] += 1
+        text = await self.client.generate('', prompt, self.seed)
+        return await self.complete(parse_judgment(text, mode), prompt, mode)
+
+    async def complete(self, parsed: Dict[str, Any], prompt: str, mode: str) -> Dict[str, Any]:
+        """Re-prompt for any unreadable criteria of a parsed reply to prompt, then return its evaluation
+        (with the parsed "Overall Winner" verdict, when there is one, as 'overall_winner')."""
+        if parsed['malformed'] or parsed['missing']:
+            self.malformed_reports.append({'mode': mode, 'missing': parsed['missing'],
+                                           'malformed': parsed['malformed']})
+
+        for _ in range(self.max_repairs):
+            pending = unparsed_criteria(parsed)
+            if not pending:
+                break
+            self.stats['repair_prompts'] += 1
+            repair_text = await self.client.generate('', build_repair_prompt(prompt, mode, pending), self.seed)
+            merge_repair(parsed, parse_judgment(repair_text, mode), pending)
+            self.stats['repaired_criteria'] += len(pending) - len(unparsed_criteria(parsed))
+
+        self.stats['recovered_values'] += len(parsed['recovered'])
+        pending = unparsed_criteria(parsed)
+        if pending:
+            self.stats['failed_judgments'] += 1
+            raise MalformedJudgmentError(f"unreadable {mode} judgment for: {', '.join(pending)}",
+                                         pending, parsed['evaluation'])
+        if mode == 'pairwise' and parsed['overall_winner'] is not None:
+            # The judge's own verdict; the engine falls back to the criteria majority only without one
+            return {**parsed['evaluation'], 'overall_winner': parsed['overall_winner']}
+        return parsed['evaluation']
+
+    async def judge_batch(self, batch_prompt: str, item_prompts: List[str], mode: str) -> List[Dict[str, Any]]:
+        """
+        Judge several items with one call to a prompt that asks for a "### Item N" section per item.
+        Items with a missing section are judged again on their own; items with unreadable criteria
+        are repaired against their single-item prompt, and items still unreadable after that are
+        returned as unparsed_judgment records so the rest of the batch is kept.
+        """
+        self.stats['batch_calls'] += 1
+        self.stats['batched_items'] += len(item_prompts)
+        sections = split_item_sections(await self.client.generate('', batch_prompt, self.seed))
+
+        async def finish(number: int, item_prompt: str) -> Dict[str, Any]:
+            try:
+                if number not in sections:
+                    self.stats['batch_fallbacks'] += 1
+                    return await self.judge(item_prompt, mode)
+                self.stats['judgments'] += 1
+                return await self.complete(parse_judgment(sections[number], mode), item_prompt, mode)
+            except MalformedJudgmentError as e:
+                return unparsed_judgment(e)
+
+        return list(await asyncio.gather(*(finish(number, item_prompt)
+                                           for number, item_prompt in enumerate(item_prompts, start=1))))
+
+    async def judge_pair(self, prompt: str) -> Dict[str, Any]:
+        """Pairwise judgment for a PAIRWISE_PROMPT."""
+        return await self.judge(prompt, 'pairwise')
+
+    async def judge_absolute(self, prompt: str, condition: str) -> Dict[str, Any]:
+        """Absolute judgment for an ABSOLUTE_PROMPT; the condition is never shown to the judge."""
+        return await self.judge(prompt, 'absolute')
+
+    def parse_report(self) -> Dict[str, Any]:
+        """Counters plus the malformed outputs seen so far."""
+        return {**self.stats, 'malformed_outputs': self.malformed_reports}
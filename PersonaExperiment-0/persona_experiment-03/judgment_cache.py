@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Persistent Judgment Cache for Persona Experiment Evaluations
+Stores judge verdicts on disk keyed by a hash of (judge, rater, prompt template, query, ordered
+responses), so reruns, re-analysis and seed sweeps only pay for judgments that were never made. The
+rater is the evaluator (and its seed) a verdict belongs to, so panel members sharing one judge model
+never reuse each other's verdicts. Every pairwise entry is also indexed under its unordered response
+pair, which records which A/B orderings have been judged and lets position-bias studies find both
+orderings of the same comparison.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from response_cache import ResponseCache
+
+
+def hash_text(text: str) -> str:
+    """Stable hex digest of a text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def swap_evaluation(evaluation: Dict[str, Any]) -> Dict[str, Any]:
+    """Mirror a pairwise evaluation so that A and B trade places."""
+    mirror = {'A': 'B', 'B': 'A'}
+    swapped = {}
+    for key, value in evaluation.items():
+        if isinstance(value, dict) and 'choice' in value:
+            swapped[key] = {**value, 'choice': mirror.get(value['choice'], value['choice'])}
+        elif key == 'overall_winner':
+            swapped[key] = mirror.get(value, value)
+        else:
+            swapped[key] = value
+    return swapped
+
+
+class JudgmentCache(ResponseCache):
+    def __init__(self, cache_dir: str, judge: str, max_bytes: Optional[int] = 512 * 1024 * 1024,
+                 reuse_swapped: bool = False):
+        """
+        Open (or create) a judgment cache for one judge identity (e.g. "http:judge-model").
+        With reuse_swapped, a miss on (A, B) is answered from a cached (B, A) judgment mirrored back;
+        that assumes the judge has no position bias, so it is off by default.
+        """
+        super().__init__(cache_dir, max_bytes)
+        self.judge = judge
+        self.reuse_swapped = reuse_swapped
+        self.pairs_dir = self.cache_dir / "pairs"
+        self.swapped_hits = 0
+
+    def make_key(self, template: str, query: str, responses: Tuple[str, ...], rater: str = '') -> str:
+        """Hash the judge, rater, template, query and ordered response texts into a stable hex key."""
+        material = json.dumps({
+            'judge': self.judge,
+            'rater': rater,
+            'template': hash_text(template),
+            'query': query,
+            'responses': [hash_text(response) for response in responses]
+        }, sort_keys=True)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def pair_key(self, template: str, query: str, response_a: str, response_b: str, rater: str = '') -> str:
+        """Key shared by both orderings of the same pairwise comparison."""
+        return self.make_key(template, query, tuple(sorted((response_a, response_b))), rater)
+
+    def pair_path(self, pair_key: str) -> Path:
+        """Pair index entries live outside the */*.json entry layout; evict() prunes them once their judgments are gone."""
+        return self.pairs_dir / pair_key[:2] / f"{pair_key}.json"
+
+    def get_judgment(self, template: str, query: str, responses: Tuple[str, ...],
+                     rater: str = '') -> Optional[Dict[str, Any]]:
+        """This rater's cached evaluation for exactly this ordering (or its mirror when reuse_swapped), else None."""
+        entry = self.get(self.make_key(template, query, responses, rater))
+        if entry is not None:
+            return json.loads(entry)
+        if self.reuse_swapped and len(responses) == 2:
+            mirrored = self.get(self.make_key(template, query, (responses[1], responses[0]), rater))
+            # One lookup counts one outcome, so drop the miss of one of the two probes
+            self.misses -= 1
+            if mirrored is not None:
+                self.swapped_hits += 1
+                return swap_evaluation(json.loads(mirrored))
+        return None
+
+    def put_judgment(self, template: str, query: str, responses: Tuple[str, ...], evaluation: Dict[str, Any],
+                     rater: str = ''):
+        """Store a rater's evaluation and, for pairwise judgments, index it under its unordered pair."""
+        key = self.make_key(template, query, responses, rater)
+        self.put(key, json.dumps(evaluation), judge=self.judge, rater=rater)
+        if len(responses) != 2:
+            return
+
+        response_a, response_b = responses
+        path = self.pair_path(self.pair_key(template, query, response_a, response_b, rater))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(path, 'r') as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = {'orderings': {}}
+        # 'AB' when response_a sorts first, 'BA' when the judged order is the reverse
+        ordering = 'AB' if response_a <= response_b else 'BA'
+        index['orderings'][ordering] = key
+        self.write_pair_index(path, index)
+
+    def write_pair_index(self, path: Path, index: Dict[str, Any]):
+        """Atomically replace one pair index entry."""
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(index, f)
+        os.replace(temp_path, path)
+
+    def evict(self) -> int:
+        """Evict least-recently-used judgments, then prune pair index entries left pointing at evicted ones."""
+        removed = super().evict()
+        self.prune_pairs()
+        return removed
+
+    def prune_pairs(self) -> int:
+        """Drop index orderings whose judgment is gone, and index entries with none left; return the entries removed."""
+        removed = 0
+        for path in self.pairs_dir.glob('*/*.json'):
+            try:
+                with open(path, 'r') as f:
+                    index = json.load(f)
+            except json.JSONDecodeError:
+                path.unlink()
+                removed += 1
+                continue
+            live = {ordering: key for ordering, key in index['orderings'].items() if self.entry_path(key).exists()}
+            if not live:
+                path.unlink()
+                removed += 1
+            elif live != index['orderings']:
+                self.write_pair_index(path, {**index, 'orderings': live})
+        return removed
+
+    def orderings(self, template: str, query: str, response_a: str, response_b: str,
+                  rater: str = '') -> Dict[str, Dict[str, Any]]:
+        """A rater's cached judgments of this comparison as {'as_given': ..., 'swapped': ...}, in the caller's A/B frame."""
+        path = self.pair_path(self.pair_key(template, query, response_a, response_b, rater))
+        try:
+            with open(path, 'r') as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        given = 'AB' if response_a <= response_b else 'BA'
+        found = {}
+        for ordering, key in index['orderings'].items():
+            entry = self.get(key)
+            if entry is None:
+                continue
+            evaluation = json.loads(entry)
+            found['as_given' if ordering == given else 'swapped'] = evaluation
+        return found
+
+    def position_pairs(self) -> List[Dict[str, str]]:
+        """Index entries whose comparison has been judged in both orderings (for position-bias studies)."""
+        pairs = []
+        for path in sorted(self.pairs_dir.glob('*/*.json')):
+            with open(path, 'r') as f:
+                orderings = json.load(f)['orderings']
+            if 'AB' in orderings and 'BA' in orderings and all(self.entry_path(key).exists() for key in orderings.values()):
+                pairs.append(orderings)
+        return pairs
+
+    def summary(self) -> Dict[str, int]:
+        """Hit/miss counters for reporting."""
+        return {'hits': self.hits, 'misses': self.misses, 'swapped_hits': self.swapped_hits}
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Query Registry for Persona Experiment 03
+Loads experiment_queries.json once per run, validates it, interns the query texts and attaches the
+query categories used by role assignment and analysis. Generators, evaluators and analyzers share
+one instance instead of reopening the queries file for every lookup.
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+QUERY_ID_PATTERN = re.compile(r'^query_(\d+)$')
+
+# Query categories used for role assignment (Test 1) and per-category analysis
+QUERY_CATEGORIES = {
+    'query_1': 'factual',      # GitHub Copilot cost
+    'query_2': 'factual',      # OpenAI news
+    'query_3': 'technical',    # CAP theorem
+    'query_4': 'technical',    # OAuth implementation
+    'query_5': 'advisory',     # React vs Vue
+    'query_6': 'advisory',     # Salary negotiation
+    'query_7': 'guidance',     # ML learning
+    'query_8': 'technical',    # Debug performance
+    'query_9': 'advisory',     # Convince CEO
+    'query_10': 'factual',     # Blockchain
+    'query_11': 'advisory',    # Team productivity
+    'query_12': 'factual'      # Python
+}
+
+
+class QueryRegistry:
+    _instances = {}
+
+    def __init__(self, queries_path: str, categories: Optional[Dict[str, str]] = None):
+        """Load and validate the queries file; categories default to QUERY_CATEGORIES."""
+        self.queries_path = Path(queries_path)
+        with open(self.queries_path, 'r') as f:
+            raw_queries = json.load(f)
+
+        if not isinstance(raw_queries, dict) or not raw_queries:
+            raise ValueError(f"{self.queries_path.name} must be a non-empty object of query_id -> text")
+
+        self.texts = {}
+        for query_id, text in raw_queries.items():
+            if not QUERY_ID_PATTERN.match(query_id):
+                raise ValueError(f"Invalid query id in {self.queries_path.name}: {query_id!r}")
+            if not isinstance(text, str) or not text.strip():
+                raise ValueError(f"Query {query_id} in {self.queries_path.name} has no text")
+            self.texts[sys.intern(query_id)] = sys.intern(text)
+
+        categories = QUERY_CATEGORIES if categories is None else categories
+        self.categories = {query_id: categories.get(query_id, 'unknown') for query_id in self.texts}
+
+        uncategorized = [query_id for query_id, category in self.categories.items() if category == 'unknown']
+        if uncategorized:
+            print(f"WARNING: no category for {', '.join(uncategorized)}")
+
+    @classmethod
+    def load(cls, base_path: str) -> 'QueryRegistry':
+        """Return the shared registry for base_path/experiment_queries.json, loading it on first use."""
+        key = str((Path(base_path) / "experiment_queries.json").resolve())
+        if key not in cls._instances:
+            cls._instances[key] = cls(key)
+        return cls._instances[key]
+
+    def text(self, query_id: str) -> str:
+        """Original query text, or a placeholder for unknown ids."""
+        return self.texts.get(query_id, f"Unknown query: {query_id}")
+
+    def category(self, query_id: str) -> str:
+        """Category of a query ('unknown' if it has none)."""
+        return self.categories.get(query_id, 'unknown')
+
+    def query_ids(self) -> List[str]:
+        """Query ids in numeric order."""
+        return sorted(self.texts, key=lambda query_id: int(QUERY_ID_PATTERN.match(query_id).group(1)))
+
+    def by_category(self) -> Dict[str, List[str]]:
+        """Query ids grouped by category."""
+        grouped = {}
+        for query_id in self.query_ids():
+            grouped.setdefault(self.categories[query_id], []).append(query_id)
+        return grouped
+
+    def __len__(self) -> int:
+        return len(self.texts)
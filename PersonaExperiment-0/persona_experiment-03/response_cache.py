@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Response Cache for Persona Experiment Generation
+Stores generated responses on disk keyed by a hash of (pre-prompt, query, model, sampling params)
+so reruns can skip generation for inputs that were already answered. Least-recently-used entries
+are evicted once the cache grows past its size budget.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class ResponseCache:
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = 512 * 1024 * 1024):
+        """Open (or create) a cache directory with an optional total size budget."""
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, pre_prompt: str, query: str, model: str, sampling: Dict[str, Any]) -> str:
+        """Hash the exact generation inputs into a stable hex key."""
+        material = json.dumps({
+            'pre_prompt': pre_prompt,
+            'query': query,
+            'model': model,
+            'sampling': sampling
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        """Two-level fan-out keeps directories small for large caches."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text for key, or None on a miss."""
+        path = self.entry_path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        os.utime(path, None)
+        self.hits += 1
+        return entry['text']
+
+    def put(self, key: str, text: str, **metadata: Any):
+        """Atomically store a response under key."""
+        path = self.entry_path(key)
+        path.parent.mkdir(exist_ok=True)
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({'text': text, **metadata}, f)
+        os.replace(temp_path, path)
+
+    def evict(self) -> int:
+        """Delete least-recently-used entries until the cache fits max_bytes; return the count removed."""
+        if self.max_bytes is None:
+            return 0
+
+        entries = []
+        total_bytes = 0
+        for path in self.cache_dir.glob('*/*.json'):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink()
+            total_bytes -= size
+            removed += 1
+        return removed
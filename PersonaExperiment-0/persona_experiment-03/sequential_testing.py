@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Sequential Pairwise Testing for Persona Experiment 03
+Drop-in alternatives to AdaptiveStopper that keep the type I error of the condition-vs-control win-rate
+test (ties excluded, as in PersonaExperiment03Analyzer.calculate_pairwise_statistics) at alpha however
+often the results are looked at. AlphaSpendingStopper spends alpha over the planned judgments with the
+O'Brien-Fleming-type spending function and computes each look's boundary exactly from the Binomial(n, 1/2)
+null, carried forward from look to look; SPRTStopper runs Wald's SPRT against a win rate of 0.5 +/- effect
+in both directions. Decisions are stored with each condition's pairwise results, so later generation
+runs can skip conditions that are already decided.
+"""
+
+import json
+import math
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, List, Tuple, Any, Optional
+
+from adaptive_stopping import wilson_interval
+
+
+def obrien_fleming_spending(information: float, alpha: float = 0.05) -> float:
+    """Lan-DeMets O'Brien-Fleming-type spending: alpha spent by information fraction t in (0, 1]."""
+    if information <= 0:
+        return 0.0
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    return min(alpha, 2 * (1 - NormalDist().cdf(z / math.sqrt(min(information, 1.0)))))
+
+
+def advance_null(distribution: List[float], steps: int) -> List[float]:
+    """Carry P(test wins = s, not yet stopped) forward by steps Binomial(1, 1/2) judgments."""
+    for _ in range(steps):
+        distribution = [0.5 * ((distribution[s] if s < len(distribution) else 0.0)
+                               + (distribution[s - 1] if s > 0 else 0.0))
+                        for s in range(len(distribution) + 1)]
+    return distribution
+
+
+class AlphaSpendingStopper:
+    def __init__(self, alpha: float = 0.05, min_decided: int = 8):
+        """Two-sided group-sequential test of win rate = 0.5 with O'Brien-Fleming alpha spending;
+        every decision() on new judgments is a look, and none is taken before min_decided non-tie judgments."""
+        self.alpha = alpha
+        self.min_decided = min_decided
+        self.counts = {}
+        self.planned = {}
+        self.state = {}
+
+    def start(self, condition: str, planned: int):
+        """Begin monitoring a condition whose plan has this many judgments (the full information)."""
+        self.counts[condition] = {'test': 0, 'control': 0, 'tie': 0}
+        self.planned[condition] = planned
+        self.state[condition] = {'distribution': [1.0], 'spent': 0.0, 'looks': [], 'decision': None}
+
+    def record(self, condition: str, winner: str):
+        """Count one judgment outcome ('test', 'control' or 'tie')."""
+        if condition not in self.counts:
+            self.start(condition, 0)
+        self.counts[condition][winner] += 1
+
+    def look(self, condition: str) -> Dict[str, Any]:
+        """
+        Spend alpha up to the current information fraction: the critical distance from n/2 is the smallest
+        one whose not-yet-stopped null mass fits in the alpha left for this look.
+        """
+        counts, state = self.counts[condition], self.state[condition]
+        n = counts['test'] + counts['control']
+        previous = state['looks'][-1]['decided'] if state['looks'] else 0
+        distribution = advance_null(state['distribution'], n - previous)
+
+        # Ties carry no information but are as likely under the null either way, so the judged
+        # fraction of the plan is the information fraction and the last planned judgment spends all alpha
+        planned = self.planned[condition]
+        information = min(1.0, sum(counts.values()) / planned) if planned else 1.0
+        allowed = obrien_fleming_spending(information, self.alpha) - state['spent']
+
+        # Largest distances first; stop before the crossing mass exceeds what may be spent
+        masses = {}
+        for s, value in enumerate(distribution):
+            masses[abs(2 * s - n)] = masses.get(abs(2 * s - n), 0.0) + value
+        critical, crossing = None, 0.0
+        for distance in sorted(masses, reverse=True):
+            mass = masses[distance]
+            if distance == 0 or crossing + mass > allowed * (1 + 1e-12):
+                break
+            critical, crossing = distance, crossing + mass
+
+        if critical is not None:
+            distribution = [0.0 if abs(2 * s - n) >= critical else value for s, value in enumerate(distribution)]
+        state['distribution'] = distribution
+        state['spent'] += crossing
+        look = {
+            'decided': n,
+            'information': round(information, 4),
+            'alpha_spent': state['spent'],
+            'lower_wins': (n - critical) // 2 if critical is not None else None,
+            'upper_wins': (n + critical + 1) // 2 if critical is not None else None
+        }
+        state['looks'].append(look)
+
+        observed = abs(2 * counts['test'] - n)
+        if critical is not None and observed >= critical:
+            state['decision'] = 'test_better' if 2 * counts['test'] > n else 'control_better'
+        return look
+
+    def decision(self, condition: str) -> Optional[str]:
+        """'test_better' or 'control_better' once a boundary is crossed, otherwise None."""
+        if condition not in self.counts:
+            return None
+        counts, state = self.counts[condition], self.state[condition]
+        n = counts['test'] + counts['control']
+        if state['decision'] or n < self.min_decided:
+            return state['decision']
+        if not state['looks'] or state['looks'][-1]['decided'] < n:
+            self.look(condition)
+        return state['decision']
+
+    def report(self, condition: str, judged: int, planned: int) -> Dict[str, Any]:
+        """Stopping summary stored with the condition's results."""
+        counts = self.counts.get(condition, {'test': 0, 'control': 0, 'tie': 0})
+        state = self.state.get(condition, {'spent': 0.0, 'looks': []})
+        lower, upper = wilson_interval(counts['test'], counts['test'] + counts['control'], self.alpha)
+        return {
+            'decision': self.decision(condition) or 'exhausted',
+            'judged': judged,
+            'planned': planned,
+            'saved': planned - judged,
+            'method': 'obrien_fleming',
+            'looks': len(state['looks']),
+            'alpha_spent': round(state['spent'], 6),
+            'boundaries': [{**look, 'alpha_spent': round(look['alpha_spent'], 6)} for look in state['looks']],
+            'win_rate_ci_lower': round(lower, 4),
+            'win_rate_ci_upper': round(upper, 4),
+            'alpha': self.alpha
+        }
+
+
+class SPRTStopper:
+    def __init__(self, alpha: float = 0.05, power: float = 0.8, effect: float = 0.15, min_decided: int = 8):
+        """Two one-sided SPRTs at alpha/2 each: win rate 0.5 vs 0.5 + effect and vs 0.5 - effect."""
+        self.alpha = alpha
+        self.power = power
+        self.effect = effect
+        self.min_decided = min_decided
+        self.counts = {}
+        self.upper_threshold = math.log(power / (alpha / 2))
+        self.lower_threshold = math.log((1 - power) / (1 - alpha / 2))
+
+    def start(self, condition: str, planned: int):
+        """Begin monitoring a condition (the SPRT does not need the planned size)."""
+        self.counts[condition] = {'test': 0, 'control': 0, 'tie': 0}
+
+    def record(self, condition: str, winner: str):
+        """Count one judgment outcome ('test', 'control' or 'tie')."""
+        counts = self.counts.setdefault(condition, {'test': 0, 'control': 0, 'tie': 0})
+        counts[winner] += 1
+
+    def log_likelihood_ratios(self, condition: str) -> Tuple[float, float]:
+        """(test better, control better) log-likelihood ratios against a 0.5 win rate."""
+        counts = self.counts.get(condition, {'test': 0, 'control': 0, 'tie': 0})
+        favoured = math.log(1 + 2 * self.effect)
+        disfavoured = math.log(1 - 2 * self.effect)
+        return (counts['test'] * favoured + counts['control'] * disfavoured,
+                counts['control'] * favoured + counts['test'] * disfavoured)
+
+    def decision(self, condition: str) -> Optional[str]:
+        """'test_better', 'control_better' or 'no_difference' once a threshold is crossed, otherwise None."""
+        counts = self.counts.get(condition, {'test': 0, 'control': 0, 'tie': 0})
+        if counts['test'] + counts['control'] < self.min_decided:
+            return None
+        test_better, control_better = self.log_likelihood_ratios(condition)
+        if test_better >= self.upper_threshold:
+            return 'test_better'
+        if control_better >= self.upper_threshold:
+            return 'control_better'
+        if max(test_better, control_better) <= self.lower_threshold:
+            return 'no_difference'
+        return None
+
+    def report(self, condition: str, judged: int, planned: int) -> Dict[str, Any]:
+        """Stopping summary stored with the condition's results."""
+        counts = self.counts.get(condition, {'test': 0, 'control': 0, 'tie': 0})
+        lower, upper = wilson_interval(counts['test'], counts['test'] + counts['control'], self.alpha)
+        test_better, control_better = self.log_likelihood_ratios(condition)
+        return {
+            'decision': self.decision(condition) or 'exhausted',
+            'judged': judged,
+            'planned': planned,
+            'saved': planned - judged,
+            'method': 'sprt',
+            'log_likelihood_ratio_test_better': round(test_better, 4),
+            'log_likelihood_ratio_control_better': round(control_better, 4),
+            'thresholds': [round(self.lower_threshold, 4), round(self.upper_threshold, 4)],
+            'effect': self.effect,
+            'win_rate_ci_lower': round(lower, 4),
+            'win_rate_ci_upper': round(upper, 4),
+            'alpha': self.alpha
+        }
+
+
+SEQUENTIAL_METHODS = {'obrien_fleming': AlphaSpendingStopper, 'sprt': SPRTStopper}
+
+
+def build_sequential_stopper(method: str = 'obrien_fleming', **options: Any) -> Any:
+    """Create the stopper for a config's 'sequential' entry, e.g. {'method': 'sprt', 'effect': 0.1}."""
+    if method not in SEQUENTIAL_METHODS:
+        raise ValueError(f"Unknown sequential method {method!r}; expected one of {sorted(SEQUENTIAL_METHODS)}")
+    return SEQUENTIAL_METHODS[method](**options)
+
+
+def decided_conditions(results_dir: str) -> Dict[str, str]:
+    """Conditions a saved pairwise evaluator stopped early on, mapped to the decision that stopped them."""
+    decided = {}
+    for file_path in sorted(Path(results_dir).glob("pairwise_evaluator_*_results.json")):
+        with open(file_path, 'r') as f:
+            results = json.load(f).get('results', {})
+        for condition, condition_results in results.items():
+            decision = condition_results.get('stopping', {}).get('decision', 'exhausted')
+            if decision != 'exhausted':
+                decided[condition] = decision
+    return decided
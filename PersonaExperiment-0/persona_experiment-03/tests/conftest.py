@@ -0,0 +1,24 @@
+"""Shared fixtures for the persona experiment 03 tests."""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+EXPERIMENT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(EXPERIMENT_DIR))
+sys.path.insert(0, str(EXPERIMENT_DIR / "analysis"))
+
+EXPERIMENT_FILES = ['experiment_queries.json', 'randomization_key.json']
+EXPERIMENT_DIRS = ['blinded_evaluation', 'responses', 'results']
+
+
+@pytest.fixture
+def experiment(tmp_path: Path) -> Path:
+    """A scratch copy of the committed experiment 03 inputs and results."""
+    for name in EXPERIMENT_FILES:
+        shutil.copy(EXPERIMENT_DIR / name, tmp_path / name)
+    for name in EXPERIMENT_DIRS:
+        shutil.copytree(EXPERIMENT_DIR / name, tmp_path / name)
+    return tmp_path
@@ -0,0 +1,103 @@
+"""Behaviour of the adaptive (Wilson interval) pairwise stopper."""
+
+import asyncio
+
+import pytest
+
+from adaptive_stopping import AdaptiveStopper, judge_until_decided, wilson_interval
+
+CONDITION = 'test_1_hardcoded'
+
+
+def make_plan(size):
+    return [{'test_file': 't.json', 'control_file': 'c.json', 'query_id': f"query_{index}", 'a_is_test': index % 2 == 0}
+            for index in range(size)]
+
+
+def judge_with(outcome):
+    """A judge_round that returns outcome(job) ('test', 'control', 'tie' or 'unparsed') and logs every round."""
+    rounds = []
+
+    async def judge_round(jobs):
+        rounds.append(len(jobs))
+        evaluations = []
+        for job in jobs:
+            winner = outcome(job)
+            if winner == 'unparsed':
+                evaluations.append({'unparsed': True})
+            elif winner == 'tie':
+                evaluations.append({'overall_winner': 'Tie'})
+            else:
+                evaluations.append({'overall_winner': 'A' if (winner == 'test') == job['a_is_test'] else 'B'})
+        return evaluations
+
+    return judge_round, rounds
+
+
+def record(stopper, test, control, tie=0):
+    stopper.start(CONDITION, 0)
+    for winner, count in (('test', test), ('control', control), ('tie', tie)):
+        for _ in range(count):
+            stopper.record(CONDITION, winner)
+
+
+@pytest.mark.parametrize('test, control, expected', [(24, 0, 'test_better'), (0, 24, 'control_better')])
+def test_lopsided_results_decide_only_at_min_decided(test, control, expected):
+    stopper = AdaptiveStopper(min_decided=24)
+    record(stopper, test - 1 if test else 0, control - 1 if control else 0, tie=50)
+    assert stopper.decision(CONDITION) is None
+    record(stopper, test, control, tie=50)
+    assert stopper.decision(CONDITION) == expected
+
+
+def test_balanced_results_stop_once_the_interval_is_narrow_enough():
+    stopper = AdaptiveStopper(target_width=0.3, min_decided=2)
+    decided = None
+    for judged in range(2, 200, 2):
+        record(stopper, judged // 2, judged // 2)
+        if stopper.decision(CONDITION):
+            decided = judged
+            break
+    lower, upper = wilson_interval(decided // 2, decided)
+    assert stopper.decision(CONDITION) == 'precise' and upper - lower <= 0.3
+    lower, upper = wilson_interval(decided // 2 - 1, decided - 2)
+    assert upper - lower > 0.3
+
+
+def test_judging_stops_after_the_deciding_round():
+    stopper = AdaptiveStopper(min_decided=24)
+    judge_round, rounds = judge_with(lambda job: 'test')
+    judged = asyncio.run(judge_until_decided(make_plan(200), judge_round, stopper, CONDITION, round_size=8))
+
+    assert rounds == [8, 8, 8]
+    assert len(judged) == 24
+    # Rounds are drawn in shuffled order but returned in plan order
+    positions = [int(job['query_id'].split('_')[1]) for job, _ in judged]
+    assert positions == sorted(positions) and positions != list(range(24))
+    report = stopper.report(CONDITION, len(judged), 200)
+    assert report['decision'] == 'test_better' and report['saved'] == 176
+
+
+def test_ties_and_unparsed_judgments_do_not_count_towards_min_decided():
+    stopper = AdaptiveStopper(min_decided=24)
+    outcomes = {}
+
+    def outcome(job):
+        # Two jobs in three are ties or unreadable, so 24 decided judgments take about 72 jobs
+        index = int(job['query_id'].split('_')[1])
+        outcomes[index] = 'test' if index % 3 == 0 else ('tie' if index % 3 == 1 else 'unparsed')
+        return outcomes[index]
+
+    judge_round, rounds = judge_with(outcome)
+    judged = asyncio.run(judge_until_decided(make_plan(300), judge_round, stopper, CONDITION, round_size=8))
+    decided = sum(1 for job, _ in judged if outcomes[int(job['query_id'].split('_')[1])] == 'test')
+    assert decided >= 24 and decided - 8 < 24
+    assert stopper.decision(CONDITION) == 'test_better'
+
+
+def test_undecided_condition_judges_the_whole_plan():
+    stopper = AdaptiveStopper(target_width=0.01, min_decided=24)
+    judge_round, rounds = judge_with(lambda job: 'test' if job['query_id'][-1] in '02468' else 'control')
+    judged = asyncio.run(judge_until_decided(make_plan(60), judge_round, stopper, CONDITION, round_size=8))
+    assert len(judged) == 60 and sum(rounds) == 60
+    assert stopper.report(CONDITION, len(judged), 60)['decision'] == 'exhausted'
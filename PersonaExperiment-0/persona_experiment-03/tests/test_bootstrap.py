@@ -0,0 +1,57 @@
+"""Behaviour of the vectorized BCa bootstrap."""
+
+import numpy as np
+from scipy import stats
+
+from bootstrap import BootstrapEngine
+
+LEVELS = np.arange(1.0, 6.0)
+CONDITIONS = ['control', 'test_1_hardcoded']
+
+
+def histograms(*samples):
+    """[condition, metric, level] counts for one metric."""
+    return np.stack([np.bincount(np.asarray(sample) - 1, minlength=5) for sample in samples])[:, None, :].astype(float)
+
+
+def samples():
+    rng = np.random.default_rng(3)
+    control = rng.choice(5, size=40, p=[0.1, 0.2, 0.4, 0.2, 0.1]) + 1
+    test = rng.choice(5, size=35, p=[0.05, 0.1, 0.3, 0.35, 0.2]) + 1
+    return control, test
+
+
+def test_intervals_agree_with_scipy_bca():
+    control, test = samples()
+    engine = BootstrapEngine(n_resamples=20000, seed=1)
+    result = engine.contrast_intervals(histograms(control, test), LEVELS, CONDITIONS, ['overall'])
+    contrast = result['overall']['test_1_hardcoded_vs_control']
+
+    reference = stats.bootstrap((test, control), lambda a, b, axis: a.mean(axis) - b.mean(axis),
+                                n_resamples=20000, method='BCa', random_state=2)
+    mean_difference = contrast['mean_difference']
+    assert abs(mean_difference['estimate'] - (test.mean() - control.mean())) < 1e-12
+    assert abs(mean_difference['ci_lower'] - reference.confidence_interval.low) < 0.03
+    assert abs(mean_difference['ci_upper'] - reference.confidence_interval.high) < 0.03
+
+    delta = contrast['cliff_delta']
+    expected = np.sign(test[:, None] - control[None, :]).mean()
+    assert abs(delta['estimate'] - expected) < 1e-12
+    assert delta['ci_lower'] < delta['estimate'] < delta['ci_upper']
+    assert contrast['method'] == 'BCa'
+
+
+def test_results_do_not_depend_on_worker_count():
+    control, test = samples()
+    hist = np.concatenate([histograms(control, test), histograms(test, control)], axis=1)
+    serial = BootstrapEngine(n_resamples=2000, seed=5, workers=1)
+    pooled = BootstrapEngine(n_resamples=2000, seed=5, workers=2)
+    args = (hist, LEVELS, CONDITIONS, ['overall', 'helpfulness'])
+    assert serial.contrast_intervals(*args) == pooled.contrast_intervals(*args)
+
+
+def test_missing_reference_yields_no_contrasts():
+    control, test = samples()
+    engine = BootstrapEngine(n_resamples=100)
+    assert engine.contrast_intervals(histograms(control, test), LEVELS, CONDITIONS, ['overall'],
+                                     reference='absent') == {'overall': {}}
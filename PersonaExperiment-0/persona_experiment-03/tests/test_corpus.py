@@ -0,0 +1,69 @@
+"""Behaviour of the shared in-memory blinded corpus."""
+
+import json
+
+import pytest
+
+from corpus import BlindedCorpus, strip_role_indicators
+
+
+def write_corpus(base, datasets):
+    (base / "blinded_evaluation").mkdir()
+    key = {}
+    for original, (blinded, responses) in datasets.items():
+        key[original] = blinded
+        (base / "blinded_evaluation" / blinded).write_text(json.dumps(responses))
+    (base / "randomization_key.json").write_text(json.dumps(key))
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("[Role: Domain Expert] Use PKCE.", "Use PKCE."),
+    ("[role: tutor]\n\nStart small.", "Start small."),
+    ("  plain answer  ", "plain answer"),
+    ("See [Role: X] mid-text.", "See [Role: X] mid-text."),
+    ("[Role: A] [Role: B] twice", "[Role: B] twice"),
+])
+def test_role_prefix_is_stripped_only_at_the_start(text, expected):
+    assert strip_role_indicators(text) == expected
+
+
+def test_datasets_are_indexed_by_condition_and_agent(tmp_path):
+    write_corpus(tmp_path, {
+        "control_responses_agent_2.json": ("dataset_a.json", {"query_1": "[Role: Analyst] one", "query_2": "two"}),
+        "test_3_dynamic_responses_agent_5.json": ("dataset_b.json", {"query_1": "three"}),
+    })
+    corpus = BlindedCorpus(str(tmp_path))
+    assert corpus.dataset("dataset_a.json") == {"query_1": "one", "query_2": "two"}
+    assert corpus.datasets_for('test_3_dynamic') == ["dataset_b.json"]
+    assert corpus.locate("dataset_a.json") == ('control', 2)
+    assert corpus.find_dataset('control', 2) == "dataset_a.json"
+    assert corpus.find_dataset('control', 9) is None
+    assert corpus.original_file("dataset_a.json") == "control_responses_agent_2.json"
+
+
+def test_load_memoizes_per_resolved_base_path(tmp_path, monkeypatch):
+    for name in ("one", "two"):
+        (tmp_path / name).mkdir()
+        write_corpus(tmp_path / name, {"control_responses_agent_1.json": ("dataset_a.json", {"query_1": name})})
+
+    first = BlindedCorpus.load(str(tmp_path / "one"))
+    monkeypatch.chdir(tmp_path)
+    assert BlindedCorpus.load("one") is first
+    assert BlindedCorpus.load(str(tmp_path / "two" / ".." / "one")) is first
+
+    second = BlindedCorpus.load(str(tmp_path / "two"))
+    assert second is not first
+    assert second.response("dataset_a.json", "query_1") == "two"
+
+
+def test_missing_files_raise_and_are_not_memoized(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        BlindedCorpus.load(str(tmp_path))
+
+    (tmp_path / "blinded_evaluation").mkdir()
+    (tmp_path / "randomization_key.json").write_text(json.dumps({"control_responses_agent_1.json": "dataset_a.json"}))
+    with pytest.raises(FileNotFoundError):
+        BlindedCorpus.load(str(tmp_path))
+
+    (tmp_path / "blinded_evaluation" / "dataset_a.json").write_text(json.dumps({"query_1": "now present"}))
+    assert BlindedCorpus.load(str(tmp_path)).response("dataset_a.json", "query_1") == "now present"
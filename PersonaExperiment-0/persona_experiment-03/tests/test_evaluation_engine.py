@@ -0,0 +1,68 @@
+"""Behaviour of the shared evaluation engine."""
+
+import json
+import sys
+
+import pytest
+
+import evaluation_engine
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['evaluation_engine.py', *args])
+    evaluation_engine.main()
+
+
+def test_plain_run_refuses_to_overwrite_committed_results(experiment, monkeypatch):
+    before = (experiment / "results" / "pairwise_evaluator_4_results.json").read_text()
+    with pytest.raises(SystemExit):
+        run_main(monkeypatch, '--base-path', str(experiment))
+    assert (experiment / "results" / "pairwise_evaluator_4_results.json").read_text() == before
+
+
+def test_output_dir_run_writes_elsewhere(experiment, monkeypatch):
+    output = experiment / "rerun"
+    run_main(monkeypatch, '--base-path', str(experiment), '--output-dir', str(output))
+    assert json.loads((output / "pairwise_evaluator_4_results.json").read_text())['evaluator'] == 'pairwise_evaluator_4'
+
+
+def test_panel_evaluators_are_independent_raters(experiment, monkeypatch):
+    output = experiment / "panel"
+    run_main(monkeypatch, '--base-path', str(experiment), '--panel', 'full', '--output-dir', str(output))
+
+    def verdicts(evaluator_id):
+        results = json.loads((output / f"pairwise_evaluator_{evaluator_id}_results.json").read_text())['results']
+        return [(query_result['a_is_test'], query_result['winner'])
+                for condition in results.values() for comparison in condition['comparisons'].values()
+                for query_result in comparison['query_results'].values()]
+
+    def scores(evaluator_id):
+        results = json.loads((output / f"absolute_evaluator_{evaluator_id}_results.json").read_text())
+        return [entry['evaluation']['overall']['score'] for dataset in results['dataset_results'].values()
+                for entry in dataset['query_evaluations'].values()]
+
+    assert len({tuple(verdicts(evaluator_id)) for evaluator_id in range(1, 8)}) == 7
+    assert len({tuple(scores(evaluator_id)) for evaluator_id in range(8, 15)}) == 7
+
+
+def test_evaluator_seeds_are_distinct_and_reproducible():
+    panel = evaluation_engine.build_full_panel(seed=42)
+    seeds = [config['seed'] for config in panel]
+    assert len(set(seeds)) == len(panel)
+    assert seeds == [config['seed'] for config in evaluation_engine.build_full_panel(seed=42)]
+    assert seeds != [config['seed'] for config in evaluation_engine.build_full_panel(seed=7)]
+
+
+def test_evaluator_script_runs_its_config(experiment, monkeypatch):
+    import absolute_evaluator_7
+    output = experiment / "single"
+    monkeypatch.setattr(sys, 'argv', ['absolute_evaluator_7.py', '--base-path', str(experiment),
+                                      '--output-dir', str(output)])
+    evaluation_engine.run_single_evaluator(absolute_evaluator_7.CONFIG, str(experiment))
+    results = json.loads((output / "absolute_evaluator_7_results.json").read_text())
+    assert results['conditions'] == ['test_3_dynamic', 'test_4_dynamic_tone']
+    assert [path.name for path in output.iterdir()] == ["absolute_evaluator_7_results.json"]
+
+    monkeypatch.setattr(sys, 'argv', ['absolute_evaluator_7.py', '--base-path', str(experiment)])
+    with pytest.raises(SystemExit):
+        evaluation_engine.run_single_evaluator(absolute_evaluator_7.CONFIG, str(experiment))
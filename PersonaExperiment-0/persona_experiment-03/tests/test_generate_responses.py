@@ -0,0 +1,108 @@
+"""Behaviour of the concurrent response generator."""
+
+import asyncio
+import json
+import sys
+import time
+
+import pytest
+
+import generate_responses
+from generate_responses import ResponseGenerator, StubModelClient
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['generate_responses.py', *args])
+    generate_responses.main()
+
+
+def test_plain_run_refuses_to_overwrite_committed_responses(experiment, monkeypatch):
+    before = (experiment / "responses" / "control_responses_agent_4.json").read_text()
+    with pytest.raises(SystemExit):
+        run_main(monkeypatch, '--base-path', str(experiment), '--agents', '4', '--conditions', 'control')
+    assert (experiment / "responses" / "control_responses_agent_4.json").read_text() == before
+
+
+def test_output_dir_keeps_committed_responses(experiment, monkeypatch):
+    before = (experiment / "responses" / "control_responses_agent_4.json").read_text()
+    output = experiment / "dry_run"
+    run_main(monkeypatch, '--base-path', str(experiment), '--agents', '4', '--conditions', 'control',
+             '--output-dir', str(output))
+    assert (experiment / "responses" / "control_responses_agent_4.json").read_text() == before
+    written = json.loads((output / "control_responses_agent_4.json").read_text())
+    assert all(text.startswith('Stub response to:') for text in written.values())
+
+
+def test_overwrite_replaces_existing_files(experiment, monkeypatch):
+    run_main(monkeypatch, '--base-path', str(experiment), '--agents', '4', '--conditions', 'control', '--overwrite')
+    written = json.loads((experiment / "responses" / "control_responses_agent_4.json").read_text())
+    assert all(text.startswith('Stub response to:') for text in written.values())
+
+
+def test_write_response_files_refuses_existing(experiment):
+    generator = ResponseGenerator(str(experiment), StubModelClient(latency_per_char=0), [4], ['control'])
+    with pytest.raises(FileExistsError):
+        generator.write_response_files({('control', 4): {'query_1': 'text'}})
+
+
+def test_fresh_resumable_run_does_not_claim_to_resume(experiment, capsys):
+    from generation_log import GenerationLog
+    log = GenerationLog(str(experiment / "generation_log.jsonl"))
+    generator = ResponseGenerator(str(experiment), StubModelClient(latency_per_char=0), [9], ['control'], log=log,
+                                  output_dir=str(experiment / "out"))
+    asyncio.run(generator.run())
+    assert 'Resuming' not in capsys.readouterr().out
+
+    log = GenerationLog(str(experiment / "generation_log.jsonl"))
+    generator = ResponseGenerator(str(experiment), StubModelClient(latency_per_char=0), [9], ['control'], log=log,
+                                  output_dir=str(experiment / "out"))
+    asyncio.run(generator.run())
+    assert 'Resuming' in capsys.readouterr().out
+
+
+async def _time_batches(client, batches, size):
+    start = time.monotonic()
+    for _ in range(batches):
+        await client.generate_batch('', [f"query {i}" for i in range(size)])
+    return time.monotonic() - start
+
+
+def test_batch_is_charged_one_token_per_request():
+    client = StubModelClient(latency_per_char=0, requests_per_minute=600)  # 10 per second, burst of 10
+    elapsed = asyncio.run(_time_batches(client, batches=2, size=10))
+    # 20 requests against a burst of 10 at 10/s need about a second, not two tokens' worth
+    assert elapsed >= 0.8
+
+
+def test_default_batch_respects_the_limit_for_plain_backends():
+    class PlainClient(generate_responses.ModelClient):
+        async def _complete(self, pre_prompt, query, seed):
+            return query
+
+    client = PlainClient('plain', requests_per_minute=600)
+    asyncio.run(client.generate_batch('', [f"query {i}" for i in range(6)]))
+    assert client.rate_limiter.tokens < 5
+
+
+def test_streamed_requests_stay_within_max_concurrency(experiment):
+    class TrackingClient(StubModelClient):
+        def __init__(self):
+            super().__init__(latency_per_char=0)
+            self.active = self.peak = 0
+
+        async def _stream(self, pre_prompt, query, seed):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                for word in ('streamed', 'reply'):
+                    await asyncio.sleep(0.001)
+                    yield word
+            finally:
+                self.active -= 1
+
+    client = TrackingClient()
+    generator = ResponseGenerator(str(experiment), client, [8, 9], max_concurrency=3, batch_size=12, stream=True,
+                                  output_dir=str(experiment / "out"))
+    grouped = asyncio.run(generator.run())
+    assert sum(len(responses) for responses in grouped.values()) == 2 * len(generate_responses.CONDITIONS) * len(generator.queries)
+    assert client.peak <= 3
@@ -0,0 +1,58 @@
+"""Behaviour of the response generation write-ahead log."""
+
+import asyncio
+import json
+
+from generate_responses import ResponseGenerator, StubModelClient
+from generation_log import GenerationLog
+
+
+class CountingClient(StubModelClient):
+    def __init__(self):
+        super().__init__(latency_per_char=0)
+        self.prompts = []
+
+    async def _complete(self, pre_prompt, query, seed):
+        self.prompts.append(query)
+        return await super()._complete(pre_prompt, query, seed)
+
+    async def _complete_batch(self, pre_prompt, queries, seeds):
+        self.prompts.extend(queries)
+        return await super()._complete_batch(pre_prompt, queries, seeds)
+
+
+def test_torn_trailing_line_is_skipped(tmp_path):
+    path = tmp_path / "generation_log.jsonl"
+    log = GenerationLog(str(path))
+    log.append(('control', 1, 'query_1'), 'first')
+    with open(path, 'a') as f:
+        f.write('{"condition": "control", "agent_id": 1, "query_id": "query_2", "te')
+
+    reopened = GenerationLog(str(path))
+    assert reopened.completed() == {('control', 1, 'query_1')}
+    reopened.append(('control', 1, 'query_2'), 'second')
+    assert reopened.completed() == {('control', 1, 'query_1'), ('control', 1, 'query_2')}
+
+
+def test_compact_keeps_last_record_and_drops_chunks(tmp_path):
+    log = GenerationLog(str(tmp_path / "generation_log.jsonl"))
+    log.append_chunk(('control', 1, 'query_1'), 0, 'par')
+    log.append(('control', 1, 'query_1'), 'old')
+    log.append(('control', 1, 'query_1'), 'new')
+
+    assert log.compact() == {('control', 1): {'query_1': 'new'}}
+    lines = (tmp_path / "generation_log.jsonl").read_text().splitlines()
+    assert [json.loads(line)['text'] for line in lines] == ['new']
+
+
+def test_resumed_run_only_generates_missing_triples(experiment):
+    log = GenerationLog(str(experiment / "generation_log.jsonl"))
+    log.append(('control', 9, 'query_1'), 'logged before the crash')
+    client = CountingClient()
+    generator = ResponseGenerator(str(experiment), client, [9], ['control'], log=log,
+                                  output_dir=str(experiment / "out"))
+
+    grouped = asyncio.run(generator.run())
+    assert len(client.prompts) == len(generator.queries) - 1
+    assert grouped[('control', 9)]['query_1'] == 'logged before the crash'
+    assert set(grouped[('control', 9)]) == set(generator.queries)
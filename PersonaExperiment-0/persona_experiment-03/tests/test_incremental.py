@@ -0,0 +1,135 @@
+"""Behaviour of the incremental analysis against a full recompute."""
+
+import json
+import os
+import shutil
+import sys
+
+import incremental
+from incremental import IncrementalAnalysis
+from results_loader import CONDITIONS, EVALUATION_METRICS
+
+
+def run(experiment, state_name="state.json"):
+    """One analysis run over experiment with its state in experiment/<state_name>."""
+    analysis = IncrementalAnalysis(str(experiment), str(experiment / state_name))
+    summary = analysis.update()
+    return analysis, summary
+
+
+def full_recompute(experiment, tmp_path):
+    """Results of a run that starts without any state."""
+    state = tmp_path / "fresh_state.json"
+    if state.exists():
+        state.unlink()
+    analysis = IncrementalAnalysis(str(experiment), str(state))
+    analysis.update()
+    return analysis.results()
+
+
+def rewrite(path, change):
+    """Apply change to a results file and make sure its signature moves."""
+    data = json.loads(path.read_text())
+    change(data)
+    path.write_text(json.dumps(data, indent=2))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def first_query_evaluation(data):
+    dataset = next(iter(data['dataset_results'].values()))
+    return next(iter(dataset['query_evaluations'].values()))['evaluation']
+
+
+def first_query_result(data, condition):
+    comparison = next(iter(data['results'][condition]['comparisons'].values()))
+    return next(iter(comparison['query_results'].values()))
+
+
+def test_updates_match_a_full_recompute(experiment, tmp_path):
+    results = experiment / "results"
+    analysis, summary = run(experiment)
+    assert sorted(summary['files_read']) == sorted(path.name for path in results.glob("*_evaluator_*_results.json"))
+    assert analysis.results() == full_recompute(experiment, tmp_path)
+
+    # A new evaluator's file only touches the condition it rated
+    shutil.copy(results / "absolute_evaluator_5_results.json", results / "absolute_evaluator_8_results.json")
+    analysis, summary = run(experiment)
+    assert summary['files_read'] == ["absolute_evaluator_8_results.json"]
+    assert sorted(analysis.recomputed['absolute']) == [(metric, "test_1_hardcoded_vs_control")
+                                                       for metric in sorted(EVALUATION_METRICS)]
+    assert analysis.recomputed['pairwise'] == []
+    assert analysis.results() == full_recompute(experiment, tmp_path)
+
+    # A changed control score re-derives every contrast of that metric
+    def lower_control_overall(data):
+        evaluation = first_query_evaluation(data)
+        evaluation['overall']['score'] = 1 if evaluation['overall']['score'] != 1 else 2
+
+    rewrite(results / "absolute_evaluator_4_results.json", lower_control_overall)
+    analysis, summary = run(experiment)
+    assert summary['files_read'] == ["absolute_evaluator_4_results.json"]
+    assert sorted(analysis.recomputed['absolute']) == [('overall', f"{condition}_vs_control") for condition in CONDITIONS[1:]]
+    assert analysis.results() == full_recompute(experiment, tmp_path)
+
+    # A changed pairwise verdict re-derives only that condition's win rate
+    def flip_test_2_verdict(data):
+        query_result = first_query_result(data, 'test_2_predefined')
+        query_result['winner'] = 'control' if query_result['winner'] != 'control' else 'test'
+
+    rewrite(results / "pairwise_evaluator_4_results.json", flip_test_2_verdict)
+    analysis, summary = run(experiment)
+    assert analysis.recomputed == {'absolute': [], 'pairwise': ['test_2_predefined']}
+    assert analysis.results() == full_recompute(experiment, tmp_path)
+
+    # A deleted file takes its contribution with it
+    (results / "absolute_evaluator_8_results.json").unlink()
+    analysis, summary = run(experiment)
+    assert summary['files_read'] == []
+    assert sorted(analysis.recomputed['absolute']) == [(metric, "test_1_hardcoded_vs_control")
+                                                       for metric in sorted(EVALUATION_METRICS)]
+    assert "absolute_evaluator_8_results.json" not in analysis.results()['sources']
+    assert analysis.results() == full_recompute(experiment, tmp_path)
+
+
+def test_state_round_trips_and_unchanged_runs_reuse_everything(experiment):
+    first, _ = run(experiment)
+    reloaded = IncrementalAnalysis(str(experiment), str(experiment / "state.json"))
+    assert reloaded.state == first.state
+
+    summary = reloaded.update()
+    assert summary['files_read'] == [] and summary['contrasts_recomputed'] == 0
+    assert summary['contrasts_reused'] > 0
+    assert reloaded.results() == first.results()
+
+
+def test_unreadable_or_outdated_state_starts_over(experiment):
+    (experiment / "state.json").write_text("{not json")
+    analysis, summary = run(experiment)
+    assert len(summary['files_read']) == 5
+
+    state = json.loads((experiment / "state.json").read_text())
+    (experiment / "state.json").write_text(json.dumps({**state, 'version': incremental.STATE_VERSION + 1}))
+    assert IncrementalAnalysis(str(experiment), str(experiment / "state.json")).state['sources'] == {}
+
+
+def test_rebuild_rereads_every_file(experiment, monkeypatch, capsys):
+    def run_main(*args):
+        monkeypatch.setattr(sys, 'argv', ['incremental.py', '--base-path', str(experiment), *args])
+        incremental.main()
+        return capsys.readouterr().out
+
+    assert "Read 5 results files" in run_main()
+    written = json.loads((experiment / "analysis" / "incremental_analysis_results.json").read_text())
+    assert "Read 0 results files: none changed" in run_main()
+
+    # A stale derived result in the state survives a plain run but not a rebuild
+    state_path = experiment / "analysis" / "results_cache" / "incremental_state.json"
+    state = json.loads(state_path.read_text())
+    state['derived']['pairwise']['test_1_hardcoded']['win_rate'] = -1
+    state_path.write_text(json.dumps(state))
+    run_main()
+    assert json.loads((experiment / "analysis" / "incremental_analysis_results.json").read_text()) != written
+
+    assert "Read 5 results files" in run_main('--rebuild')
+    assert json.loads((experiment / "analysis" / "incremental_analysis_results.json").read_text()) == written
@@ -0,0 +1,103 @@
+"""Behaviour of the parallel judge executor and of unreadable judgments in an evaluation run."""
+
+import asyncio
+import time
+
+import pytest
+
+from evaluation_engine import EvaluationEngine
+from judge_executor import JudgeExecutor
+from judge_parser import MalformedJudgmentError, TextJudge
+
+VALID_PAIRWISE = """Helpfulness: A - clearer
+Appropriateness: A - fits
+Completeness: Tie - both
+Actionability: B - steps
+Overall: A - better
+
+Overall Winner: A"""
+
+
+class ScriptedClient:
+    """Stands in for a ModelClient: replies with reply(prompt) and counts calls."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+
+    async def generate(self, pre_prompt, prompt, seed=None):
+        self.calls += 1
+        return self.reply(prompt)
+
+
+def test_retries_transient_errors():
+    executor = JudgeExecutor(max_retries=3, base_delay=0)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("reset")
+        return 'ok'
+
+    assert asyncio.run(executor.call(flaky)) == 'ok'
+    assert executor.stats['retries'] == 2
+
+
+def test_malformed_judgments_are_not_retried():
+    executor = JudgeExecutor(max_retries=3, base_delay=0)
+    attempts = []
+
+    def unreadable():
+        attempts.append(1)
+        raise MalformedJudgmentError("unreadable")
+
+    with pytest.raises(MalformedJudgmentError):
+        asyncio.run(executor.call(unreadable))
+    assert len(attempts) == 1 and executor.stats['retries'] == 0
+
+
+def test_sync_judge_calls_overlap():
+    executor = JudgeExecutor(max_in_flight=4)
+
+    def blocking_judge(index):
+        time.sleep(0.2)
+        return index
+
+    start = time.monotonic()
+    assert asyncio.run(executor.map(blocking_judge, [(index,) for index in range(4)])) == [0, 1, 2, 3]
+    # Run inline on the event loop the four calls would take 0.8s back to back
+    assert time.monotonic() - start < 0.6
+
+
+def run_pairwise(experiment, judge, **config):
+    engine = EvaluationEngine(str(experiment))
+    config = {'evaluator_id': 1, 'mode': 'pairwise', 'conditions': ['test_1_hardcoded'], 'max_retries': 4, **config}
+    return asyncio.run(engine.run_pairwise(config, judge))
+
+
+def test_unreadable_judgments_are_recorded_not_fatal(experiment):
+    client = ScriptedClient(lambda prompt: "I cannot decide.")
+    judge = TextJudge(client, max_repairs=1)
+    results = run_pairwise(experiment, judge)
+
+    query_results = [query_result for comparison in results['results']['test_1_hardcoded']['comparisons'].values()
+                     for query_result in comparison['query_results'].values()]
+    summary = results['results']['test_1_hardcoded']['summary']
+    assert query_results and all(query_result['winner'] == 'unparsed' for query_result in query_results)
+    assert summary['unparsed'] == len(query_results) and summary['total_comparisons'] == 0
+    # One call plus one repair per judgment, never a whole-judgment retry
+    assert client.calls == 2 * len(query_results)
+
+
+def test_unreadable_items_do_not_discard_the_rest_of_a_batch(experiment):
+    def reply(prompt):
+        if '### Item' in prompt:
+            return "### Item 1\n" + VALID_PAIRWISE + "\n### Item 2\nno idea\n"
+        return VALID_PAIRWISE if 'could not be read' not in prompt else "still no idea"
+
+    judge = TextJudge(ScriptedClient(reply), max_repairs=1)
+    results = run_pairwise(experiment, judge, batch_size=2)
+    winners = [query_result['winner'] for comparison in results['results']['test_1_hardcoded']['comparisons'].values()
+               for query_result in comparison['query_results'].values()]
+    assert 'unparsed' in winners and {'test', 'control'} & set(winners)
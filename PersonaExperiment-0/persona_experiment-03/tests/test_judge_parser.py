@@ -0,0 +1,74 @@
+"""Behaviour of the judge reply parser and the text judge's repair prompts."""
+
+import asyncio
+
+from evaluation_engine import EvaluationEngine
+from judge_parser import TextJudge, parse_judgment, split_item_sections
+
+# Criteria favour B three to one, but the judge's own verdict is A
+PAIRWISE_REPLY = """**Helpfulness**: Response B - more detail
+- Appropriateness: [B] - better tone
+Completeness: B - covers more
+Actionability: Tie - equal
+Overall Quality: A - reads better
+
+Overall Winner: A"""
+
+
+class ScriptedClient:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    async def generate(self, pre_prompt, prompt, seed=None):
+        self.prompts.append(prompt)
+        return self.replies.pop(0)
+
+
+def test_parses_common_deviations():
+    parsed = parse_judgment(PAIRWISE_REPLY, 'pairwise')
+    assert [parsed['evaluation'][c]['choice'] for c in ('helpfulness', 'appropriateness', 'actionability')] == ['B', 'B', 'Tie']
+    assert parsed['overall_winner'] == 'A' and not parsed['missing'] and not parsed['malformed']
+
+    absolute = parse_judgment("Helpfulness: 4/5 - good\nOverall: 3.5 - fine\nCompleteness: 9 - no", 'absolute')
+    assert absolute['evaluation']['helpfulness']['score'] == 4
+    assert absolute['evaluation']['overall']['score'] == 4 and absolute['recovered'] == ['overall']
+    assert absolute['malformed'][0]['criterion'] == 'completeness'
+
+
+def test_splits_batched_replies_by_item():
+    sections = split_item_sections("### Item 1\nHelpfulness: A\n### Item 2\nHelpfulness: B\n### Item 1\nignored")
+    assert sorted(sections) == [1, 2] and 'Helpfulness: A' in sections[1]
+
+
+def test_repair_prompt_asks_only_for_unreadable_criteria():
+    first = PAIRWISE_REPLY.replace("Completeness: B - covers more", "Completeness: the second one")
+    client = ScriptedClient([first, "Completeness: B - covers more"])
+    evaluation = asyncio.run(TextJudge(client, max_repairs=1).judge_pair("PROMPT"))
+
+    assert len(client.prompts) == 2
+    repair = client.prompts[1].split("could not be read for:")[1]
+    assert 'Completeness' in repair
+    assert not any(label in repair for label in ('Helpfulness', 'Appropriateness', 'Actionability', 'Overall'))
+    assert evaluation['completeness']['choice'] == 'B'
+
+
+def test_parsed_overall_winner_is_kept(experiment):
+    engine = EvaluationEngine(str(experiment))
+    judge = TextJudge(ScriptedClient([PAIRWISE_REPLY] * 1000), max_repairs=0)
+    config = {'evaluator_id': 1, 'mode': 'pairwise', 'conditions': ['test_1_hardcoded']}
+    results = asyncio.run(engine.run_pairwise(config, judge))
+    evaluations = [query_result['evaluation'] for comparison in results['results']['test_1_hardcoded']['comparisons'].values()
+                   for query_result in comparison['query_results'].values()]
+    assert evaluations and all(evaluation['overall_winner'] == 'A' for evaluation in evaluations)
+
+
+def test_majority_is_the_fallback_without_a_verdict(experiment):
+    engine = EvaluationEngine(str(experiment))
+    reply = PAIRWISE_REPLY.replace("\n\nOverall Winner: A", "")
+    judge = TextJudge(ScriptedClient([reply] * 1000), max_repairs=0)
+    config = {'evaluator_id': 1, 'mode': 'pairwise', 'conditions': ['test_1_hardcoded']}
+    results = asyncio.run(engine.run_pairwise(config, judge))
+    evaluations = [query_result['evaluation'] for comparison in results['results']['test_1_hardcoded']['comparisons'].values()
+                   for query_result in comparison['query_results'].values()]
+    assert evaluations and all(evaluation['overall_winner'] == 'B' for evaluation in evaluations)
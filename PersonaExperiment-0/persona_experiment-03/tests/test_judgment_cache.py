@@ -0,0 +1,79 @@
+"""Behaviour of the persistent judgment cache."""
+
+import asyncio
+
+from evaluation_engine import EvaluationEngine, build_full_panel
+from judgment_cache import JudgmentCache
+
+EVALUATION = {'helpfulness': {'choice': 'A', 'explanation': ''}, 'overall_winner': 'A'}
+
+
+def test_raters_do_not_share_verdicts(tmp_path):
+    cache = JudgmentCache(str(tmp_path), 'http:judge')
+    cache.put_judgment('template', 'query', ('a', 'b'), EVALUATION, rater='pairwise_evaluator_1:1')
+    assert cache.get_judgment('template', 'query', ('a', 'b'), rater='pairwise_evaluator_1:1') == EVALUATION
+    assert cache.get_judgment('template', 'query', ('a', 'b'), rater='pairwise_evaluator_2:2') is None
+
+
+def test_swapped_reuse_mirrors_the_verdict(tmp_path):
+    cache = JudgmentCache(str(tmp_path), 'http:judge', reuse_swapped=True)
+    cache.put_judgment('template', 'query', ('a', 'b'), EVALUATION, rater='r')
+    mirrored = cache.get_judgment('template', 'query', ('b', 'a'), rater='r')
+    assert mirrored['helpfulness']['choice'] == 'B' and mirrored['overall_winner'] == 'B'
+    assert cache.summary() == {'hits': 1, 'misses': 0, 'swapped_hits': 1}
+    assert set(cache.orderings('template', 'query', 'a', 'b', rater='r')) == {'as_given'}
+
+
+def test_lookup_counts_one_outcome_with_swapped_reuse(tmp_path):
+    cache = JudgmentCache(str(tmp_path), 'http:judge', reuse_swapped=True)
+    assert cache.get_judgment('template', 'query', ('a', 'b'), rater='r') is None
+    assert cache.summary() == {'hits': 0, 'misses': 1, 'swapped_hits': 0}
+
+    cache.put_judgment('template', 'query', ('a', 'b'), EVALUATION, rater='r')
+    cache.get_judgment('template', 'query', ('a', 'b'), rater='r')
+    cache.get_judgment('template', 'query', ('b', 'a'), rater='r')
+    cache.get_judgment('template', 'query', ('c', 'd'), rater='r')
+    assert cache.summary() == {'hits': 2, 'misses': 2, 'swapped_hits': 1}
+
+
+def test_eviction_prunes_orphaned_pair_index_entries(tmp_path):
+    cache = JudgmentCache(str(tmp_path), 'http:judge', max_bytes=None)
+    cache.put_judgment('template', 'query', ('a', 'b'), EVALUATION, rater='r')
+    cache.put_judgment('template', 'query', ('b', 'a'), EVALUATION, rater='r')
+    cache.put_judgment('template', 'query', ('c', 'd'), EVALUATION, rater='r')
+    assert len(cache.position_pairs()) == 1
+
+    cache.entry_path(cache.make_key('template', 'query', ('b', 'a'), 'r')).unlink()
+    cache.entry_path(cache.make_key('template', 'query', ('c', 'd'), 'r')).unlink()
+    cache.evict()
+    assert len(list(cache.pairs_dir.glob('*/*.json'))) == 1
+    assert set(cache.orderings('template', 'query', 'a', 'b', rater='r')) == {'as_given'}
+
+    cache.max_bytes = 0
+    assert cache.evict() == 1
+    assert list(cache.pairs_dir.glob('*/*.json')) == []
+
+
+def test_panel_members_judge_independently_with_a_shared_cache(experiment, tmp_path):
+    class CountingJudge:
+        def __init__(self):
+            self.calls = 0
+
+        async def judge_pair(self, prompt):
+            self.calls += 1
+            return {criterion: {'choice': 'A', 'explanation': ''}
+                    for criterion in ('helpfulness', 'appropriateness', 'completeness', 'actionability', 'overall')}
+
+    engine = EvaluationEngine(str(experiment))
+    cache = JudgmentCache(str(tmp_path / "judgment_cache"), 'http:judge')
+    first, second = [{**config, 'conditions': ['test_1_hardcoded'], 'judgment_cache': cache}
+                     for config in build_full_panel()[:2]]
+    judges = [CountingJudge(), CountingJudge()]
+    asyncio.run(engine.run_pairwise(first, judges[0]))
+    asyncio.run(engine.run_pairwise(second, judges[1]))
+    assert judges[0].calls > 0 and judges[1].calls == judges[0].calls
+
+    # A rerun of the same evaluator is served from the cache
+    rerun = CountingJudge()
+    asyncio.run(engine.run_pairwise(first, rerun))
+    assert rerun.calls == 0
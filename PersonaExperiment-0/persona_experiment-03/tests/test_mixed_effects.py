@@ -0,0 +1,69 @@
+"""Behaviour of the crossed random-effects model engine."""
+
+import numpy as np
+import pytest
+
+import mixed_effects
+from mixed_effects import MixedEffectsEngine
+from results_loader import ResultsLoader
+from score_store import ScoreStore
+
+CONDITIONS = ['control', 'test_1_hardcoded']
+
+
+def crossed_store(seed=0, effect=0.8):
+    """Every evaluator scores every agent of both conditions on every query."""
+    rng = np.random.default_rng(seed)
+    store = ScoreStore(CONDITIONS, ['overall'])
+    queries = [store.add_query(f"query_{q}", ['factual', 'advice'][q % 2]) for q in range(8)]
+    query_effects, evaluator_effects = rng.normal(0, 0.4, 8), [-0.6, 0.0, 0.6]
+    for c, condition in enumerate(CONDITIONS):
+        for agent in range(5):
+            dataset = store.add_dataset(f"dataset_{c}_{agent}.json", f"{condition}_responses_agent_{agent}.json",
+                                        condition, agent)
+            agent_effect = rng.normal(0, 0.3)
+            for evaluator, evaluator_effect in enumerate(evaluator_effects):
+                for q, query in enumerate(queries):
+                    score = 3 + effect * c + agent_effect + query_effects[q] + evaluator_effect + rng.normal(0, 0.5)
+                    store.add_score(evaluator, dataset, query, 'overall', int(np.clip(np.rint(score), 1, 5)))
+    return store
+
+
+def test_crossed_evaluators_are_modelled():
+    result = MixedEffectsEngine().fit_store(crossed_store())['overall']
+    assert result['converged'] and result['notes'] == []
+    assert result['model'].endswith('(1|agent) + (1|query) + (1|evaluator)')
+    assert result['variance_components']['evaluator'] > 0.1
+    contrast = result['condition_contrasts']['test_1_hardcoded_vs_control']
+    assert contrast['ci_95_lower'] < 0.8 < contrast['ci_95_upper']
+    assert contrast['significant']
+
+
+def test_evaluators_nested_in_condition_are_dropped(experiment):
+    store = ResultsLoader(str(experiment), cache_dir=str(experiment / "cache")).score_store
+    fits = [MixedEffectsEngine(starts=starts).fit_store(store) for starts in [(0.5,), (1.0,), (5.0,)]]
+    for metric, result in fits[0].items():
+        assert result['converged']
+        assert 'evaluator' not in result['variance_components']
+        assert '(1|evaluator)' not in result['model']
+        assert any('evaluator random effect dropped' in note for note in result['notes'])
+        for other in fits[1:]:
+            # Neither the optimum nor the contrast standard errors depend on the starting values
+            assert other[metric]['reml_deviance'] == pytest.approx(result['reml_deviance'], abs=1e-3)
+            for name, contrast in result['condition_contrasts'].items():
+                assert other[metric]['condition_contrasts'][name]['std_error'] == pytest.approx(
+                    contrast['std_error'], abs=1e-3)
+
+
+def test_failed_fit_is_reported_as_not_estimable(monkeypatch):
+    minimize = mixed_effects.optimize.minimize
+
+    def failing(*args, **kwargs):
+        result = minimize(*args, **kwargs)
+        result.success = False
+        return result
+
+    monkeypatch.setattr(mixed_effects.optimize, 'minimize', failing)
+    result = MixedEffectsEngine().fit_store(crossed_store())['overall']
+    assert not result['converged'] and 'not estimable' in result['error']
+    assert result['condition_contrasts'] == {'test_1_hardcoded_vs_control': {'status': 'not estimable'}}
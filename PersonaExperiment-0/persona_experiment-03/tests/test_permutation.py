@@ -0,0 +1,61 @@
+"""Behaviour of the within-query permutation tests."""
+
+import numpy as np
+from scipy import stats
+
+from permutation import PermutationEngine, sign_flip_p_value
+from stats_core import ScoreCube
+
+
+def cube(test, control):
+    """One evaluator and one metric; test/control are [agent, query] score arrays."""
+    scores = np.stack([np.asarray(control, float), np.asarray(test, float)])[None, ..., None]
+    agents = [[f"agent_{a}" for a in range(scores.shape[2])]] * 2
+    queries = [f"query_{q}" for q in range(scores.shape[3])]
+    return ScoreCube(scores, [4], ['control', 'test_1_hardcoded'], agents, queries, ['overall'])
+
+
+def result(engine, data):
+    return engine.score_difference_tests(data)['overall']['test_1_hardcoded_vs_control']
+
+
+def test_exact_p_value_of_fully_separated_blocks():
+    # Two query blocks of 4 + 4 slots: only the observed labelling and its mirror are as extreme
+    data = cube(np.full((4, 2), 5), np.full((4, 2), 1))
+    outcome = result(PermutationEngine(), data)
+    assert outcome['exact'] and outcome['permutations'] == 70 ** 2
+    assert outcome['mean_difference'] == 4
+    assert abs(outcome['p_value'] - round(2 / 70 ** 2, 4)) < 1e-12
+
+
+def test_monte_carlo_matches_exact_enumeration():
+    rng = np.random.default_rng(0)
+    data = cube(rng.integers(2, 6, size=(4, 2)), rng.integers(1, 5, size=(4, 2)))
+    exact = result(PermutationEngine(), data)
+    sampled = result(PermutationEngine(n_permutations=40000, exact_limit=0), data)
+    assert not sampled['exact']
+    assert abs(exact['p_value'] - sampled['p_value']) < 0.01
+
+
+def test_labels_are_only_exchanged_within_a_query():
+    # A one-point shift is decisive once the large query effect is blocked out
+    query_effect = np.array([1, 4])
+    data = cube(np.tile(query_effect + 1, (4, 1)), np.tile(query_effect, (4, 1)))
+    outcome = result(PermutationEngine(), data)
+    assert outcome['mean_difference'] == 1
+    assert outcome['blocks'] == 'query'
+    assert abs(outcome['p_value'] - round(2 / 70 ** 2, 4)) < 1e-12
+
+
+def test_missing_cells_are_skipped():
+    test = np.full((4, 2), 5.0)
+    test[0, 0] = np.nan
+    outcome = result(PermutationEngine(), cube(test, np.full((4, 2), 1)))
+    assert outcome['mean_difference'] == 4
+    assert outcome['p_value'] < 0.01
+
+
+def test_sign_flip_matches_the_exact_binomial():
+    for wins, trials in [(0, 0), (3, 10), (9, 12), (50, 100)]:
+        expected = 1.0 if trials == 0 else stats.binomtest(wins, trials).pvalue
+        assert abs(sign_flip_p_value(wins, trials) - expected) < 1e-12
@@ -0,0 +1,49 @@
+"""Behaviour of the shared query registry."""
+
+import json
+import sys
+
+import pytest
+
+from query_registry import QueryRegistry
+
+
+def write_queries(base, queries):
+    base.mkdir(exist_ok=True)
+    (base / "experiment_queries.json").write_text(json.dumps(queries))
+
+
+@pytest.mark.parametrize('query_id', ['query_', 'query_1a', 'Query_1', 'q_1', 'query_1 '])
+def test_bad_query_id_is_rejected(tmp_path, query_id):
+    write_queries(tmp_path, {'query_1': "fine", query_id: "broken"})
+    with pytest.raises(ValueError, match="Invalid query id"):
+        QueryRegistry.load(str(tmp_path))
+
+
+@pytest.mark.parametrize('queries', [{}, [], {'query_1': "   "}, {'query_1': 3}])
+def test_empty_file_or_text_is_rejected(tmp_path, queries):
+    write_queries(tmp_path, queries)
+    with pytest.raises(ValueError):
+        QueryRegistry.load(str(tmp_path))
+
+
+def test_load_memoizes_per_queries_file(tmp_path, monkeypatch):
+    write_queries(tmp_path / "one", {'query_2': "second", 'query_10': "tenth"})
+    write_queries(tmp_path / "two", {'query_2': "other"})
+
+    registry = QueryRegistry.load(str(tmp_path / "one"))
+    monkeypatch.chdir(tmp_path)
+    assert QueryRegistry.load("one") is registry
+    assert QueryRegistry.load(str(tmp_path / "two")) is not registry
+    assert registry.query_ids() == ['query_2', 'query_10']
+
+
+def test_texts_and_ids_are_interned(tmp_path):
+    text = "".join(["What is ", "the CAP theorem?"])
+    write_queries(tmp_path, {'query_3': text})
+    registry = QueryRegistry.load(str(tmp_path))
+    query_id, stored = next(iter(registry.texts.items()))
+    assert query_id is sys.intern("".join(["query_", "3"]))
+    assert stored is sys.intern(text)
+    assert registry.category('query_3') == 'technical'
+    assert registry.text('query_99') == "Unknown query: query_99"
@@ -0,0 +1,80 @@
+"""Behaviour of the inter-evaluator reliability statistics."""
+
+import numpy as np
+import pytest
+
+from reliability import ReliabilityEngine, fleiss_kappa
+from score_store import ScoreStore
+
+# Krippendorff (2011), "Computing Krippendorff's Alpha-Reliability": 4 coders, 12 units, gaps as None
+KRIPPENDORFF_DATA = [
+    [1, 2, 3, 3, 2, 1, 4, 1, 2, None, None, None],
+    [1, 2, 3, 3, 2, 2, 4, 1, 2, 5, None, 3],
+    [None, 3, 3, 3, 2, 3, 4, 2, 2, 5, 1, None],
+    [1, 2, 3, 3, 2, 4, 4, 1, 2, 5, 1, None],
+]
+
+# Fleiss (1971) as tabulated on Wikipedia: 10 subjects, 14 raters, 5 categories, kappa = 0.210
+FLEISS_COUNTS = [
+    [0, 0, 0, 0, 14], [0, 2, 6, 4, 2], [0, 0, 3, 5, 6], [0, 3, 9, 2, 0], [2, 2, 8, 1, 1],
+    [7, 7, 0, 0, 0], [3, 2, 6, 3, 0], [2, 5, 3, 2, 2], [6, 5, 2, 1, 0], [0, 2, 2, 3, 7],
+]
+
+
+def store_from(ratings, repeats=()):
+    """One response file per unit column, one query; evaluators in repeats rate every unit twice."""
+    store = ScoreStore(['control'], ['overall'])
+    query = store.add_query('query_1', 'factual')
+    for unit in range(len(ratings[0])):
+        original = f"control_responses_agent_{unit}.json"
+        datasets = [store.add_dataset(f"dataset_{unit}_{copy}.json", original, 'control', unit) for copy in (0, 1)]
+        for evaluator, row in enumerate(ratings):
+            if row[unit] is None:
+                continue
+            for dataset in datasets[:2 if evaluator in repeats else 1]:
+                store.add_score(evaluator, dataset, query, 'overall', row[unit])
+    return store
+
+
+def reliability(store):
+    return ReliabilityEngine(n_resamples=200).reliability(store)['overall']
+
+
+def test_krippendorff_ordinal_matches_the_published_example():
+    assert reliability(store_from(KRIPPENDORFF_DATA))['krippendorff_alpha_ordinal']['estimate'] == pytest.approx(0.815, abs=5e-4)
+
+
+def test_repeat_ratings_by_one_evaluator_are_not_paired():
+    # Rating every unit twice with the same value must not look like extra agreement
+    repeated = reliability(store_from(KRIPPENDORFF_DATA, repeats=(0, 3)))
+    assert repeated['krippendorff_alpha_ordinal']['estimate'] == pytest.approx(0.815, abs=5e-4)
+
+    # Units rated only by one evaluator, however often, have nothing to pair
+    alone = reliability(store_from([KRIPPENDORFF_DATA[1]], repeats=(0,)))
+    assert alone['n_pairable_units'] == 0
+    assert alone['note'] == 'No unit has ratings from two evaluators'
+
+
+def test_fleiss_kappa_matches_the_published_example():
+    counts = np.array(FLEISS_COUNTS, dtype=float)
+    assert fleiss_kappa(np.ones((1, len(counts))), counts)[0] == pytest.approx(0.210, abs=5e-4)
+
+
+def test_iccs_reduce_to_shrout_fleiss_on_complete_data():
+    rng = np.random.default_rng(0)
+    n, k = 20, 3
+    ratings = np.clip(np.rint(3 + rng.normal(0, 1, (n, 1)) + rng.normal(0, 0.3, (1, k))
+                              + rng.normal(0, 0.7, (n, k))), 1, 5).astype(int)
+    result = reliability(store_from(ratings.T.tolist()))
+
+    grand = ratings.mean()
+    ms_rows = k * ((ratings.mean(axis=1) - grand) ** 2).sum() / (n - 1)
+    ms_columns = n * ((ratings.mean(axis=0) - grand) ** 2).sum() / (k - 1)
+    ss_error = ((ratings - grand) ** 2).sum() - ms_rows * (n - 1) - ms_columns * (k - 1)
+    ms_error = ss_error / ((n - 1) * (k - 1))
+    ms_within = (ss_error + ms_columns * (k - 1)) / (n * (k - 1))
+
+    assert result['icc1_1']['estimate'] == pytest.approx((ms_rows - ms_within) / (ms_rows + (k - 1) * ms_within), abs=1e-4)
+    assert result['icc2_1']['estimate'] == pytest.approx(
+        (ms_rows - ms_error) / (ms_rows + (k - 1) * ms_error + k * (ms_columns - ms_error) / n), abs=1e-4)
+    assert result['icc3_k']['estimate'] == pytest.approx((ms_rows - ms_error) / ms_rows, abs=1e-4)
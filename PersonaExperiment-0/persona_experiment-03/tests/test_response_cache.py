@@ -0,0 +1,40 @@
+"""Behaviour of the content-addressed response cache."""
+
+import os
+import time
+
+from response_cache import ResponseCache
+
+
+def test_key_depends_on_every_generation_input(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    base = cache.make_key('pre', 'query', 'model', {'temperature': 1.0, 'seed': 1})
+    assert base == cache.make_key('pre', 'query', 'model', {'seed': 1, 'temperature': 1.0})
+    assert base != cache.make_key('pre', 'query', 'model', {'temperature': 1.0, 'seed': 2})
+    assert base != cache.make_key('other', 'query', 'model', {'temperature': 1.0, 'seed': 1})
+    assert base != cache.make_key('pre', 'query', 'other', {'temperature': 1.0, 'seed': 1})
+
+
+def test_round_trip_and_counters(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    key = cache.make_key('pre', 'query', 'model', {})
+    assert cache.get(key) is None
+    cache.put(key, 'text')
+    assert cache.get(key) == 'text'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used_first(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=None)
+    keys = [cache.make_key('pre', f"query {i}", 'model', {}) for i in range(3)]
+    for age, key in enumerate(keys):
+        cache.put(key, 'x' * 100)
+        stamp = time.time() - 100 + age
+        os.utime(cache.entry_path(key), (stamp, stamp))
+    cache.get(keys[0])  # touched, so now the most recently used
+
+    entry_size = cache.entry_path(keys[0]).stat().st_size
+    cache.max_bytes = 2 * entry_size
+    assert cache.evict() == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == 'x' * 100 and cache.get(keys[2]) == 'x' * 100
@@ -0,0 +1,50 @@
+"""Behaviour of the shared results loader and its on-disk cache."""
+
+import json
+import shutil
+
+from results_loader import ResultsLoader
+
+
+def loader(experiment):
+    return ResultsLoader(str(experiment), cache_dir=str(experiment / "cache"))
+
+
+def test_every_evaluator_file_is_discovered(experiment):
+    results = experiment / "results"
+    shutil.copy(results / "absolute_evaluator_4_results.json", results / "absolute_evaluator_12_results.json")
+    shutil.copy(results / "pairwise_evaluator_4_results.json", results / "pairwise_evaluator_2_results.json")
+
+    loaded = loader(experiment)
+    evaluators = {record['evaluator_id'] for record in loaded.absolute_records()}
+    assert evaluators == {4, 5, 6, 7, 12}
+    assert {row['evaluator_id'] for row in loaded.pairwise_rows} == {2, 4}
+    assert 'absolute_evaluator_12_results.json' in loaded.files_read
+
+
+def test_cache_is_reused_until_a_results_file_appears(experiment):
+    first = loader(experiment)
+    assert first.files_read
+
+    assert loader(experiment).files_read == []
+
+    results = experiment / "results"
+    shutil.copy(results / "absolute_evaluator_5_results.json", results / "absolute_evaluator_9_results.json")
+    reloaded = loader(experiment)
+    assert reloaded.files_read
+    assert 9 in {record['evaluator_id'] for record in reloaded.absolute_records()}
+
+
+def test_unparsed_judgments_are_skipped(experiment):
+    path = experiment / "results" / "absolute_evaluator_4_results.json"
+    data = json.loads(path.read_text())
+    dataset = next(iter(data['dataset_results'].values()))
+    query_id = next(iter(dataset['query_evaluations']))
+    dataset['query_evaluations'][query_id]['evaluation'] = {'unparsed': True, 'error': 'unreadable'}
+    path.write_text(json.dumps(data))
+
+    records = loader(experiment).absolute_records()
+    assert records
+    assert not [record for record in records
+                if record['evaluator_id'] == 4 and record['query_id'] == query_id
+                and record['original_file'] == dataset['original_file']]
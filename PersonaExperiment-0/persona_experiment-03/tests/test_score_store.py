@@ -0,0 +1,92 @@
+"""Behaviour of the columnar score store."""
+
+import struct
+
+import pandas as pd
+import pytest
+
+from score_store import FRAME_COLUMNS, MAGIC, ScoreStore, Vocabulary
+
+CONDITIONS = ['control', 'test_1_hardcoded']
+METRICS = ['helpfulness', 'overall']
+
+
+def build_store():
+    store = ScoreStore(CONDITIONS, METRICS)
+    control = store.add_dataset('dataset_a.json', 'control_responses_agent_1.json', 'control', 1)
+    test = store.add_dataset('dataset_b.json', 'test_1_hardcoded_responses_agent_2.json', 'test_1_hardcoded', 2)
+    first = store.add_query('query_1', 'factual')
+    second = store.add_query('query_3', 'technical')
+    for evaluator_id, dataset, query, metric, score in [
+            (4, control, first, 'overall', 3), (4, control, second, 'helpfulness', 4),
+            (5, test, first, 'overall', 5), (5, test, second, 'actionability', 2)]:
+        store.add_score(evaluator_id, dataset, query, metric, score)
+    return store
+
+
+def test_vocabulary_codes_are_stable_in_first_seen_order():
+    vocabulary = Vocabulary(['b', 'a'])
+    assert [vocabulary.code(value) for value in ('a', 'c', 'b', 'c')] == [1, 2, 0, 2]
+    assert vocabulary.values == ['b', 'a', 'c'] and len(vocabulary) == 3
+
+
+def test_analysis_conditions_and_metrics_take_the_first_codes():
+    store = build_store()
+    assert store.conditions.values == CONDITIONS
+    assert store.metrics.values == METRICS + ['actionability']
+    # Registering a dataset or query twice keeps its first code and attributes
+    assert store.add_dataset('dataset_a.json', 'other.json', 'test_1_hardcoded', 9) == 0
+    assert store.add_query('query_1', 'advisory') == 0
+    assert list(store.dataset_agent) == [1, 2] and list(store.query_category) == [0, 1]
+
+
+def test_non_integer_scores_are_rejected():
+    store = build_store()
+    with pytest.raises(ValueError):
+        store.add_score(4, 0, 0, 'overall', 3.5)
+    assert len(store) == 4
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = build_store()
+    path = tmp_path / "scores" / "absolute.pxss"
+    store.save(str(path))
+    loaded = ScoreStore.load(str(path))
+
+    assert list(loaded.records()) == list(store.records())
+    assert loaded.analysis_conditions == CONDITIONS and loaded.analysis_metrics == METRICS
+    assert {name: list(column) for name, column in loaded.columns.items()} == \
+        {name: list(column) for name, column in store.columns.items()}
+    assert not list(path.parent.glob('*.tmp'))
+
+
+def test_bad_magic_or_version_is_rejected(tmp_path):
+    path = tmp_path / "absolute.pxss"
+    build_store().save(str(path))
+    data = path.read_bytes()
+
+    (tmp_path / "bad_magic.pxss").write_bytes(b'XXXX' + data[4:])
+    with pytest.raises(ValueError, match="not a score store"):
+        ScoreStore.load(str(tmp_path / "bad_magic.pxss"))
+
+    (header_length,) = struct.unpack('<I', data[4:8])
+    header = data[8:8 + header_length].replace(b'"version": 1', b'"version": 9')
+    (tmp_path / "bad_version.pxss").write_bytes(MAGIC + struct.pack('<I', len(header)) + header
+                                                + data[8 + header_length:])
+    with pytest.raises(ValueError, match="version 9"):
+        ScoreStore.load(str(tmp_path / "bad_version.pxss"))
+
+
+def test_to_frame_matches_records():
+    store = build_store()
+    frame = store.to_frame()
+    assert list(frame.columns) == FRAME_COLUMNS
+    pd.testing.assert_frame_equal(frame, pd.DataFrame(list(store.records()), columns=FRAME_COLUMNS),
+                                  check_dtype=False)
+    assert frame.loc[2, ['condition', 'agent_id', 'query_category', 'score']].tolist() == \
+        ['test_1_hardcoded', 2, 'factual', 5]
+
+
+def test_empty_store_expands_to_an_empty_frame():
+    frame = ScoreStore(CONDITIONS, METRICS).to_frame()
+    assert list(frame.columns) == FRAME_COLUMNS and len(frame) == 0
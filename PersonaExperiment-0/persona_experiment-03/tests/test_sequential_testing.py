@@ -0,0 +1,91 @@
+"""Behaviour of the sequential (alpha spending / SPRT) stoppers."""
+
+import json
+import random
+
+import pytest
+
+from sequential_testing import (AlphaSpendingStopper, SPRTStopper, build_sequential_stopper,
+                                decided_conditions, obrien_fleming_spending)
+
+PLANNED = 60
+LOOK_EVERY = 5
+
+
+def run(stopper, win_probability, rng, planned=PLANNED):
+    """Judge up to planned fair-or-biased outcomes, looking every LOOK_EVERY judgments."""
+    stopper.start('test_1_hardcoded', planned)
+    for judged in range(1, planned + 1):
+        stopper.record('test_1_hardcoded', 'test' if rng.random() < win_probability else 'control')
+        if judged % LOOK_EVERY == 0 or judged == planned:
+            decision = stopper.decision('test_1_hardcoded')
+            if decision:
+                return decision, judged
+    return None, planned
+
+
+def test_spending_function_reaches_alpha_at_full_information():
+    assert obrien_fleming_spending(0) == 0
+    assert obrien_fleming_spending(0.25) < obrien_fleming_spending(0.5) < obrien_fleming_spending(1.0)
+    assert obrien_fleming_spending(1.0) == pytest.approx(0.05)
+
+
+def test_exact_null_crossing_probability_stays_within_alpha():
+    # Boundaries depend only on how many judgments are in, so a path that never crosses sees them all
+    stopper = AlphaSpendingStopper(alpha=0.05)
+    stopper.start('test_1_hardcoded', PLANNED)
+    for judged in range(1, PLANNED + 1):
+        stopper.record('test_1_hardcoded', 'test' if judged % 2 else 'control')
+        if judged % LOOK_EVERY == 0:
+            assert stopper.decision('test_1_hardcoded') is None
+    spent = stopper.report('test_1_hardcoded', PLANNED, PLANNED)['alpha_spent']
+    assert 0.03 < spent <= 0.05
+
+
+def test_null_rejection_rate_matches_alpha_spent():
+    rng = random.Random(0)
+    rejections = sum(run(AlphaSpendingStopper(alpha=0.05), 0.5, rng)[0] is not None for _ in range(3000))
+    assert rejections / 3000 <= 0.05 + 3 * (0.05 * 0.95 / 3000) ** 0.5
+
+
+def test_alpha_spending_stops_early_on_a_clear_difference():
+    decision, judged = run(AlphaSpendingStopper(), 0.9, random.Random(1))
+    assert decision == 'test_better' and judged < PLANNED
+    decision, _ = run(AlphaSpendingStopper(), 0.1, random.Random(2))
+    assert decision == 'control_better'
+
+
+def test_sprt_error_rate_and_decisions():
+    rng = random.Random(3)
+    outcomes = [run(SPRTStopper(alpha=0.05), 0.5, rng, planned=2000)[0] for _ in range(1000)]
+    wrong = sum(outcome in ('test_better', 'control_better') for outcome in outcomes)
+    assert wrong / 1000 <= 0.05 + 3 * (0.05 * 0.95 / 1000) ** 0.5
+    assert outcomes.count('no_difference') > 900
+
+    assert run(SPRTStopper(), 0.8, random.Random(4), planned=500)[0] == 'test_better'
+    assert run(SPRTStopper(), 0.2, random.Random(5), planned=500)[0] == 'control_better'
+
+
+def test_no_decision_before_min_decided():
+    for stopper in (AlphaSpendingStopper(min_decided=8), SPRTStopper(min_decided=8)):
+        stopper.start('test_1_hardcoded', PLANNED)
+        for _ in range(7):
+            stopper.record('test_1_hardcoded', 'test')
+        assert stopper.decision('test_1_hardcoded') is None
+
+
+def test_decided_conditions_reads_saved_stopping_decisions(tmp_path):
+    results = {'results': {
+        'test_1_hardcoded': {'stopping': {'decision': 'test_better'}},
+        'test_2_predefined': {'stopping': {'decision': 'exhausted'}},
+        'test_3_dynamic': {}
+    }}
+    (tmp_path / "pairwise_evaluator_2_results.json").write_text(json.dumps(results))
+    (tmp_path / "absolute_evaluator_2_results.json").write_text(json.dumps(results))
+    assert decided_conditions(str(tmp_path)) == {'test_1_hardcoded': 'test_better'}
+
+
+def test_unknown_method_is_rejected():
+    assert isinstance(build_sequential_stopper('sprt', effect=0.1), SPRTStopper)
+    with pytest.raises(ValueError):
+        build_sequential_stopper('pocock')
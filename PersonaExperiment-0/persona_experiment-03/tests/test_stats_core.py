@@ -0,0 +1,108 @@
+"""Behaviour of the histogram-based statistics core against the scipy calls it replaces."""
+
+import warnings
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from stats_core import ScoreCube, StatisticsCore, cliff_delta, kruskal_wallis, levene_median, mann_whitney, welch_t
+
+LEVELS = np.arange(1.0, 6.0)
+RNG = np.random.default_rng(11)
+
+# (test, control) samples on the 1-5 scale
+TWO_SAMPLE_CASES = {
+    'heavy_ties': ([4, 4, 4, 5, 3, 4, 4, 5], [3, 3, 4, 4, 2, 3, 3]),
+    'tie_free_small': ([1, 3, 5], [2, 4]),
+    'one_sided': ([5, 5, 4, 5], [1, 2, 1, 2, 2]),
+    'large': (list(RNG.choice(5, size=60, p=[0.05, 0.1, 0.3, 0.35, 0.2]) + 1),
+              list(RNG.choice(5, size=48, p=[0.1, 0.2, 0.4, 0.2, 0.1]) + 1)),
+    'single_observation': ([4], [2, 3, 5, 3]),
+}
+
+# Groups compared across conditions; empty groups are skipped by the core, so scipy sees only the rest
+GROUP_CASES = {
+    'heavy_ties': [[4, 4, 4, 5, 3], [3, 3, 4, 4, 2, 3], [5, 5, 4, 4]],
+    'unequal_sizes': [list(RNG.choice(5, size=30) + 1), list(RNG.choice(5, size=12) + 1), [1, 5, 3]],
+    'empty_group': [[2, 3, 3, 4], [], [4, 5, 5, 3, 4]],
+    'single_observation_group': [[3], [1, 2, 2, 3], [4, 5, 4, 3]],
+}
+
+
+def hist(sample):
+    """Level counts of one sample."""
+    return np.bincount(np.asarray(sample, dtype=int) - 1, minlength=5).astype(float)
+
+
+def scipy_quietly(function, *args, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return function(*args, **kwargs)
+
+
+@pytest.mark.parametrize('case', sorted(TWO_SAMPLE_CASES))
+def test_welch_t_matches_scipy(case):
+    test, control = TWO_SAMPLE_CASES[case]
+    t, p = welch_t(hist(test), hist(control), LEVELS)
+    expected = scipy_quietly(stats.ttest_ind, test, control, equal_var=False)
+    np.testing.assert_allclose([t, p], [expected.statistic, expected.pvalue], rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('case', sorted(TWO_SAMPLE_CASES))
+def test_mann_whitney_matches_scipy(case):
+    test, control = TWO_SAMPLE_CASES[case]
+    # The core works on arrays of cells, as the analyzer calls it
+    u, p = mann_whitney(hist(test)[None], hist(control)[None], LEVELS)
+    expected = stats.mannwhitneyu(test, control, alternative='two-sided')
+    np.testing.assert_allclose([u[0], p[0]], [expected.statistic, expected.pvalue], rtol=1e-9)
+
+
+@pytest.mark.parametrize('case', sorted(TWO_SAMPLE_CASES))
+def test_cliff_delta_matches_pairwise_definition(case):
+    test, control = TWO_SAMPLE_CASES[case]
+    expected = np.sign(np.subtract.outer(test, control)).mean()
+    assert cliff_delta(hist(test), hist(control)) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('case', sorted(GROUP_CASES))
+def test_kruskal_wallis_matches_scipy(case):
+    groups = GROUP_CASES[case]
+    h, p = kruskal_wallis(np.stack([hist(group) for group in groups]))
+    expected = stats.kruskal(*[group for group in groups if group])
+    np.testing.assert_allclose([h, p], [expected.statistic, expected.pvalue], rtol=1e-9)
+
+
+@pytest.mark.parametrize('case', sorted(GROUP_CASES))
+def test_levene_median_matches_scipy(case):
+    groups = GROUP_CASES[case]
+    w, p = levene_median(np.stack([hist(group) for group in groups]), LEVELS)
+    expected = stats.levene(*[group for group in groups if group], center='median')
+    np.testing.assert_allclose([w, p], [expected.statistic, expected.pvalue], rtol=1e-9)
+
+
+def test_tests_are_vectorized_over_cells():
+    cases = [TWO_SAMPLE_CASES[case] for case in ('heavy_ties', 'one_sided', 'large')]
+    test = np.stack([hist(test) for test, _ in cases])
+    control = np.stack([hist(control) for _, control in cases])
+    t, _ = welch_t(test, control, LEVELS)
+    u, _ = mann_whitney(test, control, LEVELS)
+    for row, (test_sample, control_sample) in enumerate(cases):
+        assert t[row] == pytest.approx(stats.ttest_ind(test_sample, control_sample, equal_var=False).statistic)
+        assert u[row] == pytest.approx(stats.mannwhitneyu(test_sample, control_sample).statistic)
+
+
+def test_contrasts_with_an_empty_cell_are_skipped():
+    # Two conditions, two metrics; the test condition has no 'overall' scores at all
+    scores = np.full((1, 2, 1, 6, 2), np.nan)
+    scores[0, 0, 0, :, :] = [[3, 4], [4, 4], [2, 3], [5, 4], [3, 3], [4, 5]]
+    scores[0, 1, 0, :, 0] = [4, 5, 5, 3, 4, 5]
+    cube = ScoreCube(scores, ['e1'], ['control', 'test_1_hardcoded'], [['c.json'], ['t.json']],
+                     [f"query_{index}" for index in range(1, 7)], ['helpfulness', 'overall'])
+    comparisons = StatisticsCore(cube).comparison_tests()
+
+    contrast = comparisons['helpfulness']['pairwise_comparisons']['test_1_hardcoded_vs_control']
+    expected = stats.ttest_ind([4, 5, 5, 3, 4, 5], [3, 4, 2, 5, 3, 4], equal_var=False)
+    assert contrast['parametric_test']['p_value'] == pytest.approx(round(expected.pvalue, 4))
+    assert comparisons['overall']['pairwise_comparisons'] == {}
+    assert 'kruskal_wallis' not in comparisons['overall']
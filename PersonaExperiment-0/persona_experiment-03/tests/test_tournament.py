@@ -0,0 +1,35 @@
+"""Behaviour of the Bradley-Terry tournament fit."""
+
+import random
+
+from tournament import fit_bradley_terry, summarize_fit
+
+CONDITIONS = ['control', 'test_1_hardcoded', 'test_2_predefined']
+
+
+def simulated_outcomes(strengths, games=300, seed=0):
+    rng = random.Random(seed)
+    outcomes = []
+    for _ in range(games):
+        i, j = rng.sample(range(len(CONDITIONS)), 2)
+        p = 1 / (1 + pow(2.718281828, strengths[j] - strengths[i]))
+        outcomes.append((CONDITIONS[i], CONDITIONS[j], 1.0 if rng.random() < p else 0.0))
+    return outcomes
+
+
+def test_standard_errors_do_not_depend_on_the_prior():
+    outcomes = simulated_outcomes([0.0, 0.8, -0.4])
+    weak = summarize_fit(CONDITIONS, fit_bradley_terry(CONDITIONS, outcomes, prior=0.01))
+    weaker = summarize_fit(CONDITIONS, fit_bradley_terry(CONDITIONS, outcomes, prior=0.0001))
+    for condition in CONDITIONS:
+        assert abs(weak['strengths'][condition]['se'] - weaker['strengths'][condition]['se']) < 0.01
+        assert weak['strengths'][condition]['se'] < 0.5
+    assert abs(sum(entry['log_strength'] for entry in weak['strengths'].values())) < 1e-3
+
+
+def test_reference_contrasts_and_ranking():
+    summary = summarize_fit(CONDITIONS, fit_bradley_terry(CONDITIONS, simulated_outcomes([0.0, 0.8, -0.4], 600)))
+    assert summary['ranking'] == ['test_1_hardcoded', 'control', 'test_2_predefined']
+    entry = summary['strengths']['test_1_hardcoded']
+    assert entry['vs_control_ci_lower'] > 0 and entry['vs_control_se'] > 0
+    assert summary['strengths']['control']['vs_control_se'] == 0
@@ -0,0 +1,63 @@
+"""Behaviour of the latency-aware generation scheduler."""
+
+import asyncio
+import json
+
+import pytest
+
+from generate_responses import ResponseGenerator, StubModelClient
+from work_scheduler import LatencyAwareScheduler, load_length_priors
+
+
+def test_slowest_lane_goes_first_and_units_keep_their_order():
+    scheduler = LatencyAwareScheduler({'control': 1.0, 'test_3_dynamic': 3.0})
+    for unit in range(3):
+        scheduler.add('control', 'librarian', ('control', unit))
+        scheduler.add('test_3_dynamic', 'dynamic', ('test_3_dynamic', unit))
+
+    assert scheduler.next_batch(2) == ('test_3_dynamic', 'dynamic', [('test_3_dynamic', 0), ('test_3_dynamic', 1)])
+    assert scheduler.next_batch(2) == ('test_3_dynamic', 'dynamic', [('test_3_dynamic', 2)])
+    assert scheduler.next_batch(5) == ('control', 'librarian', [('control', 0), ('control', 1), ('control', 2)])
+    assert scheduler.next_batch(5) is None
+    assert scheduler.remaining() == 0
+
+
+def test_equal_estimates_prefer_the_longest_lane():
+    scheduler = LatencyAwareScheduler()
+    scheduler.add('control', 'a', 1)
+    for unit in range(3):
+        scheduler.add('control', 'b', unit)
+    assert scheduler.next_batch(1)[1] == 'b'
+
+
+def test_observed_latency_is_an_exponential_moving_average():
+    scheduler = LatencyAwareScheduler(smoothing=0.25)
+    scheduler.record('control', 2.0)
+    assert scheduler.estimate('control') == 2.0
+    scheduler.record('control', 6.0)
+    assert scheduler.estimate('control') == pytest.approx(0.75 * 2.0 + 0.25 * 6.0)
+
+
+def test_priors_are_rescaled_onto_observed_time():
+    scheduler = LatencyAwareScheduler({'control': 1.0, 'test_4_dynamic_tone': 4.0})
+    scheduler.record('control', 0.5)
+    assert scheduler.estimate('test_4_dynamic_tone') == pytest.approx(2.0)
+    # Conditions without a prior rank as the average known condition
+    assert scheduler.estimate('test_2_predefined') == pytest.approx((0.5 + 2.0) / 2)
+
+
+def test_length_priors_follow_mean_response_length(tmp_path):
+    (tmp_path / "control_responses_agent_1.json").write_text(json.dumps({'query_1': 'x' * 100}))
+    (tmp_path / "test_3_dynamic_responses_agent_1.json").write_text(json.dumps({'query_1': 'x' * 400}))
+    priors = load_length_priors(str(tmp_path), ['control', 'test_3_dynamic', 'test_1_hardcoded'])
+    assert set(priors) == {'control', 'test_3_dynamic'}
+    assert priors['test_3_dynamic'] == pytest.approx(4 * priors['control'])
+
+
+def test_latency_estimates_exclude_rate_limit_waits(experiment):
+    # 24 requests against a 20-token bucket refilling at 20/s: the second batch queues ~0.2s for tokens
+    client = StubModelClient(latency_per_char=0, requests_per_minute=1200)
+    generator = ResponseGenerator(str(experiment), client, [8], conditions=['control', 'test_1_hardcoded'],
+                                  max_concurrency=1, batch_size=12, output_dir=str(experiment / "out"))
+    asyncio.run(generator.run())
+    assert max(generator.latency_estimates.values()) < 0.005
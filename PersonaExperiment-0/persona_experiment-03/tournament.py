@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tournament Ranking for Persona Experiment 03
+Ranks all five conditions from cross-condition pairwise judgments with a Bradley-Terry model
+instead of comparing each test condition with control only. Judgments are scheduled in rounds:
+each round goes to the condition pairs whose outcome is least certain under the current fit
+(win probability near 0.5 and a wide strength-difference interval), so the ranking and its
+confidence intervals settle after a fraction of the all-pairs grid.
+"""
+
+import itertools
+import math
+import random
+from statistics import NormalDist
+from typing import Dict, List, Tuple, Any, Optional
+
+import numpy as np
+
+
+def fit_bradley_terry(conditions: List[str], outcomes: List[Tuple[str, str, float]],
+                      prior: float = 0.01, iterations: int = 50) -> Dict[str, Any]:
+    """
+    Fit Bradley-Terry log-strengths by Newton's method.
+    outcomes are (condition_i, condition_j, score) with score 1 if i won, 0 if j won, 0.5 for a tie.
+    A weak Gaussian prior (precision `prior`) keeps the fit defined before every condition has both
+    won and lost. Returns {'theta': array, 'covariance': array, 'wins': array, 'games': array}.
+    """
+    index = {condition: position for position, condition in enumerate(conditions)}
+    k = len(conditions)
+    wins = np.zeros((k, k))
+    games = np.zeros((k, k))
+    for condition_i, condition_j, score in outcomes:
+        i, j = index[condition_i], index[condition_j]
+        wins[i, j] += score
+        wins[j, i] += 1 - score
+        games[i, j] += 1
+        games[j, i] += 1
+
+    theta = np.zeros(k)
+    for _ in range(iterations):
+        p = 1 / (1 + np.exp(-(theta[:, None] - theta[None, :])))
+        gradient = (wins - games * p).sum(axis=1) - prior * theta
+        information = games * p * (1 - p)
+        hessian = information - np.diag(information.sum(axis=1) + prior)
+        step = np.linalg.solve(hessian, gradient)
+        theta = theta - step
+        if np.max(np.abs(step)) < 1e-10:
+            break
+
+    p = 1 / (1 + np.exp(-(theta[:, None] - theta[None, :])))
+    information = games * p * (1 - p)
+    hessian = information - np.diag(information.sum(axis=1) + prior)
+    return {'theta': theta, 'covariance': np.linalg.inv(-hessian), 'wins': wins, 'games': games}
+
+
+def difference_se(fit: Dict[str, Any], i: int, j: int) -> float:
+    """Standard error of theta_i - theta_j."""
+    covariance = fit['covariance']
+    return math.sqrt(max(covariance[i, i] + covariance[j, j] - 2 * covariance[i, j], 0.0))
+
+
+class TournamentScheduler:
+    def __init__(self, conditions: List[str], datasets_by_condition: Dict[str, List[str]],
+                 query_ids: Dict[str, List[str]], seed: Any = 42):
+        """Prepare a shuffled pool of (dataset_i, dataset_j, query) comparisons per condition pair."""
+        self.conditions = conditions
+        self.rng = random.Random(seed)
+        self.pools = {}
+        for condition_i, condition_j in itertools.combinations(conditions, 2):
+            pool = [
+                (dataset_i, dataset_j, query_id)
+                for dataset_i in datasets_by_condition.get(condition_i, [])
+                for dataset_j in datasets_by_condition.get(condition_j, [])
+                for query_id in query_ids[dataset_i] if query_id in query_ids[dataset_j]
+            ]
+            self.rng.shuffle(pool)
+            if pool:
+                self.pools[(condition_i, condition_j)] = pool
+
+    def full_grid_size(self) -> int:
+        """Judgments needed for the all-pairs grid."""
+        return sum(len(pool) for pool in self.pools.values())
+
+    def pair_priority(self, fit: Optional[Dict[str, Any]], pair: Tuple[str, str]) -> float:
+        """Expected information of one more judgment: p(1-p) times the current difference uncertainty."""
+        if fit is None:
+            return 1.0
+        i, j = self.conditions.index(pair[0]), self.conditions.index(pair[1])
+        p = 1 / (1 + math.exp(-(fit['theta'][i] - fit['theta'][j])))
+        return p * (1 - p) * difference_se(fit, i, j)
+
+    def next_round(self, fit: Optional[Dict[str, Any]], size: int) -> List[Dict[str, Any]]:
+        """Draw up to size comparisons, spreading the round over the most informative condition pairs.
+        A/B positions are drawn here, before any judge call, so results do not depend on completion order."""
+        priorities = {pair: self.pair_priority(fit, pair) for pair, pool in self.pools.items() if pool}
+        assigned = {pair: 0 for pair in priorities}
+        jobs = []
+        while len(jobs) < size and priorities:
+            pair = max(priorities, key=lambda candidate: (priorities[candidate] / (1 + assigned[candidate]),
+                                                          -assigned[candidate]))
+            dataset_i, dataset_j, query_id = self.pools[pair].pop()
+            jobs.append({
+                'condition_i': pair[0], 'condition_j': pair[1],
+                'dataset_i': dataset_i, 'dataset_j': dataset_j, 'query_id': query_id,
+                'a_is_i': self.rng.choice([True, False])
+            })
+            assigned[pair] += 1
+            if not self.pools[pair]:
+                del priorities[pair]
+        return jobs
+
+
+def is_settled(conditions: List[str], fit: Dict[str, Any], z: float) -> bool:
+    """True once every adjacent pair in the current ranking is separated by its interval."""
+    order = np.argsort(-fit['theta'])
+    return all(fit['theta'][i] - fit['theta'][j] > z * difference_se(fit, i, j)
+               for i, j in zip(order[:-1], order[1:]))
+
+
+def summarize_fit(conditions: List[str], fit: Dict[str, Any], alpha: float = 0.05,
+                  reference: str = 'control') -> Dict[str, Any]:
+    """
+    Ranking, strengths relative to the reference condition with intervals, and pairwise win probabilities.
+    Only differences of log-strengths are identified (the absolute level is set by the prior alone), so
+    log_strength is centered to sum to zero and its se is the standard error of that contrast.
+    """
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    theta = fit['theta']
+    ref = conditions.index(reference) if reference in conditions else None
+    centering = np.eye(len(conditions)) - 1 / len(conditions)
+    centered = centering @ theta
+    centered_covariance = centering @ fit['covariance'] @ centering
+
+    strengths = {}
+    for i, condition in enumerate(conditions):
+        entry = {'log_strength': round(float(centered[i]), 4),
+                 'se': round(math.sqrt(max(centered_covariance[i, i], 0.0)), 4)}
+        if ref is not None:
+            difference = theta[i] - theta[ref]
+            se = difference_se(fit, i, ref)
+            entry.update({
+                f'vs_{reference}': round(float(difference), 4),
+                f'vs_{reference}_se': round(se, 4),
+                f'vs_{reference}_ci_lower': round(float(difference - z * se), 4),
+                f'vs_{reference}_ci_upper': round(float(difference + z * se), 4),
+                f'win_probability_vs_{reference}': round(float(1 / (1 + math.exp(-difference))), 4)
+            })
+        strengths[condition] = entry
+
+    win_probabilities = {
+        condition_i: {condition_j: round(float(1 / (1 + math.exp(-(theta[i] - theta[j])))), 4)
+                      for j, condition_j in enumerate(conditions) if j != i}
+        for i, condition_i in enumerate(conditions)
+    }
+    return {
+        'ranking': [conditions[i] for i in np.argsort(-theta)],
+        'strengths': strengths,
+        'win_probabilities': win_probabilities,
+        'games_played': {condition: int(fit['games'][i].sum()) for i, condition in enumerate(conditions)},
+        'alpha': alpha
+    }
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Latency-Aware Work Scheduler for Persona Experiment Response Generation
+Keeps every pending (condition, agent, query) unit in one shared queue, split into lanes of units
+that share a pre-prompt. Idle workers always take the lane whose condition has the highest
+observed per-unit latency, so the long-tail conditions (Test 3 dynamic, Test 4 dynamic+tone)
+start first and no worker sits idle behind a static per-condition split.
+"""
+
+import json
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Tuple, Any, Optional, Hashable
+
+
+class LatencyAwareScheduler:
+    def __init__(self, prior_latency: Optional[Dict[str, float]] = None, smoothing: float = 0.3):
+        """Initialize with optional per-condition latency priors (relative seconds per unit)."""
+        self.prior_latency = dict(prior_latency or {})
+        self.observed = {}
+        self.smoothing = smoothing
+        self.lanes = {}
+        self.lane_conditions = {}
+
+    def add(self, condition: str, lane_key: Hashable, unit: Any):
+        """Queue a unit in the lane of units sharing lane_key (e.g. the pre-prompt)."""
+        key = (condition, lane_key)
+        self.lanes.setdefault(key, deque()).append(unit)
+        self.lane_conditions[key] = condition
+
+    def estimate(self, condition: str) -> float:
+        """Current expected seconds per unit for a condition.
+        Observed latency wins; priors are rescaled onto the observed time scale until then."""
+        if condition in self.observed:
+            return self.observed[condition]
+
+        calibrated = [self.observed[c] / self.prior_latency[c] for c in self.observed
+                      if self.prior_latency.get(c)]
+        scale = sum(calibrated) / len(calibrated) if calibrated else 1.0
+        if condition in self.prior_latency:
+            return self.prior_latency[condition] * scale
+        # Unknown conditions rank as the average known condition
+        known = [self.estimate(c) for c in set(self.prior_latency) | set(self.observed)]
+        return sum(known) / len(known) if known else 1.0
+
+    def next_batch(self, max_units: int) -> Optional[Tuple[str, Hashable, List[Any]]]:
+        """Pop up to max_units from the lane with the longest expected latency, or None when drained."""
+        pending = [key for key, units in self.lanes.items() if units]
+        if not pending:
+            return None
+
+        # Longest expected unit first; break ties by the most remaining work in the lane
+        key = max(pending, key=lambda k: (self.estimate(self.lane_conditions[k]), len(self.lanes[k])))
+        lane = self.lanes[key]
+        units = [lane.popleft() for _ in range(min(max_units, len(lane)))]
+        condition, lane_key = key
+        return condition, lane_key, units
+
+    def record(self, condition: str, seconds_per_unit: float):
+        """Fold an observed per-unit latency into the condition's moving estimate."""
+        previous = self.observed.get(condition)
+        if previous is None:
+            self.observed[condition] = seconds_per_unit
+        else:
+            self.observed[condition] = (1 - self.smoothing) * previous + self.smoothing * seconds_per_unit
+
+    def remaining(self) -> int:
+        """Number of units still queued."""
+        return sum(len(units) for units in self.lanes.values())
+
+
+def load_length_priors(responses_dir: str, conditions: List[str]) -> Dict[str, float]:
+    """Estimate relative per-unit latency from the mean response length of existing response files.
+    Output length dominates generation time, so longer historical responses predict slower units."""
+    responses_path = Path(responses_dir)
+    priors = {}
+    for condition in conditions:
+        lengths = []
+        for file_path in responses_path.glob(f"{condition}_responses_agent_*.json"):
+            with open(file_path, 'r') as f:
+                lengths.extend(len(text) for text in json.load(f).values())
+        if lengths:
+            # ~4 chars/token at a nominal 50 tokens/s, only the ordering matters
+            priors[condition] = (sum(lengths) / len(lengths)) / 4 / 50
+    return priors